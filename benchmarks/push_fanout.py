@@ -0,0 +1,87 @@
+"""
+push_fanout.py
+
+This benchmark, located in the 'benchmarks' folder, measures the throughput of the daily schedule push 
+('utils.broadcast') without contacting Telegram.
+
+A fake bot accepts messages with a configurable latency and, to mimic Telegram's flood control, answers 
+with RetryAfter whenever more messages than the allowed limit are sent within one second. The benchmark 
+sends one message to each of the requested number of users and reports, as JSON, the elapsed time, the 
+achieved throughput and the counters returned by 'broadcast'.
+
+Usage:
+  python -m benchmarks.push_fanout [--users N] [--rate R] [--batch-size B] [--latency SECONDS] [--telegram-limit L]
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from collections import deque
+from telegram.error import RetryAfter
+from utils.broadcast import broadcast
+
+
+
+class FakeBot:
+  def __init__(self, latency: float, limit: int):
+    self.latency = latency
+    self.limit = limit
+    self.sent = 0
+    self.rejected = 0
+    self._recent = deque()
+
+
+  async def send_message(self, chat_id, text, **kwargs):
+    now = time.monotonic()
+
+    while self._recent and self._recent[0] <= now - 1:
+      self._recent.popleft()
+
+    if len(self._recent) >= self.limit:
+      self.rejected += 1
+      raise RetryAfter(1)
+
+    self._recent.append(now)
+    await asyncio.sleep(self.latency)
+    self.sent += 1
+
+
+
+async def run(users: int, rate: float, batch_size: int, latency: float, limit: int) -> dict:
+  bot = FakeBot(latency, limit)
+  messages = [(chat_id, "Orarul pentru mâine") for chat_id in range(users)]
+
+  start = time.perf_counter()
+  stats = await broadcast(bot, messages, rate=rate, batch_size=batch_size)
+  elapsed = time.perf_counter() - start
+
+  return {
+    "benchmark": "push_fanout",
+    "users": users,
+    "rate_limit": rate,
+    "batch_size": batch_size,
+    "elapsed_seconds": round(elapsed, 3),
+    "messages_per_second": round(stats["sent"] / elapsed, 2) if elapsed else None,
+    "rejected_by_fake_telegram": bot.rejected,
+    **stats
+  }
+
+
+
+def main():
+  parser = argparse.ArgumentParser(description="Dry-run benchmark of the daily schedule push against a fake bot.")
+  parser.add_argument("--users", type=int, default=1000)
+  parser.add_argument("--rate", type=float, default=25)
+  parser.add_argument("--batch-size", type=int, default=50)
+  parser.add_argument("--latency", type=float, default=0.05)
+  parser.add_argument("--telegram-limit", type=int, default=30)
+  args = parser.parse_args()
+
+  result = asyncio.run(run(args.users, args.rate, args.batch_size, args.latency, args.telegram_limit))
+  print(json.dumps(result, indent=2))
+
+
+
+if __name__ == '__main__':
+  main()
@@ -0,0 +1,119 @@
+"""
+restart_latency.py
+
+This benchmark, located in the 'benchmarks' folder, measures how quickly a restarted bot answers its first 
+requests, with and without the state saved by the persistence backend ('utils.persistence').
+
+The benchmark uses the configured database. It takes the chat IDs of up to the requested number of users 
+and simulates two restarts of the process:
+
+- cold: every cache is emptied, so each user's first "Orarul pentru toată săptămâna" request reads the 
+  user table and the timetable from the database;
+- warm: the caches filled by the cold pass are saved with PicklePersistence to a temporary file, emptied, 
+  and restored from that file before the same requests are answered again.
+
+For each restart it reports, as JSON, the time spent restoring the state, the time until the first reply 
+is ready, the mean and maximum latency of the first request of each user, and the size of the state file.
+
+Usage:
+  python -m benchmarks.restart_latency [--users N] [--text MENU_TEXT]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import tempfile
+import time
+from telegram.ext import PicklePersistence
+from db.db_connect import session_scope
+from models.user import User
+from controllers.menu import build_menu_reply
+from cache.user_cache import user_cache
+from cache.schedule_cache import invalidate_all
+from cache.timetable_version import check_timetable_version
+from utils.persistence import snapshot_caches, restore_caches
+
+
+
+def clear_caches():
+  user_cache.clear()
+  invalidate_all()
+
+
+
+def first_responses(chat_ids, text: str, restore_seconds: float = 0.0) -> dict:
+  latencies = []
+
+  for chat_id in chat_ids:
+    start = time.perf_counter()
+
+    with session_scope() as session:
+      build_menu_reply(session, chat_id, text)
+
+    latencies.append(time.perf_counter() - start)
+
+  return {
+    "restore_seconds": round(restore_seconds, 6),
+    "restart_to_first_response_seconds": round(restore_seconds + latencies[0], 6),
+    "mean_first_request_ms": round(sum(latencies) / len(latencies) * 1000, 3),
+    "max_first_request_ms": round(max(latencies) * 1000, 3)
+  }
+
+
+
+async def run(users: int, text: str) -> dict:
+  with session_scope() as session:
+    chat_ids = [chat_id for chat_id, in session.query(User.chatId).order_by(User.id).limit(users)]
+
+    # The snapshot belongs to the current timetable generation, as after the bot's first version poll
+    check_timetable_version(session)
+
+  if not chat_ids:
+    raise SystemExit("The database has no users to benchmark with.")
+
+  clear_caches()
+  cold = first_responses(chat_ids, text)
+
+  filepath = os.path.join(tempfile.mkdtemp(), "bot_state.pickle")
+  persistence = PicklePersistence(filepath)
+  bot_data = {}
+  snapshot_caches(bot_data)
+  await persistence.update_bot_data(bot_data)
+  await persistence.flush()
+
+  clear_caches()
+
+  start = time.perf_counter()
+  bot_data = await PicklePersistence(filepath).get_bot_data()
+
+  with session_scope() as session:
+    restored = restore_caches(session, bot_data)
+
+  warm = first_responses(chat_ids, text, time.perf_counter() - start)
+
+  return {
+    "benchmark": "restart_latency",
+    "users": len(chat_ids),
+    "text": text,
+    "state_file_bytes": os.path.getsize(filepath),
+    "restored": restored,
+    "cold": cold,
+    "warm": warm
+  }
+
+
+
+def main():
+  parser = argparse.ArgumentParser(description="Benchmark of the first responses of a restarted bot, with and without saved state.")
+  parser.add_argument("--users", type=int, default=500)
+  parser.add_argument("--text", default="Orarul pentru toată săptămâna")
+  args = parser.parse_args()
+
+  result = asyncio.run(run(args.users, args.text))
+  print(json.dumps(result, indent=2))
+
+
+
+if __name__ == '__main__':
+  main()
@@ -0,0 +1,252 @@
+"""
+schedule_hot_path.py
+
+This benchmark, located in the 'benchmarks' folder, measures the schedule hot path of the bot against the 
+seeded SQLite stand-in built by 'benchmarks.seed_database'.
+
+The session factory of 'db.db_connect' is bound to the SQLite database, so the real queries, caches and 
+formatters are exercised. The following functions are measured on random groups:
+
+- get_day_schedule_by_id, get_week_schedule_by_id, find_next_day_with_pairs and check_today_schedule, both with 
+  the schedule caches emptied before every call ("db") and with warm caches ("cached"),
+- format_schedule and format_schedule_with_parity, on the schedules of the sampled groups.
+
+For each of them it reports the latency percentiles (in milliseconds), the mean number of SQL statements per 
+call and the mean memory allocated per call (peak traced by tracemalloc, measured in a separate pass so it 
+does not distort the timings).
+
+It then drives 'handle_menu_action' with fake Update objects for the four menu options, sent concurrently 
+by random registered users, and reports the end-to-end throughput, with cold and then warm caches.
+
+Results are printed as JSON, so runs can be compared.
+
+Usage:
+  python -m benchmarks.schedule_hot_path [--database PATH] [--groups N] [--users N] [--iterations N] 
+                                         [--updates N] [--concurrency N] [--seed S]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+from sqlalchemy import create_engine, event
+from db.db_connect import SessionLocal, session_scope
+from db.interogations import get_day_schedule_by_id, get_week_schedule_by_id, load_week_lookups
+from controllers.menu import handle_menu_action
+from controllers.menu_options import find_next_day_with_pairs, check_today_schedule, format_schedule, format_schedule_with_parity
+from cache.schedule_cache import invalidate_all
+from cache.user_cache import user_cache
+from models.group import Group
+from models.user import User
+from utils.date_helpers import WEEKDAY_IDS, WEEK_PARITY_IDS
+from .seed_database import seed_database
+
+MENU_TEXTS = ("Orarul pentru astăzi", "Orarul pentru mâine", "Paritatea săptămânii", "Orarul pentru toată săptămâna")
+
+
+
+class FakeMessage:
+  def __init__(self, text: str):
+    self.text = text
+    self.replies = 0
+
+
+  async def reply_text(self, text, **kwargs):
+    self.replies += 1
+
+
+
+class FakeChat:
+  def __init__(self, id: str):
+    self.id = id
+
+
+
+class FakeUpdate:
+  def __init__(self, chat_id: str, text: str):
+    self.message = FakeMessage(text)
+    self.effective_chat = FakeChat(chat_id)
+
+
+
+class QueryCounter:
+  def __init__(self, engine):
+    self.count = 0
+    event.listen(engine, "before_cursor_execute", self._count)
+
+
+  def _count(self, *args):
+    self.count += 1
+
+
+
+def percentiles(samples) -> dict:
+  ordered = sorted(samples)
+
+  def at(fraction):
+    return round(ordered[min(len(ordered) - 1, int(fraction * len(ordered)))] * 1000, 4)
+
+  return {"p50_ms": at(0.50), "p90_ms": at(0.90), "p99_ms": at(0.99), "max_ms": round(ordered[-1] * 1000, 4)}
+
+
+
+def measure(call, arguments, counter: QueryCounter, clear_caches: bool) -> dict:
+  latencies = []
+  queries = 0
+
+  # With warm caches, every argument is served once before measuring
+  if not clear_caches:
+    with session_scope() as session:
+      for args in arguments:
+        call(session, *args)
+
+  for args in arguments:
+    if clear_caches:
+      invalidate_all()
+
+    with session_scope() as session:
+      before = counter.count
+      start = time.perf_counter()
+      call(session, *args)
+      latencies.append(time.perf_counter() - start)
+      queries += counter.count - before
+
+  allocated = 0
+  tracemalloc.start()
+
+  for args in arguments:
+    if clear_caches:
+      invalidate_all()
+
+    with session_scope() as session:
+      current, _ = tracemalloc.get_traced_memory()
+      tracemalloc.reset_peak()
+      call(session, *args)
+      allocated += tracemalloc.get_traced_memory()[1] - current
+
+  tracemalloc.stop()
+
+  return {
+    "calls": len(arguments),
+    **percentiles(latencies),
+    "queries_per_call": round(queries / len(arguments), 3),
+    "allocated_kib_per_call": round(allocated / len(arguments) / 1024, 2)
+  }
+
+
+
+async def drive_menu(requests, concurrency: int) -> dict:
+  semaphore = asyncio.Semaphore(concurrency)
+  latencies = {text: [] for text in MENU_TEXTS}
+
+  async def send(chat_id, text):
+    async with semaphore:
+      start = time.perf_counter()
+      await handle_menu_action(FakeUpdate(chat_id, text), None)
+      latencies[text].append(time.perf_counter() - start)
+
+  start = time.perf_counter()
+  await asyncio.gather(*(send(chat_id, text) for chat_id, text in requests))
+  elapsed = time.perf_counter() - start
+
+  return {
+    "updates": len(requests),
+    "concurrency": concurrency,
+    "elapsed_seconds": round(elapsed, 3),
+    "updates_per_second": round(len(requests) / elapsed, 2),
+    "actions": {text: percentiles(samples) for text, samples in latencies.items() if samples}
+  }
+
+
+
+def run(database: str, groups: int, users: int, iterations: int, updates: int, concurrency: int, seed: int) -> dict:
+  rng = random.Random(seed)
+
+  # An existing database is reused as it is, so runs on the same file can be compared
+  if os.path.exists(database):
+    engine = create_engine(f"sqlite:///{database}")
+  else:
+    engine = seed_database(database, groups, users, seed)
+
+  SessionLocal.configure(bind=engine)
+  counter = QueryCounter(engine)
+
+  with session_scope() as session:
+    group_ids = [group_id for group_id, in session.query(Group.id)]
+    chat_ids = [chat_id for chat_id, in session.query(User.chatId)]
+    load_week_lookups(session)
+
+  sampled = [rng.choice(group_ids) for _ in range(iterations)]
+  today = datetime.now()
+  days = [
+    (group_id, rng.choice(list(WEEKDAY_IDS.values())), rng.choice(list(WEEK_PARITY_IDS.values())))
+    for group_id in sampled
+  ]
+  dates = [(group_id, today + timedelta(days=rng.randrange(14))) for group_id in sampled]
+
+  cases = {
+    "get_day_schedule_by_id": (get_day_schedule_by_id, days),
+    "get_week_schedule_by_id": (get_week_schedule_by_id, [(group_id,) for group_id in sampled]),
+    "find_next_day_with_pairs": (find_next_day_with_pairs, dates),
+    "check_today_schedule": (check_today_schedule, [(group_id,) for group_id in sampled])
+  }
+
+  results = {}
+
+  for name, (call, arguments) in cases.items():
+    results[name] = {
+      "db": measure(call, arguments, counter, clear_caches=True),
+      "cached": measure(call, arguments, counter, clear_caches=False)
+    }
+
+  with session_scope() as session:
+    schedules = [(get_day_schedule_by_id(session, *args),) for args in days]
+
+  results["format_schedule"] = measure(lambda session, pairs: format_schedule(pairs), schedules, counter, clear_caches=False)
+  results["format_schedule_with_parity"] = measure(
+    lambda session, pairs: format_schedule_with_parity(pairs), schedules, counter, clear_caches=False
+  )
+
+  # The same updates are sent twice: first with empty caches, then with the caches they filled
+  requests = [(rng.choice(chat_ids), rng.choice(MENU_TEXTS)) for _ in range(updates)]
+  invalidate_all()
+  user_cache.clear()
+
+  results["handle_menu_action"] = {
+    "cold": asyncio.run(drive_menu(requests, concurrency)),
+    "warm": asyncio.run(drive_menu(requests, concurrency))
+  }
+
+  return {
+    "benchmark": "schedule_hot_path",
+    "database": database,
+    "groups": len(group_ids),
+    "users": len(chat_ids),
+    "results": results
+  }
+
+
+
+def main():
+  parser = argparse.ArgumentParser(description="Benchmark of the schedule hot path against a seeded SQLite database.")
+  parser.add_argument("--database", default=os.path.join(tempfile.gettempdir(), "schedulebot_benchmark.db"))
+  parser.add_argument("--groups", type=int, default=300)
+  parser.add_argument("--users", type=int, default=30000)
+  parser.add_argument("--iterations", type=int, default=500)
+  parser.add_argument("--updates", type=int, default=2000)
+  parser.add_argument("--concurrency", type=int, default=50)
+  parser.add_argument("--seed", type=int, default=1)
+  args = parser.parse_args()
+
+  result = run(args.database, args.groups, args.users, args.iterations, args.updates, args.concurrency, args.seed)
+  print(json.dumps(result, indent=2, ensure_ascii=False))
+
+
+
+if __name__ == '__main__':
+  main()
@@ -0,0 +1,170 @@
+"""
+seed_database.py
+
+This module, located in the 'benchmarks' folder, builds an SQLite stand-in for the production database, 
+used by the benchmarks to exercise the real queries without a MySQL server.
+
+The tables are created from the models in 'models/', so the schema and its indexes are the ones the bot 
+uses. The database is seeded, deterministically, with a faculty of realistic size:
+
+- specialities with 8 semesters, taught in Romanian, Russian and English, and their study groups,
+- for every group, about 20 to 28 pairs over the two-week cycle, Monday to Saturday, in the usual time 
+  slots, part of them only in odd or even weeks, written through the timetable importer ('db.importer'),
+- users registered to random groups.
+
+Functions included in this module:
+
+- seed_database(path, groups, users, seed): Creates the database at 'path' (replacing an existing file) 
+  and returns its engine.
+
+Usage:
+  python -m benchmarks.seed_database [--path PATH] [--groups N] [--users N] [--seed S]
+"""
+
+import argparse
+import json
+import os
+import random
+from datetime import time
+from sqlalchemy import create_engine, insert, select, func
+from sqlalchemy.orm import sessionmaker
+from db.base import Base
+from db.importer import import_timetable
+from models.speciality import Speciality
+from models.language import Language
+from models.group import Group
+from models.user import User
+from models.weekDay import WeekDay
+from models.weekParity import WeekParity
+from utils.date_helpers import WEEKDAY_IDS, WEEK_PARITY_IDS
+
+LANGUAGES = ("Română", "Rusă", "Engleză")
+ACTIVITY_TYPES = ("Curs", "Seminar", "Laborator")
+TIME_SLOTS = ((8, 0, 9, 30), (9, 45, 11, 15), (11, 30, 13, 0), (13, 30, 15, 0), (15, 15, 16, 45), (17, 0, 18, 30))
+
+# Number of groups of each (speciality, semester, language)
+GROUPS_PER_PROGRAMME = 2
+
+
+
+def _reference_rows(groups: int) -> dict:
+  programmes_per_speciality = 8 * len(LANGUAGES) * GROUPS_PER_PROGRAMME
+  specialities = max(1, -(-groups // programmes_per_speciality))
+
+  group_rows = []
+
+  for speciality_id in range(1, specialities + 1):
+    for semester in range(1, 9):
+      for language_id in range(1, len(LANGUAGES) + 1):
+        for index in range(1, GROUPS_PER_PROGRAMME + 1):
+          if len(group_rows) < groups:
+            group_rows.append({
+              "id": len(group_rows) + 1,
+              "name": f"S{speciality_id}-{semester}{index}{LANGUAGES[language_id - 1][0]}",
+              "languageId": language_id,
+              "semester": semester,
+              "specialityId": speciality_id
+            })
+
+  return {
+    Speciality: [
+      {"id": id, "name": f"Specialitatea {id}", "semesters": 8, "abbreviation": f"S{id}"}
+      for id in range(1, specialities + 1)
+    ],
+    Language: [{"id": id, "name": name} for id, name in enumerate(LANGUAGES, start=1)],
+    Group: group_rows,
+    WeekDay: [{"id": id, "day": day} for day, id in WEEKDAY_IDS.items()],
+    WeekParity: [{"id": id, "name": name} for name, id in WEEK_PARITY_IDS.items()]
+  }
+
+
+
+def _timetable(groups: int, rng) -> dict:
+  courses = groups * 3
+  teachers = max(10, groups // 2)
+  rooms = max(10, groups // 3)
+
+  data = {
+    "activityType": [{"id": id, "name": name} for id, name in enumerate(ACTIVITY_TYPES, start=1)],
+    "course": [{"id": id, "name": f"Disciplina {id}"} for id in range(1, courses + 1)],
+    "teacher": [{"id": id, "name": f"Profesor {id}"} for id in range(1, teachers + 1)],
+    "room": [{"id": id, "name": f"{id // 100 + 1}-{id % 100:02d}"} for id in range(1, rooms + 1)],
+    "sessionSchedule": [
+      {"id": id, "startTime": time(a, b).isoformat(), "endTime": time(c, d).isoformat()}
+      for id, (a, b, c, d) in enumerate(TIME_SLOTS, start=1)
+    ],
+    "courseSession": [],
+    "pair": []
+  }
+
+  for group_id in range(1, groups + 1):
+    # Distinct (weekday, time slot) cells of the group; 40% of them hold different pairs in odd and even weeks
+    cells = rng.sample([(day, slot) for day in range(1, 7) for slot in range(1, 5)], rng.randint(14, 18))
+
+    for day, slot in cells:
+      parities = [None] if rng.random() < 0.6 else [1, 2]
+
+      for parity in parities:
+        session_id = len(data["courseSession"]) + 1
+        data["courseSession"].append({
+          "id": session_id,
+          "courseId": rng.randint(1, courses),
+          "teacherId": rng.randint(1, teachers),
+          "activityTypeId": rng.randint(1, len(ACTIVITY_TYPES)),
+          "weekDayId": day,
+          "sessionTimeId": slot,
+          "roomId": rng.randint(1, rooms),
+          "weekParityId": parity
+        })
+        data["pair"].append({"id": session_id, "groupId": group_id, "courseSessionId": session_id})
+
+  return data
+
+
+
+def seed_database(path: str, groups: int = 300, users: int = 30000, seed: int = 1):
+  if os.path.exists(path):
+    os.remove(path)
+
+  rng = random.Random(seed)
+  engine = create_engine(f"sqlite:///{path}")
+  Base.metadata.create_all(engine)
+
+  with sessionmaker(bind=engine)() as session:
+    for model, rows in _reference_rows(groups).items():
+      session.execute(insert(model), rows)
+
+    session.execute(insert(User), [
+      {"chatId": str(100000000 + id), "groupId": rng.randint(1, groups), "dailySchedule": False, "reminders": False}
+      for id in range(users)
+    ])
+    session.commit()
+
+    import_timetable(session, _timetable(groups, rng))
+
+  return engine
+
+
+
+def main():
+  parser = argparse.ArgumentParser(description="Build a seeded SQLite stand-in for the bot's database.")
+  parser.add_argument("--path", default="benchmark.db")
+  parser.add_argument("--groups", type=int, default=300)
+  parser.add_argument("--users", type=int, default=30000)
+  parser.add_argument("--seed", type=int, default=1)
+  args = parser.parse_args()
+
+  engine = seed_database(args.path, args.groups, args.users, args.seed)
+
+  with engine.connect() as connection:
+    counts = {
+      table.name: connection.execute(select(func.count()).select_from(table)).scalar()
+      for table in Base.metadata.sorted_tables
+    }
+
+  print(json.dumps({"path": args.path, "rows": counts}, indent=2))
+
+
+
+if __name__ == '__main__':
+  main()
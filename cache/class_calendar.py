@@ -0,0 +1,80 @@
+"""
+class_calendar.py
+
+This module, located in the 'cache' folder, defines the per-group class calendar, an index that answers 
+"how many days until the group's next day with classes" without querying the database.
+
+A timetable repeats every two weeks: each day is identified by its weekday ID and the parity ID of its 
+week, which gives 14 positions in the cycle. The ClassCalendar is built once from the group's weekly schedule, 
+marks the positions on which the group has at least one pair and precomputes, for every position, the 
+distance to the next marked one. A lookup is then a single list access.
+
+Functions and classes included in this module:
+
+- ClassCalendar(class_days): The index built from a set of (week_day_id, week_parity_id) tuples.
+- get_class_calendar(session, group_id): Returns the cached calendar of a group, building it from 
+  'get_week_schedule_by_id' on the first request.
+
+Calendars are stored in 'calendar_cache' from 'cache.schedule_cache' and are invalidated together with 
+the cached timetable.
+"""
+
+from db.interogations import get_week_schedule_by_id
+from utils.date_helpers import WEEKDAYS, WEEK_PARITIES, WEEKDAY_NAMES, WEEK_PARITY_NAMES
+from .schedule_cache import calendar_cache
+
+CYCLE_LENGTH = len(WEEKDAYS) * len(WEEK_PARITIES)
+
+
+
+def _position(week_day_id: int, week_parity_id: int) -> int:
+  # Weeks are placed in the order the parities alternate, days from Monday to Sunday
+  return WEEK_PARITIES.index(WEEK_PARITY_NAMES[week_parity_id]) * len(WEEKDAYS) + WEEKDAYS.index(WEEKDAY_NAMES[week_day_id])
+
+
+
+class ClassCalendar:
+  __slots__ = ("_days_until_next",)
+
+  def __init__(self, class_days):
+    has_classes = [False] * CYCLE_LENGTH
+
+    for week_day_id, week_parity_id in class_days:
+      has_classes[_position(week_day_id, week_parity_id)] = True
+
+    self._days_until_next = [
+      next((offset for offset in range(CYCLE_LENGTH) if has_classes[(position + offset) % CYCLE_LENGTH]), None)
+      for position in range(CYCLE_LENGTH)
+    ]
+
+
+  def has_classes(self, week_day_id: int, week_parity_id: int) -> bool:
+    return self._days_until_next[_position(week_day_id, week_parity_id)] == 0
+
+
+  def days_until_next(self, week_day_id: int, week_parity_id: int):
+    """
+    Returns the number of days from the given day until the next day with classes (0 if the given day 
+    has classes), or None if the group has no classes at all.
+    """
+
+    return self._days_until_next[_position(week_day_id, week_parity_id)]
+
+
+
+def get_class_calendar(session, group_id: int) -> ClassCalendar:
+  key = (group_id, None, None, "calendar")
+  calendar = calendar_cache.get(key)
+
+  if calendar is None:
+    class_days = set()
+
+    for week_day_id, pairs in get_week_schedule_by_id(session, group_id).items():
+      for pair in pairs:
+        parities = WEEK_PARITY_NAMES if pair.weekParityId is None else (pair.weekParityId,)
+        class_days.update((week_day_id, parity_id) for parity_id in parities)
+
+    calendar = ClassCalendar(class_days)
+    calendar_cache.put(key, calendar)
+
+  return calendar
@@ -0,0 +1,106 @@
+"""
+lru_cache.py
+
+This module, located in the 'cache' folder, defines LRUCache, a small thread-safe in-process cache with 
+size-bounded least-recently-used eviction and an optional time-to-live for each entry.
+
+The cache is shared between the asyncio event loop and the database thread pool, so every operation is 
+guarded by a lock. It keeps hit, miss, eviction and expiration counters that can be used to size it.
+
+Methods:
+  - get(key): Returns the cached value, or None if the key is missing or expired.
+  - put(key, value): Stores a value, evicting the least recently used entry when the cache is full.
+  - invalidate(predicate): Removes every entry whose key matches the predicate.
+  - clear(): Removes every entry.
+  - items(): Returns the entries that have not expired, from the least to the most recently used.
+  - stats(): Returns the counters and the current size of the cache.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+
+
+class LRUCache:
+  def __init__(self, maxsize: int, ttl: float = None):
+    self.maxsize = maxsize
+    self.ttl = ttl
+    self._entries = OrderedDict()
+    self._lock = threading.Lock()
+    self.hits = 0
+    self.misses = 0
+    self.evictions = 0
+    self.expirations = 0
+
+
+  def get(self, key):
+    with self._lock:
+      entry = self._entries.get(key)
+
+      if entry is None:
+        self.misses += 1
+        return None
+
+      value, expires_at = entry
+
+      if expires_at is not None and expires_at <= time.monotonic():
+        del self._entries[key]
+        self.expirations += 1
+        self.misses += 1
+        return None
+
+      self._entries.move_to_end(key)
+      self.hits += 1
+      return value
+
+
+  def put(self, key, value):
+    expires_at = time.monotonic() + self.ttl if self.ttl else None
+
+    with self._lock:
+      self._entries[key] = (value, expires_at)
+      self._entries.move_to_end(key)
+
+      while len(self._entries) > self.maxsize:
+        self._entries.popitem(last=False)
+        self.evictions += 1
+
+
+  def invalidate(self, predicate) -> int:
+    with self._lock:
+      keys = [key for key in self._entries if predicate(key)]
+
+      for key in keys:
+        del self._entries[key]
+
+      return len(keys)
+
+
+  def clear(self) -> int:
+    with self._lock:
+      removed = len(self._entries)
+      self._entries.clear()
+      return removed
+
+
+  def items(self) -> list:
+    now = time.monotonic()
+
+    with self._lock:
+      return [
+        (key, value) for key, (value, expires_at) in self._entries.items()
+        if expires_at is None or expires_at > now
+      ]
+
+
+  def stats(self) -> dict:
+    with self._lock:
+      return {
+        "size": len(self._entries),
+        "maxsize": self.maxsize,
+        "hits": self.hits,
+        "misses": self.misses,
+        "evictions": self.evictions,
+        "expirations": self.expirations
+      }
@@ -0,0 +1,116 @@
+"""
+reference_cache.py
+
+This module, located in the 'cache' folder, holds the reference data used by the '/start' registration 
+flow: specialities, languages and groups. This data is effectively static, so it is loaded once (three 
+queries) and every registration step is then answered from memory.
+
+The ReferenceData object also memoizes the InlineKeyboardMarkup objects built by 'utils.ui_helpers'. 
+Keyboards are immutable, so the same object can be sent to every user who reaches the same step.
+
+Functions and classes included in this module:
+
+- ReferenceData(specialities, languages, groups): The loaded data, with the (speciality, semester, language) 
+  -> groups index and the memoized keyboards. The speciality keyboard of a returning user starts with a button 
+  keeping their previous group, memoized per group. Semester and language keyboards are memoized per callback 
+  data prefix, which carries the selection made so far when REGISTRATION_IN_CALLBACK_DATA is enabled.
+- load_reference_data(session): Loads the reference data from the database and makes it current.
+- get_reference_data(): Returns the current reference data, loading it in the database thread pool on 
+  first use.
+- invalidate_reference_data(): Drops the reference data, so it is loaded again on the next request.
+"""
+
+from db.executor import run_db
+from db.interogations import get_specialities, get_languages, get_all_groups
+from telegram import InlineKeyboardMarkup
+from utils.ui_helpers import build_speciality_keyboard, build_semester_keyboard, build_language_keyboard, build_group_keyboard, previous_group_button
+
+# Current reference data, None until it is loaded
+_reference = {"data": None}
+
+
+
+class ReferenceData:
+  def __init__(self, specialities, languages, groups):
+    self.specialities = tuple(specialities)
+    self.specialities_by_id = {speciality.id: speciality for speciality in self.specialities}
+    self.languages = tuple(languages)
+    self.groups = {}
+    self.groups_by_id = {}
+    self._keyboards = {}
+
+    for group in groups:
+      self.groups_by_id[group.id] = group
+      self.groups.setdefault((group.specialityId, group.semester, group.languageId), []).append(group)
+
+
+  def _keyboard(self, key, build):
+    keyboard = self._keyboards.get(key)
+
+    if keyboard is None:
+      keyboard = self._keyboards[key] = build()
+
+    return keyboard
+
+
+  def speciality_keyboard(self, previous_group_id: int = None):
+    keyboard = self._keyboard(("speciality",), lambda: build_speciality_keyboard(self.specialities))
+    previous_group = self.groups_by_id.get(previous_group_id)
+
+    if previous_group is None:
+      return keyboard
+
+    return self._keyboard(
+      ("speciality", previous_group_id),
+      lambda: InlineKeyboardMarkup(((previous_group_button(previous_group),),) + keyboard.inline_keyboard)
+    )
+
+
+  def semester_keyboard(self, speciality_id: int, prefix: str = ""):
+    speciality = self.specialities_by_id.get(speciality_id)
+
+    if speciality is None:
+      return None
+
+    return self._keyboard(("semester", speciality_id, prefix), lambda: build_semester_keyboard(speciality, prefix))
+
+
+  def language_keyboard(self, prefix: str = ""):
+    if not self.languages:
+      return None
+
+    return self._keyboard(("language", prefix), lambda: build_language_keyboard(self.languages, prefix))
+
+
+  def group_keyboard(self, speciality_id: int, semester: int, language_id: int):
+    groups = self.groups.get((speciality_id, semester, language_id))
+
+    if not groups:
+      return None
+
+    return self._keyboard(
+      ("group", speciality_id, semester, language_id),
+      lambda: build_group_keyboard(groups)
+    )
+
+
+
+def load_reference_data(session) -> ReferenceData:
+  data = ReferenceData(get_specialities(session), get_languages(session), get_all_groups(session))
+  _reference["data"] = data
+  return data
+
+
+
+async def get_reference_data() -> ReferenceData:
+  data = _reference["data"]
+
+  if data is None:
+    data = await run_db(load_reference_data)
+
+  return data
+
+
+
+def invalidate_reference_data():
+  _reference["data"] = None
@@ -0,0 +1,57 @@
+"""
+schedule_cache.py
+
+This module, located in the 'cache' folder, holds the in-process cache placed in front of the schedule 
+queries from 'db.interogations'. The timetable changes only a few times per semester, so the result of 
+every schedule query is kept as an immutable snapshot (tuples of ScheduleRow) and reused by later requests.
+
+Keys have the form (group_id, weekday, week_parity). The whole-week schedule of a group is stored under 
+(group_id, None, None).
+
+A second cache, 'message_cache', holds the final HTML messages rendered from those schedules, keyed by 
+(group_id, weekday, week_parity, variant), and 'calendar_cache' holds the per-group class calendars from 
+'cache.class_calendar'. All caches are always invalidated together.
+
+Functions included in this module:
+
+- invalidate_group(group_id): Drops every cached schedule and message of a group, e.g. after its timetable was edited.
+- invalidate_all(): Drops every cached schedule and message, e.g. after a timetable import.
+- cache_stats(): Returns the hit, miss and eviction counters of the caches.
+
+The size and time-to-live of the cache are configured through TIMETABLE_CACHE_SIZE and TIMETABLE_CACHE_TTL 
+in 'config.config'.
+"""
+
+from config.config import TIMETABLE_CACHE_SIZE, TIMETABLE_CACHE_TTL
+from .lru_cache import LRUCache
+
+# Cached schedule snapshots keyed by (group_id, weekday, week_parity)
+timetable_cache = LRUCache(TIMETABLE_CACHE_SIZE, TIMETABLE_CACHE_TTL)
+
+# Rendered HTML messages keyed by (group_id, weekday, week_parity, variant)
+message_cache = LRUCache(TIMETABLE_CACHE_SIZE, TIMETABLE_CACHE_TTL)
+
+# Class calendars keyed by (group_id, None, None, "calendar")
+calendar_cache = LRUCache(TIMETABLE_CACHE_SIZE, TIMETABLE_CACHE_TTL)
+
+
+
+def invalidate_group(group_id: int) -> int:
+  removed = timetable_cache.invalidate(lambda key: key[0] == group_id)
+  removed += message_cache.invalidate(lambda key: key[0] == group_id)
+  removed += calendar_cache.invalidate(lambda key: key[0] == group_id)
+  return removed
+
+
+
+def invalidate_all() -> int:
+  return timetable_cache.clear() + message_cache.clear() + calendar_cache.clear()
+
+
+
+def cache_stats() -> dict:
+  return {
+    "timetable": timetable_cache.stats(),
+    "messages": message_cache.stats(),
+    "calendars": calendar_cache.stats()
+  }
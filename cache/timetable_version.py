@@ -0,0 +1,77 @@
+"""
+timetable_version.py
+
+This module, located in the 'cache' folder, keeps the schedule caches of every bot process coherent with 
+the timetable stored in the database.
+
+Each change to the timetable increments the generation counter of the 'timetableVersion' table. Every 
+TIMETABLE_VERSION_POLL_SECONDS, each process reads that counter with one small query and, only when it 
+differs from the last generation it has seen, drops its cached schedules (or reloads its in-memory 
+timetable). Between changes, cached schedules are served without any database access.
+
+Functions included in this module:
+
+- check_timetable_version(session): Compares the counter with the last seen generation and refreshes the 
+  local timetable if it changed.
+- publish_timetable_change(session): Increments the counter, so that every other process refreshes its 
+  timetable, and records the new generation as already seen by the current process.
+- seen_timetable_generation(): Returns the last generation seen by the current process, None before the first check.
+- poll_timetable_version(context): The JobQueue callback running 'check_timetable_version'.
+- schedule_timetable_version_poll(application): Registers the polling job on the application's JobQueue.
+"""
+
+from config.config import TIMETABLE_VERSION_POLL_SECONDS
+from db.executor import run_db
+from db.memory_store import timetable_store
+from db.interogations import get_timetable_generation, bump_timetable_generation, load_timetable_store
+from .schedule_cache import invalidate_all
+
+# Last timetable generation seen by this process, None until the first check
+_seen = {"generation": None}
+
+
+
+def _refresh_local_timetable(session):
+  if timetable_store.loaded:
+    load_timetable_store(session)
+  else:
+    invalidate_all()
+
+
+
+def check_timetable_version(session) -> bool:
+  generation = get_timetable_generation(session)
+  changed = _seen["generation"] is not None and generation != _seen["generation"]
+  _seen["generation"] = generation
+
+  if changed:
+    _refresh_local_timetable(session)
+
+  return changed
+
+
+
+def publish_timetable_change(session) -> int:
+  bump_timetable_generation(session)
+  session.commit()
+
+  _seen["generation"] = get_timetable_generation(session)
+  return _seen["generation"]
+
+
+
+def seen_timetable_generation():
+  return _seen["generation"]
+
+
+
+async def poll_timetable_version(context) -> None:
+  if await run_db(check_timetable_version):
+    print(f"Timetable changed, now at generation {_seen['generation']}; schedule caches refreshed")
+
+
+
+def schedule_timetable_version_poll(application):
+  application.job_queue.run_repeating(
+    poll_timetable_version, interval=TIMETABLE_VERSION_POLL_SECONDS, first=0, name="timetable_version_poll"
+  )
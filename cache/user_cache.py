@@ -0,0 +1,21 @@
+"""
+user_cache.py
+
+This module, located in the 'cache' folder, holds the in-process cache of chat ID -> group ID mappings.
+
+Every menu message needs the group of the user who sent it, and that mapping only changes when the user 
+registers again. 'get_user_group_id' from 'db.interogations' therefore reads through this cache, and 
+'update_or_create_user' writes the new group into it as soon as it is committed. At startup, 
+'warm_user_cache' fills it with the most recent users so the first messages after a restart do not 
+hit the database.
+
+The size and time-to-live of the cache are configured through USER_CACHE_SIZE and USER_CACHE_TTL 
+in 'config.config'. When several webhook workers are started, each one drops the entries of the users who 
+registered again through another worker ('cache.user_changes').
+"""
+
+from config.config import USER_CACHE_SIZE, USER_CACHE_TTL
+from .lru_cache import LRUCache
+
+# Group IDs keyed by the chat ID of the user
+user_cache = LRUCache(USER_CACHE_SIZE, USER_CACHE_TTL)
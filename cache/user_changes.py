@@ -0,0 +1,64 @@
+"""
+user_changes.py
+
+This module, located in the 'cache' folder, keeps the user caches of the webhook workers coherent with 
+the user table.
+
+Each worker process has its own user cache ('cache.user_cache'). When a user registers again through one 
+worker, 'update_or_create_user' updates that worker's cache and stores the time of the change in 
+'user.updatedAt'. Every USER_CHANGES_POLL_SECONDS, each worker fetches the chat IDs of the users changed 
+since its previous check, with one query on the 'ix_user_updatedAt' index, and drops their cached groups, 
+so the next message of such a user reads the new group from the database.
+
+Functions included in this module:
+
+- check_user_changes(session): Drops the cached groups of the users changed since the previous check and 
+  returns how many were dropped.
+- mark_user_changes_seen(since): Sets the time from which the next check looks for changes, used when the 
+  user cache is restored from a snapshot taken at that time.
+- poll_user_changes(context): The JobQueue callback running 'check_user_changes'.
+- schedule_user_changes_poll(application): Registers the polling job on the application's JobQueue.
+"""
+
+from datetime import datetime, timedelta
+from config.config import USER_CHANGES_POLL_SECONDS
+from db.executor import run_db
+from db.interogations import get_users_changed_since
+from .user_cache import user_cache
+
+# Changes are looked up a little before the previous check, so a registration committed just after
+# that check, with an earlier timestamp, is not missed
+CHECK_OVERLAP = timedelta(seconds=5)
+
+# Time of the previous check of this process, None until the first one
+_seen = {"since": None}
+
+
+
+def check_user_changes(session) -> int:
+  now = datetime.now()
+  since = _seen["since"] or now
+  changed = get_users_changed_since(session, since - CHECK_OVERLAP)
+  _seen["since"] = now
+
+  if not changed:
+    return 0
+
+  return user_cache.invalidate(lambda chat_id: chat_id in changed)
+
+
+
+def mark_user_changes_seen(since: datetime) -> None:
+  _seen["since"] = since
+
+
+
+async def poll_user_changes(context) -> None:
+  await run_db(check_user_changes)
+
+
+
+def schedule_user_changes_poll(application):
+  application.job_queue.run_repeating(
+    poll_user_changes, interval=USER_CHANGES_POLL_SECONDS, first=0, name="user_changes_poll"
+  )
@@ -13,4 +13,144 @@ BOTNAME = os.getenv('BOTNAME')
 DB_USERNAME = os.getenv('DB_USERNAME')
 DB_PASSWORD = os.getenv('DB_PASSWORD')
 DB_HOST = os.getenv('DB_HOST')
-DB_NAME = os.getenv('DB_NAME')
\ No newline at end of file
+DB_NAME = os.getenv('DB_NAME')
+
+# Database Executor Configuration
+# Number of worker threads used to run blocking database calls outside the asyncio event loop
+DB_EXECUTOR_WORKERS = int(os.getenv('DB_EXECUTOR_WORKERS', '4'))
+
+
+# Timetable Cache Configuration
+# Maximum number of cached schedules and the time (in seconds) after which a cached schedule expires
+TIMETABLE_CACHE_SIZE = int(os.getenv('TIMETABLE_CACHE_SIZE', '2048'))
+TIMETABLE_CACHE_TTL = int(os.getenv('TIMETABLE_CACHE_TTL', '3600'))
+
+
+# In-Memory Timetable Configuration
+# When enabled, the whole timetable is loaded at startup and schedule queries are served from memory
+IN_MEMORY_TIMETABLE = os.getenv('IN_MEMORY_TIMETABLE', 'false').lower() == 'true'
+
+# Administration Configuration
+# Comma-separated chat IDs allowed to use administrative commands such as /reload
+ADMIN_CHAT_IDS = {chat_id.strip() for chat_id in os.getenv('ADMIN_CHAT_IDS', '').split(',') if chat_id.strip()}
+
+
+# User Cache Configuration
+# Maximum number of cached chat ID -> group ID mappings, their time-to-live (in seconds) and whether
+# the cache is filled with the most recent users at startup
+USER_CACHE_SIZE = int(os.getenv('USER_CACHE_SIZE', '50000'))
+USER_CACHE_TTL = int(os.getenv('USER_CACHE_TTL', '86400'))
+USER_CACHE_WARMUP = os.getenv('USER_CACHE_WARMUP', 'true').lower() == 'true'
+
+
+# Database Connection Pool Configuration
+# Number of persistent connections, extra connections allowed under load, seconds to wait for a free
+# connection, seconds after which a connection is recycled (below MySQL's wait_timeout) and whether
+# connections are checked before being handed out
+DB_POOL_SIZE = int(os.getenv('DB_POOL_SIZE', '5'))
+DB_MAX_OVERFLOW = int(os.getenv('DB_MAX_OVERFLOW', '10'))
+DB_POOL_TIMEOUT = int(os.getenv('DB_POOL_TIMEOUT', '30'))
+DB_POOL_RECYCLE = int(os.getenv('DB_POOL_RECYCLE', '3600'))
+DB_POOL_PRE_PING = os.getenv('DB_POOL_PRE_PING', 'true').lower() == 'true'
+
+
+# Update Delivery Configuration
+# BOT_MODE is either 'polling' (default) or 'webhook'. In webhook mode the bot listens on WEBHOOK_LISTEN,
+# starting at WEBHOOK_PORT, for updates posted by Telegram to WEBHOOK_URL, and rejects requests that do not
+# carry WEBHOOK_SECRET_TOKEN. WEBHOOK_WORKERS processes are started, worker i listening on WEBHOOK_PORT + i,
+# to be placed behind a reverse proxy exposing WEBHOOK_URL
+BOT_MODE = os.getenv('BOT_MODE', 'polling').lower()
+WEBHOOK_LISTEN = os.getenv('WEBHOOK_LISTEN', '127.0.0.1')
+WEBHOOK_PORT = int(os.getenv('WEBHOOK_PORT', '8443'))
+WEBHOOK_PATH = os.getenv('WEBHOOK_PATH', 'telegram')
+WEBHOOK_URL = os.getenv('WEBHOOK_URL')
+WEBHOOK_SECRET_TOKEN = os.getenv('WEBHOOK_SECRET_TOKEN')
+WEBHOOK_WORKERS = int(os.getenv('WEBHOOK_WORKERS', '1'))
+
+
+# Daily Schedule Push Configuration
+# Whether tomorrow's schedule is pushed every day to subscribed users, at which local time, and in which
+# time zone. Messages are sent at most PUSH_RATE_LIMIT per second (Telegram allows about 30), in batches of
+# PUSH_BATCH_SIZE, and a failed message is retried up to PUSH_MAX_RETRIES times. With several webhook
+# workers, the push is sent by the first one only
+DAILY_PUSH_ENABLED = os.getenv('DAILY_PUSH_ENABLED', 'true').lower() == 'true'
+DAILY_PUSH_TIME = os.getenv('DAILY_PUSH_TIME', '20:00')
+TIMEZONE = os.getenv('TIMEZONE', 'Europe/Chisinau')
+PUSH_RATE_LIMIT = float(os.getenv('PUSH_RATE_LIMIT', '25'))
+PUSH_BATCH_SIZE = int(os.getenv('PUSH_BATCH_SIZE', '50'))
+PUSH_MAX_RETRIES = int(os.getenv('PUSH_MAX_RETRIES', '3'))
+
+
+# Pair Reminder Configuration
+# Whether users who opted in are reminded REMINDER_MINUTES before each pair. The reminders of the day
+# are planned every day at REMINDER_PLAN_TIME (local time in TIMEZONE), and when the bot starts after that
+# time. With several webhook workers, reminders are sent by the first one only
+REMINDERS_ENABLED = os.getenv('REMINDERS_ENABLED', 'true').lower() == 'true'
+REMINDER_MINUTES = int(os.getenv('REMINDER_MINUTES', '15'))
+REMINDER_PLAN_TIME = os.getenv('REMINDER_PLAN_TIME', '00:05')
+
+
+# Timetable Import Configuration
+# Number of rows written per executemany batch by the timetable importer
+IMPORT_BATCH_SIZE = int(os.getenv('IMPORT_BATCH_SIZE', '5000'))
+
+
+# Timetable Version Configuration
+# Interval, in seconds, at which every bot process checks whether the timetable was changed
+TIMETABLE_VERSION_POLL_SECONDS = int(os.getenv('TIMETABLE_VERSION_POLL_SECONDS', '30'))
+
+# User Changes Configuration
+# Interval, in seconds, at which every webhook worker drops the cached group of the users who registered
+# again through another worker
+USER_CHANGES_POLL_SECONDS = int(os.getenv('USER_CHANGES_POLL_SECONDS', '10'))
+
+
+# Registration Configuration
+# Time, in seconds, after which an unfinished '/start' registration is abandoned and its partial
+# selection is dropped from memory
+REGISTRATION_TIMEOUT = int(os.getenv('REGISTRATION_TIMEOUT', '600'))
+
+# Whether the partial selection is carried in the callback data of the registration buttons instead of
+# being kept in the memory of the process, so that any webhook worker can answer the next step. It is
+# enabled when several webhook workers are started
+REGISTRATION_IN_CALLBACK_DATA = WEBHOOK_WORKERS > 1
+
+
+# Persistence Configuration
+# Backend keeping the bot state (registrations in progress, user and schedule caches) across restarts:
+# 'pickle' stores it in the file at PERSISTENCE_PATH, 'none' disables persistence. The state is written
+# to the file every PERSISTENCE_UPDATE_INTERVAL seconds and when the bot stops
+PERSISTENCE_BACKEND = os.getenv('PERSISTENCE_BACKEND', 'pickle').lower()
+PERSISTENCE_PATH = os.getenv('PERSISTENCE_PATH', 'bot_state.pickle')
+PERSISTENCE_UPDATE_INTERVAL = int(os.getenv('PERSISTENCE_UPDATE_INTERVAL', '60'))
+
+
+# Metrics Configuration
+# Whether the per-update latency, database time and query count histograms are served in the Prometheus
+# text format on http://METRICS_HOST:METRICS_PORT/metrics. Webhook workers use consecutive ports
+METRICS_ENABLED = os.getenv('METRICS_ENABLED', 'false').lower() == 'true'
+METRICS_HOST = os.getenv('METRICS_HOST', '127.0.0.1')
+METRICS_PORT = int(os.getenv('METRICS_PORT', '9100'))
+
+
+# Profiling Configuration
+# When PROFILE_SAMPLE_RATE is N > 0, one update out of every N handled by the menu and registration handlers
+# is profiled with cProfile and written to PROFILE_DIR/<handler>/, keeping the PROFILE_MAX_FILES most recent
+# files of each handler. 0 disables profiling
+PROFILE_SAMPLE_RATE = int(os.getenv('PROFILE_SAMPLE_RATE', '0'))
+PROFILE_DIR = os.getenv('PROFILE_DIR', 'profiles')
+PROFILE_MAX_FILES = int(os.getenv('PROFILE_MAX_FILES', '50'))
+
+
+# Slow Query Log Configuration
+# When enabled, SQL statements taking at least SLOW_QUERY_THRESHOLD_MS milliseconds are recorded with their
+# query plan in a ring buffer of the last SLOW_QUERY_LOG_SIZE statements, dumped with the /slowlog command
+SLOW_QUERY_LOG = os.getenv('SLOW_QUERY_LOG', 'false').lower() == 'true'
+SLOW_QUERY_THRESHOLD_MS = float(os.getenv('SLOW_QUERY_THRESHOLD_MS', '100'))
+SLOW_QUERY_LOG_SIZE = int(os.getenv('SLOW_QUERY_LOG_SIZE', '100'))
+
+
+# Academic Calendar Configuration
+# JSON file listing, for each academic year, its first and last teaching day and its vacations. Week
+# parity is counted from the first week of each year, and vacation days have no classes
+ACADEMIC_CALENDAR_PATH = os.getenv('ACADEMIC_CALENDAR_PATH', os.path.join(os.path.dirname(__file__), 'academic_calendar.json'))
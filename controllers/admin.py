@@ -0,0 +1,105 @@
+"""
+admin.py
+
+This module, part of the 'controllers' folder, contains the administrative commands of the Telegram bot. 
+They are only available to the chat IDs listed in ADMIN_CHAT_IDS from 'config.config'; other users 
+receive no answer.
+
+Functions include:
+- reload_timetable: Reloads the in-memory timetable (when in-memory mode is enabled) and drops every 
+  cached schedule, so that changes made to the timetable tables become visible. The timetable generation 
+  counter is incremented too, so the other bot processes refresh their timetable as well. The registration 
+  reference data (specialities, languages and groups) is reloaded too.
+- handle_reload: Handles the '/reload' command by calling 'reload_timetable'.
+- handle_stats: Handles the '/stats' command by sending the hit, miss and eviction counters of the caches 
+  and the state of the database connection pool.
+- handle_slowlog: Handles the '/slowlog' command by sending the slow query log ('db.slow_query_log') as a 
+  text file; '/slowlog clear' empties it.
+"""
+
+import io
+from telegram import Update
+from telegram.ext import ContextTypes
+from config.config import ADMIN_CHAT_IDS
+from db.executor import run_db
+from db.db_connect import pool_stats
+from db.slow_query_log import get_slow_queries, clear_slow_queries, format_slow_queries
+from db.memory_store import timetable_store
+from db.interogations import load_timetable_store
+from cache.schedule_cache import invalidate_all, cache_stats
+from cache.timetable_version import publish_timetable_change
+from cache.reference_cache import load_reference_data
+
+
+
+def is_admin(update: Update) -> bool:
+  return str(update.effective_chat.id) in ADMIN_CHAT_IDS
+
+
+
+def reload_timetable(session) -> str:
+  """
+  Reloads the timetable used to answer schedule requests.
+
+  Args:
+    session (Session): The database session used to perform queries.
+
+  Returns:
+    str: A short report of what was reloaded.
+
+  In in-memory mode, the whole timetable is loaded again from the database, which also drops every 
+  cached schedule. Otherwise only the caches are dropped, and schedules are queried again on demand. 
+  Other processes notice the new timetable generation at their next version check.
+  """
+
+  publish_timetable_change(session)
+  load_reference_data(session)
+
+  if timetable_store.loaded:
+    count = load_timetable_store(session)
+    return f"Orarul a fost reîncărcat ({count} perechi)."
+
+  removed = invalidate_all()
+  return f"Cache-ul orarului a fost golit ({removed} intrări)."
+
+
+
+async def handle_reload(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+  if not is_admin(update):
+    return
+
+  report = await run_db(reload_timetable)
+  await update.message.reply_text(report)
+
+
+
+async def handle_stats(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+  if not is_admin(update):
+    return
+
+  lines = [
+    f"<b>{name}</b>: " + ", ".join(f"{counter}={value}" for counter, value in stats.items())
+    for name, stats in {**cache_stats(), "pool": pool_stats()}.items()
+  ]
+
+  await update.message.reply_text("\n".join(lines), parse_mode='HTML')
+
+
+
+async def handle_slowlog(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+  if not is_admin(update):
+    return
+
+  if context.args and context.args[0] == "clear":
+    removed = clear_slow_queries()
+    await update.message.reply_text(f"Jurnalul interogărilor lente a fost golit ({removed} intrări).")
+    return
+
+  entries = get_slow_queries()
+
+  if not entries:
+    await update.message.reply_text("Nu există interogări lente.")
+    return
+
+  report = io.BytesIO(format_slow_queries(entries).encode("utf-8"))
+  await update.message.reply_document(document=report, filename="slowlog.txt", caption=f"{len(entries)} interogări lente")
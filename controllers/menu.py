@@ -5,19 +5,27 @@ This module, part of the 'controllers' folder, contains the main function to han
 for the Telegram bot. It defines various responses to user selections from the bot's menu, providing 
 useful information such as daily or weekly schedules, week parity, and other related data.
 
-The module includes the following key function:
+The module includes the following key functions:
 
 - handle_menu_action(update: Update, context: ContextTypes.DEFAULT_TYPE): 
   This asynchronous function handles the different menu actions based on user text input. 
-  It retrieves the user's group ID and responds with the relevant information. The function 
+  It builds the reply in the database thread pool and sends it back to the user.
+
+- menu_action(update):
+  Returns the short name of the menu option selected in an update ("astăzi", "mâine", "săptămâna", 
+  "paritatea", or "altele" for any other text), used to label the metrics of 'handle_menu_action'.
+
+- build_menu_reply(session, chat_id, text):
+  This synchronous function retrieves the user's group ID and builds the relevant response. The function 
   is capable of handling various commands, such as providing the schedule for 'today', 'tomorrow', 
   the 'entire week', and determining the 'parity of the week'. It uses utility functions and database 
-  queries to gather and format the necessary information before sending it back to the user.
+  queries to gather and format the necessary information.
 
 Key features include:
 - Calculating and displaying the schedule for the next day with scheduled pairs (classes or sessions).
 - Checking and displaying the schedule for the current day.
-- Determining the parity of the current week (odd or even) based on a predefined academic calendar.
+- Determining the parity of the current week (odd or even) based on the academic calendar, and whether 
+  the current day falls in a vacation.
 - Displaying the full schedule for the current week.
 
 Each action uses data fetched from the database, processed and formatted to be user-friendly before 
@@ -29,9 +37,23 @@ aspect of the Telegram bot, enabling users to access timely and relevant academi
 from telegram import Update
 from telegram.ext import ContextTypes
 from datetime import timedelta, datetime
-from db.db_connect import SessionLocal
-from .menu_options import format_schedule, find_next_day_with_pairs, check_today_schedule, get_week_parity, format_schedule_with_parity
-from db.interogations import get_user_group_id, get_week_schedule
+from db.executor import run_db
+from .menu_options import find_next_day_with_pairs, check_today_schedule, get_week_parity, render_day_schedule, render_week_schedule
+from utils.date_helpers import is_teaching_day, academic_calendar
+from db.interogations import get_user_group_id
+
+# Short names of the menu options, used as the 'action' label of the metrics
+MENU_ACTIONS = {
+  "Orarul pentru astăzi": "astăzi",
+  "Orarul pentru mâine": "mâine",
+  "Orarul pentru toată săptămâna": "săptămâna",
+  "Paritatea săptămânii": "paritatea"
+}
+
+
+
+def menu_action(update: Update) -> str:
+  return MENU_ACTIONS.get(update.effective_message.text, "altele")
 
 
 
@@ -39,6 +61,24 @@ async def handle_menu_action(update: Update, context: ContextTypes.DEFAULT_TYPE)
   """
   Handles user interactions with the bot's menu, responding to various text inputs with appropriate actions.
 
+  The reply is built by 'build_menu_reply', which runs in the database thread pool through 'run_db' so that 
+  the queries it performs do not block the event loop while other chats are being served. Texts that do not 
+  match any menu option are ignored.
+  """
+
+  text = update.message.text
+  chat_id = str(update.effective_chat.id)
+  reply = await run_db(build_menu_reply, chat_id, text)
+
+  if reply:
+    await update.message.reply_text(reply, parse_mode='HTML')
+
+
+
+def build_menu_reply(session, chat_id: str, text: str):
+  """
+  Builds the reply message for a menu option selected by the user.
+
   - "Orarul pentru mâine":
     Responds with the schedule for the next day. It calculates the schedule for tomorrow, checks if there are 
     any classes or sessions, and formats the response accordingly. If there are no classes for tomorrow, it finds 
@@ -56,14 +96,19 @@ async def handle_menu_action(update: Update, context: ContextTypes.DEFAULT_TYPE)
     Returns the full schedule for the entire week. It gathers and formats information about all the classes and 
     sessions scheduled for the week and presents it to the user.
 
+  Args:
+    session (Session): The database session used to perform queries.
+    chat_id (str): The chat ID of the user who selected the option.
+    text (str): The text of the selected menu option.
+
+  Returns:
+    str: The HTML formatted reply, or None if the text does not match any menu option.
+
   Each option utilizes various helper functions and database queries from 'db.interogations' and 'menu_options' 
-  to fetch and format the necessary data. The function ensures that the responses are well-structured and 
-  informative, enhancing the user's interaction experience with the bot.
+  to fetch and format the necessary data. This function is synchronous and is meant to be executed through 
+  'run_db', outside the event loop.
   """
-    
-  text = update.message.text
-  chat_id = str(update.effective_chat.id)
-  session = SessionLocal()
+
   groupId = get_user_group_id(session, chat_id)
 
 
@@ -79,43 +124,38 @@ async def handle_menu_action(update: Update, context: ContextTypes.DEFAULT_TYPE)
       else:
         intro_message = f"Mâine nu ai perechi. Uite orarul pentru {next_weekday}, {next_date.strftime('%d.%m.%Y')}"
         
-      schedule_message = f"{intro_message}\n\n{format_schedule(pairs)}"
-      await update.message.reply_text(schedule_message, parse_mode='HTML')
+      calendar_day = academic_calendar.get_day(next_date)
+      schedule_message = render_day_schedule(groupId, calendar_day.weekDayId, calendar_day.weekParityId, pairs)
+      return f"{intro_message}\n\n{schedule_message}"
 
     else:
-      await update.message.reply_text("Nu ai perechi în următoarele zile.")
+      return "Nu ai perechi în următoarele zile."
 
 
 
   elif text == "Orarul pentru astăzi":
-    schedule_message = check_today_schedule(session, groupId)
-    await update.message.reply_text(schedule_message, parse_mode='HTML')
+    return check_today_schedule(session, groupId)
 
 
 
   elif text == "Paritatea săptămânii":
     current_date = datetime.now()
     parity = get_week_parity(current_date)
-    await update.message.reply_text(f"Săptămână <b>{parity}</b>", parse_mode='HTML')
+
+    if not is_teaching_day(current_date):
+      return f"Săptămână <b>{parity}</b>\nAstăzi nu sunt ore (vacanță)."
+
+    return f"Săptămână <b>{parity}</b>"
 
   
 
   elif text == "Orarul pentru toată săptămâna":
-    week_schedule = get_week_schedule(session, groupId)
+    week_message = render_week_schedule(session, groupId)
 
-    if week_schedule:
-      schedule_messages = []
-        
-      for weekday, pairs in week_schedule.items():
-        schedule_message = f"Orarul pentru {weekday}:\n\n{format_schedule_with_parity(pairs)}"
-        schedule_messages.append(schedule_message)
-        
-      full_schedule = "\n\n".join(schedule_messages)
-      await update.message.reply_text(full_schedule, parse_mode='HTML')
+    if week_message:
+      return week_message
 
     else:
-      await update.message.reply_text("Nu există perechi pentru această săptămână.")
-    
-
+      return "Nu există perechi pentru această săptămână."
 
-  session.close()
\ No newline at end of file
+  return None
@@ -15,7 +15,8 @@ Functions included in this module:
 - find_next_day_with_pairs(session, group_id, start_date):
   Determines the next day starting from a given date ('start_date') when the specified group ('group_id') 
   has scheduled classes or sessions. It returns the date, the weekday, and the pairs (classes/sessions) 
-  for that day. This function is useful for finding the next day with scheduled activities.
+  for that day. The day is found with the group's class calendar from 'cache.class_calendar' and the 
+  academic calendar, which skips vacations, so only the schedule of the found day is fetched.
 
 - check_today_schedule(session, group_id):
   Returns a string message with today's schedule for the specified group. It checks the current time 
@@ -26,6 +27,16 @@ Functions included in this module:
   Similar to `format_schedule`, but also includes information about the week parity (odd or even) 
   for each session. This is particularly useful for schedules that alternate on a bi-weekly basis.
 
+- render_day_schedule(group_id, week_day_id, week_parity_id, pairs):
+  Returns the output of `format_schedule` for a group's day, reusing the cached message when available.
+
+- render_week_schedule(session, group_id):
+  Returns the full HTML message with the week's schedule of a group, reusing the cached message when available.
+
+Rendered messages are kept in 'message_cache' from 'cache.schedule_cache', keyed by 
+(group_id, week_day_id, week_parity_id, variant), and are invalidated together with the cached timetable. 
+Weekday and parity names are only resolved from their IDs when a message is rendered.
+
 These utility functions play a crucial role in the bot's ability to provide detailed and accurate 
 schedule information, enhancing the overall user experience. They leverage the `date_helpers` module 
 from `utils` for date-related calculations and use data fetched from the database via `db.interogations`.
@@ -34,21 +45,25 @@ from `utils` for date-related calculations and use data fetched from the databas
 
 from datetime import datetime, timedelta
 from sqlalchemy.orm import Session
-from utils.date_helpers import get_weekday, get_week_parity
-from db.interogations import get_tomorrows_schedule
+from utils.date_helpers import WEEKDAY_NAMES, WEEK_PARITY_NAMES, get_week_parity, academic_calendar
+from db.interogations import get_day_schedule_by_id, get_week_schedule_by_id
+from cache.schedule_cache import message_cache
+from cache.class_calendar import get_class_calendar
 
+# Number of days, from the start date, searched for the next day with pairs (long enough to cross the summer)
+NEXT_DAY_HORIZON_DAYS = 120
 
 
 def format_schedule(course_sessions):
   """
   Formats a list of course sessions into a structured and readable string.
 
-  This function takes a list of course session objects and formats them into a user-friendly text layout. 
+  This function takes a list of course sessions (ScheduleRow tuples) and formats them into a user-friendly text layout. 
   Each session's details are organized in a clear and concise manner, making it easy for users to 
   understand their schedule.
 
   Args:
-    course_sessions (list): A list of course session objects to be formatted.
+    course_sessions (list): A list of ScheduleRow tuples to be formatted.
 
   Returns:
     str: A formatted string representing the schedule, where each line contains information about 
@@ -61,17 +76,17 @@ def format_schedule(course_sessions):
   in a message or other text-based interface.
   """
 
-  sorted_sessions = sorted(course_sessions, key=lambda session: session.sessionSchedule.startTime)
+  sorted_sessions = sorted(course_sessions, key=lambda session: session.startTime)
 
   message_lines = []
     
   for index, session in enumerate(sorted_sessions, start=1):
-    start_time = session.sessionSchedule.startTime.strftime("%H:%M")
-    end_time = session.sessionSchedule.endTime.strftime("%H:%M")
+    start_time = session.startTime.strftime("%H:%M")
+    end_time = session.endTime.strftime("%H:%M")
 
-    line = (f"<b>{index}. {start_time} -> {end_time}</b> în {session.room.name}\n"
-            f"    {session.activityType.name} cu <i>{session.teacher.name}</i>\n"
-            f"    <b>{session.course.name}</b>\n")
+    line = (f"<b>{index}. {start_time} -> {end_time}</b> în {session.room}\n"
+            f"    {session.activityType} cu <i>{session.teacher}</i>\n"
+            f"    <b>{session.course}</b>\n")
     message_lines.append(line)
 
   return "\n".join(message_lines)
@@ -82,8 +97,8 @@ def find_next_day_with_pairs(session, group_id, start_date):
   """
   Finds the next date, starting from a given start date, when the specified group has scheduled classes or sessions.
 
-  This function scans up to seven days from the 'start_date' to find a day when the specified group ('group_id') 
-  has at least one scheduled class or session. It uses the group's schedule to determine this.
+  This function finds the first teaching day, within NEXT_DAY_HORIZON_DAYS days starting at 'start_date', when 
+  the specified group ('group_id') has at least one scheduled class or session.
 
   Args:
     session (Session): The database session used to perform queries.
@@ -92,23 +107,38 @@ def find_next_day_with_pairs(session, group_id, start_date):
 
   Returns:
     tuple: A tuple containing the next date with scheduled pairs, the weekday of that date, 
-    and the list of pairs (classes/sessions) scheduled for that day. If no pairs are found within 
-    the next seven days, it returns (None, None, None).
-
-  The function iterates through each day, starting from 'start_date', checks the group's schedule for that 
-  day (considering the weekday and week parity), and returns the first date where classes or sessions 
-  are scheduled. It leverages 'get_weekday' and 'get_week_parity' to determine the correct day and parity, 
-  and 'get_tomorrows_schedule' to fetch the schedule for each day.
+    and the list of pairs (classes/sessions) scheduled for that day. If the group has no pairs at all, or none 
+    within the searched days, it returns (None, None, None).
+
+  The group's class calendar, built once from its weekly schedule, gives the number of days between the 
+  weekday and week parity of a day and the next day with classes. Days that are not teaching days in the 
+  academic calendar (vacations, summer) are skipped, and the search jumps again from the day it lands on, 
+  as the parity may restart with a new academic year. Both calendars are in memory, so only the schedule 
+  of the found day is then fetched with 'get_day_schedule_by_id'.
   """
 
-  for i in range(7):
-    current_date = start_date + timedelta(days=i)
-    weekday = get_weekday(current_date)
-    week_parity = get_week_parity(current_date)
-    pairs = get_tomorrows_schedule(session, group_id, weekday, week_parity)
-    if pairs:
-      return current_date, weekday, pairs
-  
+  calendar = get_class_calendar(session, group_id)
+  next_date = start_date
+  horizon = start_date + timedelta(days=NEXT_DAY_HORIZON_DAYS)
+
+  while next_date <= horizon:
+    calendar_day = academic_calendar.get_day(next_date)
+
+    if not calendar_day.teaching:
+      next_date += timedelta(days=1)
+      continue
+
+    offset = calendar.days_until_next(calendar_day.weekDayId, calendar_day.weekParityId)
+
+    if offset is None:
+      return None, None, None
+
+    if offset == 0:
+      pairs = get_day_schedule_by_id(session, group_id, calendar_day.weekDayId, calendar_day.weekParityId)
+      return next_date, WEEKDAY_NAMES[calendar_day.weekDayId], pairs
+
+    next_date += timedelta(days=offset)
+
   return None, None, None
 
 
@@ -129,24 +159,50 @@ def check_today_schedule(session: Session, group_id: int) -> str:
     str: A formatted string listing all the available pairs for the current day. If no pairs are available, 
     it returns a message indicating that there are no classes or sessions scheduled for the day.
 
-  The function first determines the current weekday and week parity. It then fetches the day's schedule 
-  using 'get_tomorrows_schedule' and filters the pairs to include only those that are yet to start or 
-  currently ongoing. The available pairs are formatted into a readable string using 'format_schedule'. 
+  On days without classes in the academic calendar (vacations), no pairs are shown. Otherwise, the function 
+  first determines the current weekday ID and week parity ID. Pairs end in the order of their end times, 
+  which differs from their start order when they overlap, so the pairs still to be shown are always the 
+  latest-ending ones. The day's pairs, sorted by end time, are rendered once per (group, weekday, parity) 
+  into one message for every possible number of pairs that have already ended, and the result is cached. A request then only counts the pairs that have ended and 
+  picks the matching message, so only pairs that are yet to start or currently ongoing are shown. 
   This function is particularly useful for users who want to quickly check their schedule for the day.
   """
 
   current_time = datetime.now()
-  current_weekday = get_weekday(current_time)
-  week_parity = get_week_parity(current_time)
-
-  pairs = get_tomorrows_schedule(session, group_id, current_weekday, week_parity)
-  available_pairs = [pair for pair in pairs if (pair.sessionSchedule.startTime <= current_time.time() and pair.sessionSchedule.endTime > current_time.time()) or (pair.sessionSchedule.startTime >= current_time.time())]
+  calendar_day = academic_calendar.get_day(current_time)
 
-  if available_pairs:
-    schedule_message = format_schedule(available_pairs)
-    return f"Perechile de astăzi:\n\n{schedule_message}"
-  else:
+  if not calendar_day.teaching:
     return "Nu sunt perechi disponibile pentru astăzi."
+
+  key = (group_id, calendar_day.weekDayId, calendar_day.weekParityId, "today")
+  rendered = message_cache.get(key)
+
+  if rendered is None:
+    pairs = get_day_schedule_by_id(session, group_id, calendar_day.weekDayId, calendar_day.weekParityId)
+    rendered = _render_today_messages(pairs)
+    message_cache.put(key, rendered)
+
+  end_times, messages = rendered
+  ended = 0
+
+  while ended < len(end_times) and end_times[ended] <= current_time.time():
+    ended += 1
+
+  return messages[ended]
+
+
+
+def _render_today_messages(pairs):
+  # 'format_schedule' lists the remaining pairs by start time again
+  sorted_pairs = sorted(pairs, key=lambda pair: pair.endTime)
+  end_times = tuple(pair.endTime for pair in sorted_pairs)
+
+  messages = tuple(
+    f"Perechile de astăzi:\n\n{format_schedule(sorted_pairs[ended:])}"
+    for ended in range(len(sorted_pairs))
+  ) + ("Nu sunt perechi disponibile pentru astăzi.",)
+
+  return end_times, messages
   
 
 
@@ -154,12 +210,12 @@ def format_schedule_with_parity(course_sessions):
   """
   Formats a list of course sessions into a structured and readable string, including week parity information.
 
-  This function takes a list of course session objects, sorts them by their start times, and formats 
+  This function takes a list of course sessions (ScheduleRow tuples), sorts them by their start times, and formats 
   them into a user-friendly text layout. Each session's details are organized in a clear and concise 
   manner, and the function also adds information about the week parity (odd or even) for each session.
 
   Args:
-    course_sessions (list): A list of course session objects to be formatted.
+    course_sessions (list): A list of ScheduleRow tuples to be formatted.
 
   Returns:
     str: A formatted string representing the schedule, where each line contains detailed information 
@@ -173,23 +229,78 @@ def format_schedule_with_parity(course_sessions):
   alternate on a bi-weekly basis.
   """
 
-  sorted_sessions = sorted(course_sessions, key=lambda session: session.sessionSchedule.startTime)
+  sorted_sessions = sorted(course_sessions, key=lambda session: session.startTime)
   message_lines = []
     
   for index, session in enumerate(sorted_sessions, start=1):
-    start_time = session.sessionSchedule.startTime.strftime("%H:%M")
-    end_time = session.sessionSchedule.endTime.strftime("%H:%M")
+    start_time = session.startTime.strftime("%H:%M")
+    end_time = session.endTime.strftime("%H:%M")
 
-    if session.weekParityId == 1:
-      parity_text = " (săpt. pară)"
-    elif session.weekParityId == 2:
-      parity_text = " (săpt. impară)"
+    if session.weekParityId in WEEK_PARITY_NAMES:
+      parity_text = f" (săpt. {WEEK_PARITY_NAMES[session.weekParityId]})"
     else:
       parity_text = ""
 
-    line = (f"<b>{index}. {start_time} -> {end_time}</b> în {session.room.name}{parity_text}\n"
-            f"    {session.activityType.name} cu <i>{session.teacher.name}</i>\n"
-            f"    <b>{session.course.name}</b>\n")
+    line = (f"<b>{index}. {start_time} -> {end_time}</b> în {session.room}{parity_text}\n"
+            f"    {session.activityType} cu <i>{session.teacher}</i>\n"
+            f"    <b>{session.course}</b>\n")
     message_lines.append(line)
 
-  return "\n".join(message_lines)
\ No newline at end of file
+  return "\n".join(message_lines)
+
+
+
+def render_day_schedule(group_id: int, week_day_id: int, week_parity_id: int, pairs) -> str:
+  """
+  Returns the formatted schedule of a group for a given day, using the rendered message cache.
+
+  Args:
+    group_id (int): The ID of the group the pairs belong to.
+    week_day_id (int): The weekday ID of the pairs.
+    week_parity_id (int): The parity ID of the week the pairs belong to.
+    pairs (list): The ScheduleRow tuples scheduled for that day.
+
+  Returns:
+    str: The same string as 'format_schedule(pairs)', rendered only once per (group, weekday, parity).
+  """
+
+  key = (group_id, week_day_id, week_parity_id, "day")
+  message = message_cache.get(key)
+
+  if message is None:
+    message = format_schedule(pairs)
+    message_cache.put(key, message)
+
+  return message
+
+
+
+def render_week_schedule(session: Session, group_id: int):
+  """
+  Returns the full schedule of a group for the entire week as a single HTML message.
+
+  Args:
+    session (Session): The database session used to perform queries.
+    group_id (int): The ID of the group for which the schedule is being queried.
+
+  Returns:
+    str: The schedule of every weekday with pairs, formatted with 'format_schedule_with_parity', 
+    or None if the group has no pairs during the week.
+
+  The message is rendered once and kept in the rendered message cache until the timetable is invalidated.
+  """
+
+  key = (group_id, None, None, "week")
+  message = message_cache.get(key)
+
+  if message is None:
+    week_schedule = get_week_schedule_by_id(session, group_id)
+    schedule_messages = [
+      f"Orarul pentru {WEEKDAY_NAMES[week_day_id]}:\n\n{format_schedule_with_parity(pairs)}"
+      for week_day_id, pairs in week_schedule.items()
+    ]
+
+    message = "\n\n".join(schedule_messages)
+    message_cache.put(key, message)
+
+  return message or None
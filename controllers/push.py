@@ -0,0 +1,96 @@
+"""
+push.py
+
+This module, part of the 'controllers' folder, implements the daily push of tomorrow's schedule. Users 
+subscribe with '/abonare' and unsubscribe with '/dezabonare'; every evening, at DAILY_PUSH_TIME from 
+'config.config', each subscriber receives the schedule of the next day.
+
+Functions include:
+- handle_subscribe / handle_unsubscribe: Handle the '/abonare' and '/dezabonare' commands.
+- build_daily_messages: Builds the messages for every subscriber. Subscribers are grouped by their 
+  group, so each group's schedule is fetched and rendered only once, however many students it has.
+- push_tomorrow_schedule: The JobQueue callback sending the messages through 'utils.broadcast', which 
+  limits the send rate and retries rate-limited messages. The next day is taken in TIMEZONE, like the time 
+  of the job, whatever the time zone of the server.
+- schedule_daily_push: Registers the daily job on the application's JobQueue.
+"""
+
+from datetime import datetime, timedelta, time
+import pytz
+from telegram import Update
+from telegram.ext import ContextTypes
+from config.config import DAILY_PUSH_TIME, TIMEZONE
+from db.executor import run_db
+from db.interogations import set_daily_schedule, get_daily_schedule_subscribers, get_day_schedule_by_id
+from utils.date_helpers import WEEKDAY_NAMES, academic_calendar
+from utils.broadcast import broadcast
+from .menu_options import render_day_schedule
+
+
+
+async def handle_subscribe(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+  subscribed = await run_db(set_daily_schedule, str(update.effective_chat.id), True)
+
+  if subscribed:
+    await update.message.reply_text(f"Vei primi orarul pentru mâine în fiecare seară, la ora {DAILY_PUSH_TIME}.")
+  else:
+    await update.message.reply_text("Mai întâi alege-ți grupa cu comanda /start.")
+
+
+
+async def handle_unsubscribe(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+  await run_db(set_daily_schedule, str(update.effective_chat.id), False)
+  await update.message.reply_text("Nu vei mai primi orarul în fiecare seară.")
+
+
+
+def build_daily_messages(session, target_date):
+  """
+  Builds the schedule messages for every subscribed user.
+
+  Args:
+    session (Session): The database session used to perform queries.
+    target_date (datetime.datetime): The day whose schedule is sent.
+
+  Returns:
+    list: (chat_id, text) tuples. Users whose group has no pairs on 'target_date' receive no message, 
+    and nobody does when 'target_date' is not a teaching day in the academic calendar.
+
+  The schedule of each group is fetched and rendered once, and the same text is then used for every 
+  subscriber of that group.
+  """
+
+  calendar_day = academic_calendar.get_day(target_date)
+
+  if not calendar_day.teaching:
+    return []
+
+  subscribers = get_daily_schedule_subscribers(session)
+  weekday = WEEKDAY_NAMES[calendar_day.weekDayId]
+  texts = {}
+
+  for group_id in {group_id for _, group_id in subscribers}:
+    pairs = get_day_schedule_by_id(session, group_id, calendar_day.weekDayId, calendar_day.weekParityId)
+
+    if pairs:
+      schedule_message = render_day_schedule(group_id, calendar_day.weekDayId, calendar_day.weekParityId, pairs)
+      texts[group_id] = f"Orarul pentru mâine, {weekday}, {target_date.strftime('%d.%m.%Y')}\n\n{schedule_message}"
+
+  return [(chat_id, texts[group_id]) for chat_id, group_id in subscribers if group_id in texts]
+
+
+
+async def push_tomorrow_schedule(context: ContextTypes.DEFAULT_TYPE) -> None:
+  tomorrow_date = datetime.now(pytz.timezone(TIMEZONE)) + timedelta(days=1)
+  messages = await run_db(build_daily_messages, tomorrow_date)
+  stats = await broadcast(context.bot, messages)
+
+  print(f"Daily schedule push: {stats['sent']} sent, {stats['failed']} failed, {stats['retries']} retries")
+
+
+
+def schedule_daily_push(application):
+  hour, minute = map(int, DAILY_PUSH_TIME.split(':'))
+  push_time = time(hour, minute, tzinfo=pytz.timezone(TIMEZONE))
+
+  application.job_queue.run_daily(push_tomorrow_schedule, time=push_time, name="daily_schedule_push")
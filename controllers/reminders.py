@@ -0,0 +1,128 @@
+"""
+reminders.py
+
+This module, part of the 'controllers' folder, implements the reminders sent REMINDER_MINUTES before each 
+pair to the users who enabled them with '/notificari' (and disabled them with '/fara_notificari').
+
+Reminders are driven by the distinct start times of the day's pairs rather than by users. Once per day, 
+'plan_reminders' builds a timer wheel mapping each start time to the groups that have a pair at that 
+time, together with the reminder text of each group, and schedules a single job per start time. When a 
+job fires, 'send_reminders' fetches the subscribers of those groups and fans the messages out through 
+'utils.broadcast'. The scheduling cost therefore depends on the number of time slots (about 7 per day), 
+not on the number of users.
+
+Functions include:
+- handle_enable_reminders / handle_disable_reminders: Handle the '/notificari' and '/fara_notificari' commands.
+- build_reminder_wheel: Builds the start time -> {group ID: reminder text} mapping for a day.
+- plan_reminders: The daily JobQueue callback scheduling one job per start time.
+- send_reminders: The JobQueue callback sending the reminders of one start time.
+- schedule_reminders: Registers the daily planning job on the application's JobQueue, and an immediate one 
+  when the bot starts after today's planning time.
+
+Planning replaces the reminder jobs already scheduled for the same start times, so a day is never planned twice.
+"""
+
+from datetime import datetime, timedelta, time
+import pytz
+from telegram import Update
+from telegram.ext import ContextTypes
+from config.config import REMINDER_MINUTES, REMINDER_PLAN_TIME, TIMEZONE
+from db.executor import run_db
+from db.interogations import set_reminders, get_reminder_subscribers, get_day_schedule_all_groups
+from utils.date_helpers import academic_calendar
+from utils.broadcast import broadcast
+
+
+
+async def handle_enable_reminders(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+  enabled = await run_db(set_reminders, str(update.effective_chat.id), True)
+
+  if enabled:
+    await update.message.reply_text(f"Vei primi o notificare cu {REMINDER_MINUTES} minute înainte de fiecare pereche.")
+  else:
+    await update.message.reply_text("Mai întâi alege-ți grupa cu comanda /start.")
+
+
+
+async def handle_disable_reminders(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+  await run_db(set_reminders, str(update.effective_chat.id), False)
+  await update.message.reply_text("Nu vei mai primi notificări înainte de perechi.")
+
+
+
+def build_reminder_wheel(session, target_date) -> dict:
+  """
+  Builds the reminders of a day, grouped by start time.
+
+  Args:
+    session (Session): The database session used to perform queries.
+    target_date (datetime.datetime): The day whose pairs are announced.
+
+  Returns:
+    dict: A mapping from each distinct start time to a dict of {group ID: reminder text} for the groups 
+    that have a pair starting at that time. It is empty when 'target_date' is not a teaching day in the 
+    academic calendar.
+  """
+
+  calendar_day = academic_calendar.get_day(target_date)
+
+  if not calendar_day.teaching:
+    return {}
+
+  day_schedules = get_day_schedule_all_groups(session, calendar_day.weekDayId, calendar_day.weekParityId)
+  wheel = {}
+
+  for group_id, pairs in day_schedules.items():
+    for pair in pairs:
+      line = (f"<b>{pair.course}</b> ({pair.activityType}) în {pair.room}, "
+              f"cu <i>{pair.teacher}</i>")
+      slot = wheel.setdefault(pair.startTime, {})
+
+      if group_id in slot:
+        slot[group_id] += f"\n{line}"
+      else:
+        slot[group_id] = f"Peste {REMINDER_MINUTES} minute, la {pair.startTime.strftime('%H:%M')}:\n{line}"
+
+  return wheel
+
+
+
+async def send_reminders(context: ContextTypes.DEFAULT_TYPE) -> None:
+  texts = context.job.data
+  subscribers = await run_db(get_reminder_subscribers, list(texts))
+
+  await broadcast(context.bot, [(chat_id, texts[group_id]) for chat_id, group_id in subscribers])
+
+
+
+async def plan_reminders(context: ContextTypes.DEFAULT_TYPE) -> None:
+  timezone = pytz.timezone(TIMEZONE)
+  now = datetime.now(timezone)
+  today = now.date()
+
+  wheel = await run_db(build_reminder_wheel, now)
+
+  for start_time, texts in wheel.items():
+    when = timezone.localize(datetime.combine(today, start_time)) - timedelta(minutes=REMINDER_MINUTES)
+
+    if when > now:
+      name = f"reminders_{start_time.strftime('%H%M')}"
+
+      for job in context.job_queue.get_jobs_by_name(name):
+        job.schedule_removal()
+
+      context.job_queue.run_once(send_reminders, when=when, data=texts, name=name)
+
+
+
+def schedule_reminders(application):
+  timezone = pytz.timezone(TIMEZONE)
+  hour, minute = map(int, REMINDER_PLAN_TIME.split(':'))
+  plan_time = time(hour, minute, tzinfo=timezone)
+
+  application.job_queue.run_daily(plan_reminders, time=plan_time, name="plan_reminders")
+
+  # Plan the rest of the current day as well, so a restart does not skip today's reminders, unless the
+  # daily planning has not run yet today and will do it
+  if datetime.now(timezone).time() >= time(hour, minute):
+    application.job_queue.run_once(plan_reminders, when=0, name="plan_reminders_startup")
@@ -9,60 +9,146 @@ The functions utilize a modularized approach, calling separate functions to quer
 to construct responses for the user. This design enhances the clarity and reusability of the code.
 
 Functions include:
-- select_speciality: Allows users to select their specialty.
+- select_speciality: Allows users to select their specialty, offering returning users their previous group.
+- keep_group: Keeps the previous group of a returning user with a single tap.
 - select_semester: Allows users to select the semester.
 - select_language: Allows users to choose the language of instruction.
 - select_group: Allows users to select their group.
 - finish_selection: Finalizes the user's selection and records the choice in the database.
+- registration_timeout: Drops the partial selection of a registration that was abandoned.
+- expired_selection: Answers the buttons of a registration that is no longer in progress.
+
+The selection steps are the states of a ConversationHandler (SPECIALITY, SEMESTER, LANGUAGE and GROUP, 
+see 'utils.handlers'). The partial selection is kept in 'context.user_data' under the 'registration' key, 
+so every button only carries the value chosen at its own step. Registrations that are not finished within 
+REGISTRATION_TIMEOUT seconds are ended and their partial selection is dropped from memory.
+
+The callback data of every step starts with the name of the step ('spec:', 'sem:' or 'lang:'), so a button 
+of an older '/start' message is never read as the choice of the current step; in the registration conversation it is 
+answered by 'expired_selection' instead.
+
+When several webhook workers are started, consecutive button presses of a user can reach different processes, 
+so nothing can be kept in memory between the steps. With REGISTRATION_IN_CALLBACK_DATA, the steps are plain 
+handlers and every button carries the whole selection made so far: 'sem:speciality-semester' for the semester 
+buttons and 'lang:speciality-semester-language' for the language buttons. The handlers accept both formats.
 
 Each function interacts with the user through inline keyboards and manages responses to 
-progress the selection process.
+progress the selection process. Specialities, languages, groups and their keyboards come from 
+the reference data cache ('cache.reference_cache'), so the selection steps do not query the database. 
+The final database write is executed in the database thread pool through 'run_db', so it never 
+blocks the event loop.
 """
 
 from telegram import Update
-from telegram.ext import ContextTypes
-from db.db_connect import SessionLocal
+from telegram.ext import ContextTypes, ConversationHandler
+from config.config import REGISTRATION_IN_CALLBACK_DATA
+from db.executor import run_db
 from utils.ui_helpers import main_menu_keyboard
-from db.interogations import get_specialities, get_speciality_by_id, get_languages, get_groups, update_or_create_user
-from utils.ui_helpers import build_speciality_keyboard, build_semester_keyboard, build_language_keyboard, build_group_keyboard
+from db.interogations import update_or_create_user, get_user_group_id
+from cache.reference_cache import get_reference_data
+
+# States of the registration conversation
+SPECIALITY, SEMESTER, LANGUAGE, GROUP = range(4)
+
+
+
+def _registration(context) -> dict:
+  # When the selection travels in the callback data, nothing is kept in the memory of the process
+  if REGISTRATION_IN_CALLBACK_DATA:
+    return {}
+
+  return context.user_data.setdefault("registration", {})
+
 
 
-async def select_speciality(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+def _selection(query) -> str:
+  # The callback data without the name of its step
+  return query.data.split(':', 1)[1]
+
+
+
+def _selection_prefix(query) -> str:
+  return f"{_selection(query)}-" if REGISTRATION_IN_CALLBACK_DATA else ""
+
+
+async def select_speciality(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
 
   """
   Asynchronously handles the 'select speciality' command triggered by the '/start' command from a user. 
-  This function is bound to the '/start' command in the Telegram bot's command handler:
-  application.add_handler(CommandHandler("start", select_speciality))
+  This function is the entry point of the registration conversation in the Telegram bot's handler:
+  ConversationHandler(entry_points=[CommandHandler("start", select_speciality)], ...)
 
-  When invoked, this function retrieves a list of specialities from the database and displays them 
-  to the user as an inline keyboard for selection.
+  When invoked, this function retrieves the list of specialities from the reference data and displays them 
+  to the user as an inline keyboard for selection. If the user is already registered, the keyboard starts 
+  with a button that keeps their previous group, so re-registering takes a single tap.
 
   Args:
     update (Update): An object that represents an incoming update.
     context (ContextTypes.DEFAULT_TYPE): Context object passed by the Telegram bot framework.
 
-  The function queries the database for available specialities using `get_specialities`, 
-  then uses `build_speciality_keyboard` to create an inline keyboard layout, 
-  which is sent to the user for making a selection. The session with the database 
-  is closed after sending the response.
+  Returns:
+    int: The SPECIALITY state.
+
+  The function takes the speciality keyboard, built once with `build_speciality_keyboard` 
+  and memoized by the reference data cache, and sends it to the user for making a selection. 
+  The previous group is read through the user cache, in the database thread pool.
   """
 
-  session = SessionLocal()
+  chat_id = str(update.effective_chat.id)
+  previous_group_id = await run_db(get_user_group_id, chat_id)
+
+  _registration(context).update(previous_group_id=previous_group_id)
 
-  specialities = get_specialities(session)
-  reply_markup = build_speciality_keyboard(specialities)
+  reference = await get_reference_data()
+  reply_markup = reference.speciality_keyboard(previous_group_id)
 
   await update.message.reply_text('Selectați specialitatea dvs:', reply_markup=reply_markup)
+  return SPECIALITY
 
-  session.close()
 
 
+async def keep_group(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
+  """
+  Asynchronously handles the button keeping the previous group of a returning user, triggered by a callback 
+  query matching the regex pattern '^keep_group:\d+$' in the SPECIALITY state.
+
+  Args:
+    update (Update): An object representing an incoming update.
+    context (ContextTypes.DEFAULT_TYPE): Context object passed by the Telegram bot framework.
 
-async def select_semester(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+  Returns:
+    int: ConversationHandler.END, the registration being finished.
+
+  When the group is the one read when the registration started, the user record is already up to date and 
+  nothing is written; otherwise the choice is recorded like in `finish_selection`. The main menu is then sent.
   """
-  Asynchronously handles the semester selection, triggered by a callback query matching the regex pattern '^\d+$'.
-  This function is linked to the 'select_semester' callback in the Telegram bot's handler:
-  application.add_handler(CallbackQueryHandler(select_semester, pattern='^\d+$'))
+
+  query = update.callback_query
+  await query.answer()
+
+  registration = context.user_data.pop("registration", None) or {}
+  _, group_id = query.data.split(':')
+  group_id = int(group_id)
+
+  if group_id != registration.get("previous_group_id"):
+    await run_db(update_or_create_user, str(update.effective_chat.id), group_id)
+
+  await query.edit_message_text(text="În câteva momente vei primi meniul principal.")
+
+  reply_markup = main_menu_keyboard()
+  await update.effective_chat.send_message(
+    text="Alege o opțiune din meniu:",
+    reply_markup=reply_markup
+  )
+
+  return ConversationHandler.END
+
+
+
+async def select_semester(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
+  """
+  Asynchronously handles the semester selection, triggered by a callback query matching the regex pattern '^spec:\d+$' 
+  in the SPECIALITY state of the registration conversation.
 
   The function is typically invoked as a follow-up to 'select_speciality', where the user's choice of speciality 
   determines the available semesters for selection.
@@ -71,34 +157,38 @@ async def select_semester(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
     update (Update): An object that represents an incoming update.
     context (ContextTypes.DEFAULT_TYPE): Context object passed by the Telegram bot framework.
 
-  The function extracts the selected speciality ID from the user's callback query, queries the database to 
-  find the corresponding speciality, and then presents the user with a list of semesters to choose from 
-  for that speciality using `build_semester_keyboard`. If the speciality is not found, an error message 
-  is displayed. The database session is closed after sending the response.
+  Returns:
+    int: The SEMESTER state, or the SPECIALITY state if the speciality was not found.
+
+  The function extracts the selected speciality ID from the user's callback query, looks up the corresponding 
+  speciality in the reference data, and then presents the user with a list of semesters to choose from 
+  for that speciality using the memoized result of `build_semester_keyboard`. The speciality is kept in the 
+  registration state. If the speciality is not found, an error message is displayed.
   """  
   
   query = update.callback_query
   await query.answer()
 
-  speciality_id = int(query.data)
-  session = SessionLocal()
-  speciality = get_speciality_by_id(session, speciality_id)
+  speciality_id = int(_selection(query))
+  reference = await get_reference_data()
+  reply_markup = reference.semester_keyboard(speciality_id, _selection_prefix(query))
 
-  if speciality:
-    reply_markup = build_semester_keyboard(speciality)
-    await query.edit_message_text(text='Selectați semestrul:', reply_markup=reply_markup)
-  else:
+  if not reply_markup:
     await query.edit_message_text(text="Specialitatea nu a fost găsită.")
+    return SPECIALITY
 
-  session.close()
+  _registration(context)["speciality_id"] = speciality_id
 
+  await query.edit_message_text(text='Selectați semestrul:', reply_markup=reply_markup)
+  return SEMESTER
 
 
-async def select_language(update: Update, contect: ContextTypes.DEFAULT_TYPE) -> None:
+
+async def select_language(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
   """
   Asynchronously handles the language selection process, triggered by a callback query matching the 
-  regex pattern '^\d+-\d+$'. This function is linked in the Telegram bot's handler as follows:
-  application.add_handler(CallbackQueryHandler(select_language, pattern='^\d+-\d+$'))
+  regex pattern '^sem:\d+$' in the SEMESTER state of the registration conversation (or '^sem:\d+-\d+$' when the 
+  selection is carried in the callback data).
 
   The function is invoked after a user has selected both a speciality and a semester, and it allows 
   the user to choose the language of instruction.
@@ -107,35 +197,38 @@ async def select_language(update: Update, contect: ContextTypes.DEFAULT_TYPE) ->
     update (Update): An object representing an incoming update.
     context (ContextTypes.DEFAULT_TYPE): Context object passed by the Telegram bot framework.
 
-  The function parses the callback query to extract the speciality ID and semester, and then queries 
-  the database for available languages using `get_languages`. It constructs an inline keyboard using 
+  Returns:
+    int: The LANGUAGE state, or ConversationHandler.END if no languages are found.
+
+  The function keeps the semester from the callback query in the registration state, and then takes the 
+  available languages from the reference data. It sends the memoized inline keyboard built with 
   `build_language_keyboard` for the user to select a language. If no languages are found, an error message 
-  is displayed. The database session is closed after the response is sent.
+  is displayed.
   """
 
   query = update.callback_query
   await query.answer()
 
-  speciality_id, semester = map(int, query.data.split('-'))
+  reference = await get_reference_data()
+  reply_markup = reference.language_keyboard(_selection_prefix(query))
 
-  session = SessionLocal()
-  languages = get_languages(session)
-
-  if languages:
-    reply_markup = build_language_keyboard(speciality_id, semester, languages)
-    await query.edit_message_text(text='Selectați limba de intruire:', reply_markup=reply_markup)
-  else:
+  if not reply_markup:
+    context.user_data.pop("registration", None)
     await query.edit_message_text(text="Datele dvs nu sunt valide. Încercați din nou !")
+    return ConversationHandler.END
 
-  session.close()
+  _registration(context)["semester"] = int(_selection(query).split('-')[-1])
 
+  await query.edit_message_text(text='Selectați limba de intruire:', reply_markup=reply_markup)
+  return LANGUAGE
 
 
-async def select_group(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+
+async def select_group(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
   """
   Asynchronously handles the group selection process, triggered by a callback query matching the 
-  regex pattern '^\d+-\d+-\d+$'. This function is linked in the Telegram bot's handler:
-  application.add_handler(CallbackQueryHandler(select_group, pattern='^\d+-\d+-\d+$'))
+  regex pattern '^lang:\d+$' in the LANGUAGE state of the registration conversation (or '^lang:\d+-\d+-\d+$' when the 
+  selection is carried in the callback data).
 
   The function is called after a user has selected a speciality, a semester, and a language. It allows 
   the user to choose their study group.
@@ -144,35 +237,43 @@ async def select_group(update: Update, context: ContextTypes.DEFAULT_TYPE) -> No
     update (Update): An object representing an incoming update.
     context (ContextTypes.DEFAULT_TYPE): Context object passed by the Telegram bot framework.
 
-  The function parses the callback query to extract the speciality ID, semester, and language ID. It 
-  then queries the database for available groups using `get_groups`. An inline keyboard is constructed 
-  using `build_group_keyboard` for the user to select a group. If no groups are found, an error message 
-  is displayed. The database session is closed after the response is sent.
+  Returns:
+    int: The GROUP state, or ConversationHandler.END if no groups are found.
+
+  The function takes the speciality ID and semester from the registration state, or from the callback data 
+  when it carries the whole selection, and the language ID from the callback query. It then looks up the available groups in the reference data's (speciality, semester, 
+  language) index. The memoized inline keyboard built with `build_group_keyboard` is sent for the user to 
+  select a group. If no groups are found, an error message is displayed and the registration ends.
   """
 
   query = update.callback_query
   await query.answer()
 
-  speciality_id, semester, language_id = map(int, query.data.split('-'))
+  values = [int(value) for value in _selection(query).split('-')]
 
-  session = SessionLocal()
-  groups = get_groups(session, speciality_id, semester, language_id)
-
-  if groups:
-    reply_markup = build_group_keyboard(speciality_id, semester, language_id, groups)
-    await query.edit_message_text(text='Selectați grupa dvs:', reply_markup=reply_markup)
+  if len(values) == 3:
+    speciality_id, semester, language_id = values
   else:
+    registration = context.user_data.get("registration", {})
+    speciality_id, semester, language_id = registration.get("speciality_id"), registration.get("semester"), values[0]
+
+  reference = await get_reference_data()
+  reply_markup = reference.group_keyboard(speciality_id, semester, language_id)
+
+  if not reply_markup:
+    context.user_data.pop("registration", None)
     await query.edit_message_text(text="Datele dvs nu sunt valide. Încercați din nou !")
+    return ConversationHandler.END
 
-  session.close()
+  await query.edit_message_text(text='Selectați grupa dvs:', reply_markup=reply_markup)
+  return GROUP
 
 
 
-async def finish_selection(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+async def finish_selection(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
   """
   Asynchronously handles the finalization of the selection process, triggered by a callback query 
-  matching the regex pattern '^group_id:\d+$'. This function is configured in the Telegram bot's handler:
-  application.add_handler(CallbackQueryHandler(finish_selection, pattern='^group_id:\d+$'))
+  matching the regex pattern '^group_id:\d+$' in the GROUP state of the registration conversation.
 
   This function is invoked after a user has made their final selection of a group. It updates or creates 
   a user record in the database with the selected group ID.
@@ -181,13 +282,16 @@ async def finish_selection(update: Update, context: ContextTypes.DEFAULT_TYPE) -
     update (Update): An object representing an incoming update.
     context (ContextTypes.DEFAULT_TYPE): Context object passed by the Telegram bot framework.
 
+  Returns:
+    int: ConversationHandler.END, the registration being finished.
+
   The function parses the callback query to extract the group ID, then uses the chat ID from the 
   effective chat as a unique identifier for the user. It either updates the existing user record 
   or creates a new one with the selected group ID using `update_or_create_user`. After updating 
-  the user information, it sends a message to the user indicating that the main menu will be 
-  displayed next, and then presents the main menu options.
+  the user information, it drops the registration state, sends a message to the user indicating that 
+  the main menu will be displayed next, and then presents the main menu options.
 
-  The database session is closed after the response is sent.
+  The database write runs in the database thread pool through 'run_db'.
   """
 
   query = update.callback_query
@@ -197,8 +301,8 @@ async def finish_selection(update: Update, context: ContextTypes.DEFAULT_TYPE) -
   group_id = int(group_id)
   chat_id = str(update.effective_chat.id)
 
-  session = SessionLocal()
-  update_or_create_user(session, chat_id, group_id)
+  await run_db(update_or_create_user, chat_id, group_id)
+  context.user_data.pop("registration", None)
 
   await query.edit_message_text(text="În câteva momente vei primi meniul principal.")
 
@@ -208,4 +312,24 @@ async def finish_selection(update: Update, context: ContextTypes.DEFAULT_TYPE) -
     reply_markup=reply_markup
   )
 
-  session.close()
\ No newline at end of file
+  return ConversationHandler.END
+
+
+
+async def registration_timeout(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+  """
+  Drops the partial selection of a registration that was not finished within REGISTRATION_TIMEOUT seconds. 
+  It is the handler of the ConversationHandler.TIMEOUT state, so it runs once when the registration expires.
+  """
+
+  context.user_data.pop("registration", None)
+
+
+
+async def expired_selection(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+  """
+  Answers a registration button pressed when no registration is in progress, for example after the 
+  registration expired or the bot was restarted, asking the user to start again with '/start'.
+  """
+
+  await update.callback_query.answer("Selecția a expirat. Folosiți /start pentru a începe din nou.", show_alert=True)
@@ -4,24 +4,140 @@ db_connect.py
 This module establishes the connection to the MySQL database using SQLAlchemy. 
 It sets up the database engine and sessionmaker for interacting with the database.
 
-The database URL and credentials are retrieved from environment variables for security.
+The database URL and credentials are retrieved from environment variables for security. The connection 
+pool is sized and tuned from 'config.config': connections are recycled before MySQL's 'wait_timeout' closes 
+them and are pinged before use, so stale connections are replaced instead of failing a request.
+
+The module also provides:
+- session_scope(): A context manager yielding a session that is rolled back on error and always closed.
+- pool_stats(): The current state of the connection pool and the number of connects, checkouts, 
+  checkins and invalidated connections since startup.
+
+Every SQL statement is timed by 'before_cursor_execute' and 'after_cursor_execute' hooks on the engine 
+('handle_error' discards the start time of a statement that failed), and attributed to the Telegram update being served through 'utils.metrics'. When SLOW_QUERY_LOG is enabled, 
+statements slower than SLOW_QUERY_THRESHOLD_MS are recorded by 'db.slow_query_log'. Statements executed with 
+the 'diagnostic' execution option, such as the EXPLAIN of a slow statement, are not measured.
 
 Exceptions are handled to ensure a graceful degradation in case of connection issues.
 """
 
-from sqlalchemy import create_engine, exc
+import threading
+import time
+from contextlib import contextmanager
+from sqlalchemy import create_engine, event, exc
 from sqlalchemy.orm import sessionmaker
-from config.config import DB_USERNAME, DB_PASSWORD, DB_HOST, DB_NAME
+from utils.metrics import record_query
+from .slow_query_log import log_slow_query
+from config.config import (
+  DB_USERNAME, DB_PASSWORD, DB_HOST, DB_NAME,
+  DB_POOL_SIZE, DB_MAX_OVERFLOW, DB_POOL_TIMEOUT, DB_POOL_RECYCLE, DB_POOL_PRE_PING,
+  SLOW_QUERY_LOG, SLOW_QUERY_THRESHOLD_MS
+)
 
 # Constructing the Database URL for connection
 DATABASE_URL = f"mysql+mysqlconnector://{DB_USERNAME}:{DB_PASSWORD}@{DB_HOST}/{DB_NAME}"
 
-# Creating the database engine with the specified URL
+# Creating the database engine with the specified URL and pool settings
 try:
-  engine = create_engine(DATABASE_URL)
+  engine = create_engine(
+    DATABASE_URL,
+    pool_size=DB_POOL_SIZE,
+    max_overflow=DB_MAX_OVERFLOW,
+    pool_timeout=DB_POOL_TIMEOUT,
+    pool_recycle=DB_POOL_RECYCLE,
+    pool_pre_ping=DB_POOL_PRE_PING
+  )
 except exc.SQLAlchemyError as e:
   print(f"Error connecting to the database: {e}")
   raise
 
 # Creating a sessionmaker, bound to the engine, for database sessions
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
\ No newline at end of file
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+
+@contextmanager
+def session_scope():
+  """
+  Provides a database session for the duration of a 'with' block.
+
+  The session is rolled back if the block raises and is always closed afterwards, returning its 
+  connection to the pool even when sending the reply to the user fails.
+  """
+
+  session = SessionLocal()
+
+  try:
+    yield session
+  except Exception:
+    session.rollback()
+    raise
+  finally:
+    session.close()
+
+
+
+# Counters of pool events since startup
+_pool_counters = {"connects": 0, "checkouts": 0, "checkins": 0, "invalidations": 0}
+_pool_counters_lock = threading.Lock()
+
+
+
+def _count(name):
+  def listener(*args):
+    with _pool_counters_lock:
+      _pool_counters[name] += 1
+
+  return listener
+
+
+
+event.listen(engine, "connect", _count("connects"))
+event.listen(engine, "checkout", _count("checkouts"))
+event.listen(engine, "checkin", _count("checkins"))
+event.listen(engine, "invalidate", _count("invalidations"))
+
+
+
+def pool_stats() -> dict:
+  with _pool_counters_lock:
+    stats = dict(_pool_counters)
+
+  stats["checked_out"] = engine.pool.checkedout()
+  stats["pool_size"] = engine.pool.size()
+  stats["overflow"] = engine.pool.overflow()
+
+  return stats
+
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+  conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+  duration = time.perf_counter() - conn.info["query_start_time"].pop()
+
+  if context is not None and context.execution_options.get("diagnostic"):
+    return
+
+  record_query(duration)
+
+  if SLOW_QUERY_LOG and duration * 1000 >= SLOW_QUERY_THRESHOLD_MS:
+    log_slow_query(conn, statement, parameters, executemany, duration)
+
+
+
+def _handle_error(exception_context):
+  # A failed statement never reaches 'after_cursor_execute'; drop its start time from the pooled connection
+  conn = exception_context.connection
+
+  if conn is not None and exception_context.execution_context is not None and conn.info.get("query_start_time"):
+    conn.info["query_start_time"].pop()
+
+
+
+event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+event.listen(engine, "handle_error", _handle_error)
@@ -0,0 +1,55 @@
+"""
+executor.py
+
+This module, located in the 'db' folder, runs blocking database work outside the asyncio event loop.
+
+The SQLAlchemy engine used by the bot is synchronous, while every Telegram handler is a coroutine. Calling 
+the database directly from a handler would block the event loop and stall every other chat served by the 
+Application. Instead, handlers pass a synchronous function to 'run_db', which executes it in a bounded 
+thread pool and awaits the result. Each handler makes a single 'run_db' call per Telegram update, so every 
+update is served by one session from 'session_scope', which is always released.
+
+The context variables of the caller are copied into the worker thread, so the SQL statements executed there 
+are attributed to the update being served ('utils.metrics') and profiled with it when it was sampled by the 
+profiler ('utils.profiling').
+
+The size of the thread pool is configured through DB_EXECUTOR_WORKERS in 'config.config'.
+"""
+
+import asyncio
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from config.config import DB_EXECUTOR_WORKERS
+from utils.profiling import run_profiled
+from .db_connect import session_scope
+
+# Bounded pool of worker threads shared by all handlers
+executor = ThreadPoolExecutor(max_workers=DB_EXECUTOR_WORKERS, thread_name_prefix="db")
+
+
+
+def _call_with_session(func, *args):
+  with session_scope() as session:
+    return func(session, *args)
+
+
+
+async def run_db(func, *args):
+  """
+  Runs a synchronous database function in the database thread pool and returns its result.
+
+  Args:
+    func (callable): A function accepting a database session as its first argument.
+    *args: Additional positional arguments passed to 'func' after the session.
+
+  Returns:
+    The value returned by 'func'.
+
+  A new session is opened for the call and is always closed afterwards; it is rolled back if 'func' raises. 
+  The event loop stays free to serve other updates while the query is running.
+  """
+
+  loop = asyncio.get_running_loop()
+  context = contextvars.copy_context()
+  return await loop.run_in_executor(executor, partial(context.run, run_profiled, _call_with_session, func, *args))
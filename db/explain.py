@@ -0,0 +1,28 @@
+"""
+explain.py
+
+This module, located in the 'db' folder, runs the query planner on SQL statements issued by the application.
+
+The 'explain' function prefixes a statement with the EXPLAIN syntax of the connected database (EXPLAIN on 
+MySQL, EXPLAIN QUERY PLAN on SQLite, used as a local stand-in) and returns the resulting plan as a list of 
+rows, the first one holding the column names. It is used by the 'scripts.explain_queries' audit script and 
+by the slow query log ('db.slow_query_log').
+"""
+
+
+
+def explain(connection, statement: str, parameters=None) -> list:
+  prefix = "EXPLAIN QUERY PLAN " if connection.dialect.name == 'sqlite' else "EXPLAIN "
+  result = connection.exec_driver_sql(prefix + statement, parameters or ())
+
+  return [tuple(result.keys())] + [tuple(row) for row in result]
+
+
+
+def format_plan(plan: list) -> str:
+  widths = [max(len(str(row[index])) for row in plan) for index in range(len(plan[0]))]
+
+  return "\n".join(
+    " | ".join(str(value).ljust(width) for value, width in zip(row, widths))
+    for row in plan
+  )
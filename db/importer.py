@@ -0,0 +1,246 @@
+"""
+importer.py
+
+This module, located in the 'db' folder, imports a complete timetable into the database in one step.
+
+A timetable is given as a dict mapping table names to lists of rows (dicts keyed by column name). It can 
+be read from a JSON file, from a directory holding one CSV file per table, or from an XLSX workbook holding 
+one sheet per table (which requires the optional 'openpyxl' package).
+
+The 'courseSession' and 'pair' tables are always required. The 'activityType', 'course', 'teacher', 'room' 
+and 'sessionSchedule' tables are optional: when present, their content is replaced too; when missing, the 
+rows already in the database are kept and referenced.
+
+Functions included in this module:
+
+- read_timetable(path, file_format): Reads a timetable from a JSON, CSV or XLSX source.
+- validate_timetable(session, data): Converts every value to its column type and checks, in memory, that 
+  required columns are present, that IDs are unique and that every foreign key references an imported 
+  row or an existing one (for weekdays, week parities, groups and tables that are not imported).
+- import_timetable(session, data, batch_size): Validates the timetable, then deletes the old rows and writes 
+  the new ones with batched executemany inserts inside a single transaction. Readers keep seeing the old 
+  timetable until the transaction commits, so the new timetable replaces it atomically. The timetable 
+  generation counter is bumped in the same transaction, so every bot process drops its cached schedules, 
+  and the schedule caches of the current process are dropped right away.
+
+Errors in the data are reported with TimetableImportError, before anything is written.
+"""
+
+import csv
+import json
+import os
+from datetime import time
+from sqlalchemy import Integer, Time, Boolean, select
+from config.config import IMPORT_BATCH_SIZE
+from models.activityType import ActivityType
+from models.course import Course
+from models.teacher import Teacher
+from models.room import Room
+from models.sessionSchedule import SessionSchedule
+from models.courseSession import CourseSession
+from models.pair import Pair
+from cache.schedule_cache import invalidate_all
+from .interogations import bump_timetable_generation
+
+# Imported models, in insertion order (referenced tables first)
+TIMETABLE_MODELS = (ActivityType, Course, Teacher, Room, SessionSchedule, CourseSession, Pair)
+REQUIRED_TABLES = ("courseSession", "pair")
+
+# Maximum number of validation errors reported at once
+MAX_REPORTED_ERRORS = 20
+
+
+
+class TimetableImportError(ValueError):
+  pass
+
+
+
+def _read_json(path):
+  with open(path, encoding='utf-8') as file:
+    return json.load(file)
+
+
+
+def _read_csv(path):
+  data = {}
+
+  for model in TIMETABLE_MODELS:
+    table_path = os.path.join(path, f"{model.__tablename__}.csv")
+
+    if os.path.exists(table_path):
+      with open(table_path, encoding='utf-8', newline='') as file:
+        data[model.__tablename__] = list(csv.DictReader(file))
+
+  return data
+
+
+
+def _read_xlsx(path):
+  try:
+    from openpyxl import load_workbook
+  except ImportError:
+    raise TimetableImportError("Reading XLSX files requires the 'openpyxl' package.")
+
+  workbook = load_workbook(path, read_only=True, data_only=True)
+  data = {}
+
+  for sheet in workbook.worksheets:
+    rows = sheet.iter_rows(values_only=True)
+    header = next(rows, None)
+
+    if header:
+      data[sheet.title] = [dict(zip(header, row)) for row in rows if any(value is not None for value in row)]
+
+  return data
+
+
+
+def read_timetable(path: str, file_format: str = None) -> dict:
+  if file_format is None:
+    file_format = "csv" if os.path.isdir(path) else os.path.splitext(path)[1].lstrip('.').lower()
+
+  readers = {"json": _read_json, "csv": _read_csv, "xlsx": _read_xlsx}
+
+  if file_format not in readers:
+    raise TimetableImportError(f"Unsupported timetable format: {file_format}")
+
+  return readers[file_format](path)
+
+
+
+def _convert(column, value):
+  if value is None or value == "":
+    return None
+
+  if isinstance(column.type, Integer):
+    return int(value)
+
+  if isinstance(column.type, Time):
+    return value if isinstance(value, time) else time.fromisoformat(str(value))
+
+  if isinstance(column.type, Boolean):
+    return value if isinstance(value, bool) else str(value).lower() in ("1", "true", "da")
+
+  return str(value)
+
+
+
+def validate_timetable(session, data: dict) -> dict:
+  errors = []
+  mappings = {}
+
+  for table_name in REQUIRED_TABLES:
+    if not data.get(table_name):
+      errors.append(f"{table_name}: the table is required and cannot be empty")
+
+  # Convert every value to its column type and check required columns and unique IDs
+  for model in TIMETABLE_MODELS:
+    table_name = model.__tablename__
+
+    if table_name not in data:
+      continue
+
+    rows = []
+    ids = set()
+
+    for index, record in enumerate(data[table_name], start=1):
+      row = {}
+
+      for column in model.__table__.columns:
+        try:
+          value = _convert(column, record.get(column.name))
+        except (TypeError, ValueError):
+          errors.append(f"{table_name} row {index}: invalid value for {column.name}: {record.get(column.name)!r}")
+          continue
+
+        if value is None:
+          if column.primary_key and table_name == "pair":
+            continue
+
+          if not column.nullable:
+            errors.append(f"{table_name} row {index}: missing value for {column.name}")
+
+        row[column.name] = value
+
+      if row.get("id") is not None:
+        if row["id"] in ids:
+          errors.append(f"{table_name} row {index}: duplicate id {row['id']}")
+
+        ids.add(row["id"])
+
+      rows.append(row)
+
+    mappings[table_name] = rows
+
+  # Check every foreign key against the imported rows, or against the database for tables not imported
+  known_ids = {}
+
+  for model in TIMETABLE_MODELS:
+    for column in model.__table__.columns:
+      for foreign_key in column.foreign_keys:
+        target = foreign_key.column.table.name
+
+        if target not in known_ids:
+          if target in mappings:
+            known_ids[target] = {row.get("id") for row in mappings[target]}
+          else:
+            known_ids[target] = set(session.execute(select(foreign_key.column)).scalars())
+
+        for index, row in enumerate(mappings.get(model.__tablename__, ()), start=1):
+          value = row.get(column.name)
+
+          if value is not None and value not in known_ids[target]:
+            errors.append(f"{model.__tablename__} row {index}: {column.name}={value} does not exist in {target}")
+
+  if errors:
+    reported = "\n".join(errors[:MAX_REPORTED_ERRORS])
+    hidden = len(errors) - MAX_REPORTED_ERRORS
+    raise TimetableImportError(reported + (f"\n... and {hidden} more errors" if hidden > 0 else ""))
+
+  return mappings
+
+
+
+def import_timetable(session, data: dict, batch_size: int = IMPORT_BATCH_SIZE) -> dict:
+  """
+  Replaces the timetable stored in the database with the given one.
+
+  Args:
+    session (Session): The database session used to perform the import.
+    data (dict): The timetable, as returned by 'read_timetable'.
+    batch_size (int): The number of rows written per executemany batch.
+
+  Returns:
+    dict: The number of rows imported into each table.
+
+  Raises:
+    TimetableImportError: If the timetable is invalid. Nothing is written in that case.
+
+  Old rows are deleted and new rows are inserted in the same transaction, which is rolled back if any 
+  statement fails. The timetable generation counter is incremented in the same transaction, and every 
+  schedule cache of the current process is dropped after the commit.
+  """
+
+  mappings = validate_timetable(session, data)
+
+  try:
+    for model in reversed(TIMETABLE_MODELS):
+      if model.__tablename__ in mappings:
+        session.query(model).delete(synchronize_session=False)
+
+    for model in TIMETABLE_MODELS:
+      rows = mappings.get(model.__tablename__, [])
+
+      for start in range(0, len(rows), batch_size):
+        session.bulk_insert_mappings(model, rows[start:start + batch_size])
+
+    bump_timetable_generation(session)
+    session.commit()
+  except Exception:
+    session.rollback()
+    raise
+
+  invalidate_all()
+
+  return {table_name: len(rows) for table_name, rows in mappings.items()}
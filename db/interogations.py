@@ -11,10 +11,39 @@ Functions included in this module:
 - get_speciality_by_id(session, speciality_id): Retrieves a specific speciality by its ID.
 - get_languages(session): Fetches all languages available in the academic system.
 - get_groups(session, speciality_id, semester, language_id): Retrieves groups based on specified criteria like speciality, semester, and language.
-- update_or_create_user(session, chat_id, group_id): Updates an existing user's group ID or creates a new user record in the database.
-- get_user_group_id(session, chat_id): Fetches the group ID associated with a specific user, identified by their chat ID.
-- get_tomorrows_schedule(session, group_id, weekday, week_parity): Retrieves the schedule for a specific group for the next day, considering the weekday and week parity.
-- get_week_schedule(session, group_id): Fetches the entire week's schedule for a specific group.
+- get_all_groups(session): Fetches every group, used to build the registration reference data.
+- update_or_create_user(session, chat_id, group_id): Updates an existing user's group ID or creates a new user record in the database, 
+  with a single upsert statement relying on the unique index on 'user.chatId'. The time of the change is stored in 'updatedAt'.
+- get_user_group_id(session, chat_id): Fetches the group ID associated with a specific user, identified by their chat ID, 
+  reading through the user cache ('cache.user_cache').
+- warm_user_cache(session): Fills the user cache with the most recently registered users.
+- get_users_changed_since(session, since): Fetches the chat IDs of the users who registered at or after 'since'.
+- set_daily_schedule(session, chat_id, enabled): Subscribes or unsubscribes a user from the daily schedule push.
+- get_daily_schedule_subscribers(session): Fetches the chat and group IDs of every subscribed user.
+- set_reminders(session, chat_id, enabled): Enables or disables the reminders sent before each pair.
+- get_reminder_subscribers(session, group_ids): Fetches the chat and group IDs of the users of the given groups who enabled reminders.
+- get_day_schedule_by_id(session, group_id, week_day_id, week_parity_id): Retrieves the schedule of a specific group for a day, 
+  given by its weekday ID and week parity ID.
+- get_tomorrows_schedule(session, group_id, weekday, week_parity): Retrieves the schedule for a specific group for the next day, considering the weekday and week parity
+  names, through 'get_day_schedule_by_id'.
+- get_week_schedule_by_id(session, group_id): Fetches the entire week's schedule for a specific group in a single query, grouped by weekday ID, from Monday to Sunday.
+- get_week_schedule(session, group_id): Same as 'get_week_schedule_by_id', grouped by weekday name.
+- get_day_schedule_all_groups(session, week_day_id, week_parity_id): Fetches the schedule of every group for a given day in a single query.
+- load_week_lookups(session): Reads the IDs of the weekdays and week parities from the 'weekDay' and 'weekParity' tables 
+  into the mappings of 'utils.date_helpers'. Raises ValueError when a weekday or parity is missing from the tables.
+- get_timetable_generation(session): Fetches the generation counter of the timetable.
+- bump_timetable_generation(session): Increments the generation counter, without committing, so it can be part of 
+  the transaction that changes the timetable.
+- load_timetable_store(session): Loads the timetable of every group into the in-memory store ('db.memory_store').
+
+Schedule queries return ScheduleRow tuples (see 'db.schedule_row') selected in a single statement, so the 
+course, teacher, room, activity type and time interval of every pair are available without further queries. 
+Their results are kept in the in-process timetable cache ('cache.schedule_cache') as immutable snapshots. 
+Once the in-memory store has been loaded, schedule queries are answered from it instead of the database. 
+Schedule filters compare the integer 'weekDayId' and 'weekParityId' columns of 'courseSession', covered by the 
+indexes declared in the models, instead of comparing weekday and parity names in joined tables. The 'weekDay' 
+and 'weekParity' tables are not joined at all: the IDs are carried through the caches and the in-memory store, 
+and their names are taken from the constants of 'utils.date_helpers' when a schedule is displayed.
 
 Each function in this module is designed to interact with the database using SQLAlchemy ORM, abstracting 
 the complexities of direct database queries. The functions provide a clear and Pythonic way of accessing 
@@ -24,7 +53,10 @@ facilitating seamless data retrieval for the Telegram bot's functionalities.
 """
 
 
+from datetime import datetime
 from sqlalchemy import or_
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from models.speciality import Speciality
 from models.language import Language
 from models.group import Group
@@ -37,6 +69,13 @@ from models.teacher import Teacher
 from models.weekParity import WeekParity
 from models.weekDay import WeekDay
 from models.sessionSchedule import SessionSchedule
+from models.activityType import ActivityType
+from models.timetableVersion import TimetableVersion
+from utils.date_helpers import WEEKDAYS, WEEK_PARITIES, WEEKDAY_IDS, WEEKDAY_NAMES, WEEK_PARITY_IDS, set_week_lookups, weekday_position
+from .schedule_row import ScheduleRow
+from .memory_store import timetable_store
+from cache.schedule_cache import timetable_cache, invalidate_all
+from cache.user_cache import user_cache
 
 
 
@@ -46,7 +85,7 @@ def get_specialities(session):
 
 
 def get_speciality_by_id(session, speciality_id):
-  return session.query(Speciality).get(speciality_id)
+  return session.get(Speciality, speciality_id)
 
 
 
@@ -64,71 +103,279 @@ def get_groups(session, speciality_id, semester, language_id):
 
 
 
-def update_or_create_user(session, chat_id, group_id):
-  user = session.query(User).filter(User.chatId == chat_id).first()
+def get_all_groups(session):
+  return session.query(Group).order_by(Group.id).all()
 
-  if user:
-    user.groupId = group_id
-  else: 
-    user = User(chatId=chat_id, groupId=group_id)
-    session.add(user)
 
+
+def update_or_create_user(session, chat_id, group_id):
+  if session.get_bind().dialect.name == 'mysql':
+    statement = mysql_insert(User).values(chatId=chat_id, groupId=group_id, updatedAt=datetime.now())
+    statement = statement.on_duplicate_key_update(groupId=statement.inserted.groupId, updatedAt=statement.inserted.updatedAt)
+  else:
+    statement = sqlite_insert(User).values(chatId=chat_id, groupId=group_id, updatedAt=datetime.now())
+    statement = statement.on_conflict_do_update(
+      index_elements=[User.chatId], set_={"groupId": statement.excluded.groupId, "updatedAt": statement.excluded.updatedAt}
+    )
+
+  session.execute(statement)
   session.commit()
-  return user
+  user_cache.put(chat_id, group_id)
 
 
 
 def get_user_group_id(session, chat_id: str) -> int:
+  group_id = user_cache.get(chat_id)
+
+  if group_id is not None:
+    return group_id
+
   user = session.query(User).filter(User.chatId == chat_id).first()
-  return user.groupId if user else None
 
+  if user is None:
+    return None
 
+  user_cache.put(chat_id, user.groupId)
+  return user.groupId
 
-def get_tomorrows_schedule(session, group_id: int, weekday: str, week_parity: str):
-  pairs = (
-    session.query(CourseSession)
+
+
+def warm_user_cache(session) -> int:
+  users = (
+    session.query(User.chatId, User.groupId)
+      .order_by(User.id.desc())
+      .limit(user_cache.maxsize)
+      .all()
+    )
+
+  for chat_id, group_id in reversed(users):
+    user_cache.put(chat_id, group_id)
+
+  return len(users)
+
+
+
+def get_users_changed_since(session, since) -> set:
+  return {chat_id for chat_id, in session.query(User.chatId).filter(User.updatedAt >= since)}
+
+
+
+def set_daily_schedule(session, chat_id: str, enabled: bool) -> bool:
+  updated = (
+    session.query(User)
+      .filter(User.chatId == chat_id)
+      .update({User.dailySchedule: enabled}, synchronize_session=False)
+    )
+
+  session.commit()
+  return updated > 0
+
+
+
+def get_daily_schedule_subscribers(session):
+  return session.query(User.chatId, User.groupId).filter(User.dailySchedule == True).all()
+
+
+
+def set_reminders(session, chat_id: str, enabled: bool) -> bool:
+  updated = (
+    session.query(User)
+      .filter(User.chatId == chat_id)
+      .update({User.reminders: enabled}, synchronize_session=False)
+    )
+
+  session.commit()
+  return updated > 0
+
+
+
+def get_reminder_subscribers(session, group_ids):
+  return (
+    session.query(User.chatId, User.groupId)
+      .filter(User.reminders == True, User.groupId.in_(group_ids))
+      .all()
+    )
+
+
+
+def load_week_lookups(session) -> None:
+  week_days = {day: id for id, day in session.query(WeekDay.id, WeekDay.day)}
+  week_parities = {name: id for id, name in session.query(WeekParity.id, WeekParity.name)}
+
+  missing = [day for day in WEEKDAYS if day not in week_days] + [name for name in WEEK_PARITIES if name not in week_parities]
+
+  if missing:
+    raise ValueError(f"Missing from the weekDay and weekParity tables: {', '.join(missing)}")
+
+  set_week_lookups(
+    {day: week_days[day] for day in WEEKDAYS},
+    {name: week_parities[name] for name in WEEK_PARITIES}
+  )
+
+
+
+def _schedule_query(session):
+  return (
+    session.query(
+      CourseSession.id,
+      Course.name,
+      Teacher.name,
+      Room.name,
+      ActivityType.name,
+      SessionSchedule.startTime,
+      SessionSchedule.endTime,
+      CourseSession.weekDayId,
+      CourseSession.weekParityId
+    )
+      .select_from(CourseSession)
       .join(Pair, CourseSession.id == Pair.courseSessionId)
       .join(Course, CourseSession.courseId == Course.id)
       .join(Teacher, CourseSession.teacherId == Teacher.id)
       .join(Room, CourseSession.roomId == Room.id)
+      .join(ActivityType, CourseSession.activityTypeId == ActivityType.id)
       .join(SessionSchedule, CourseSession.sessionTimeId == SessionSchedule.id)
-      .join(WeekDay, CourseSession.weekDayId == WeekDay.id)
-      .join(WeekParity, CourseSession.weekParityId == WeekParity.id, isouter=True)
+  )
+
+
+
+def get_day_schedule_by_id(session, group_id: int, week_day_id: int, week_parity_id: int):
+  key = (group_id, week_day_id, week_parity_id)
+  pairs = timetable_cache.get(key)
+
+  if pairs is not None:
+    return pairs
+
+  if timetable_store.loaded:
+    pairs = timetable_store.get_day(group_id, week_day_id, week_parity_id)
+    timetable_cache.put(key, pairs)
+    return pairs
+
+  rows = (
+    _schedule_query(session)
       .filter(
         Pair.groupId == group_id,
-        WeekDay.day == weekday,
+        CourseSession.weekDayId == week_day_id,
 
         or_(
           CourseSession.weekParityId == None,
-          WeekParity.name == week_parity
+          CourseSession.weekParityId == week_parity_id
         )
       )
       .all()
     )
 
+  pairs = tuple(ScheduleRow(*row) for row in rows)
+  timetable_cache.put(key, pairs)
+
   return pairs
 
 
 
-def get_week_schedule(session, group_id: int):
+def get_tomorrows_schedule(session, group_id: int, weekday: str, week_parity: str):
+  return get_day_schedule_by_id(session, group_id, WEEKDAY_IDS.get(weekday), WEEK_PARITY_IDS.get(week_parity))
+
+
+
+def get_week_schedule_by_id(session, group_id: int):
+  key = (group_id, None, None)
+  week = timetable_cache.get(key)
+
+  if week is not None:
+    return dict(week)
+
+  if timetable_store.loaded:
+    week = timetable_store.get_week(group_id)
+    timetable_cache.put(key, week)
+    return dict(week)
+
+  rows = (
+    _schedule_query(session)
+      .filter(Pair.groupId == group_id)
+      .order_by(CourseSession.weekDayId, SessionSchedule.startTime)
+      .all()
+    )
+
   week_schedule = {}
 
-  for weekday in ["Luni", "Marti", "Miercuri", "Joi", "Vineri", "Sambata", "Duminica"]:
-    pairs = (
-      session.query(CourseSession)
-      .join(Pair, CourseSession.id == Pair.courseSessionId)
-      .join(Course, CourseSession.courseId == Course.id)
-      .join(Teacher, CourseSession.teacherId == Teacher.id)
-      .join(Room, CourseSession.roomId == Room.id)
-      .join(SessionSchedule, CourseSession.sessionTimeId == SessionSchedule.id)
-      .join(WeekDay, CourseSession.weekDayId == WeekDay.id)
+  for row in rows:
+    pair = ScheduleRow(*row)
+    week_schedule.setdefault(pair.weekDayId, []).append(pair)
+
+  week = tuple(
+    (week_day_id, tuple(pairs))
+    for week_day_id, pairs in sorted(week_schedule.items(), key=lambda day: weekday_position(day[0]))
+    )
+  timetable_cache.put(key, week)
+
+  return dict(week)
+
+
+
+def get_week_schedule(session, group_id: int):
+  week_schedule = get_week_schedule_by_id(session, group_id)
+  return {WEEKDAY_NAMES[week_day_id]: pairs for week_day_id, pairs in week_schedule.items()}
+
+
+
+def get_day_schedule_all_groups(session, week_day_id: int, week_parity_id: int) -> dict:
+  if timetable_store.loaded:
+    return timetable_store.get_day_all_groups(week_day_id, week_parity_id)
+
+  rows = (
+    _schedule_query(session)
+      .add_columns(Pair.groupId)
       .filter(
-        Pair.groupId == group_id,
-        WeekDay.day == weekday
-      ).all()
+        CourseSession.weekDayId == week_day_id,
+
+        or_(
+          CourseSession.weekParityId == None,
+          CourseSession.weekParityId == week_parity_id
+        )
+      )
+      .order_by(Pair.groupId, SessionSchedule.startTime)
+      .all()
+    )
+
+  day_schedules = {}
+
+  for row in rows:
+    day_schedules.setdefault(row[-1], []).append(ScheduleRow(*row[:-1]))
+
+  return {group_id: tuple(pairs) for group_id, pairs in day_schedules.items()}
+
+
+
+def get_timetable_generation(session) -> int:
+  generation = session.query(TimetableVersion.generation).filter(TimetableVersion.id == 1).scalar()
+  return generation or 0
+
+
+
+def bump_timetable_generation(session) -> None:
+  updated = (
+    session.query(TimetableVersion)
+      .filter(TimetableVersion.id == 1)
+      .update(
+        {TimetableVersion.generation: TimetableVersion.generation + 1, TimetableVersion.updatedAt: datetime.now()},
+        synchronize_session=False
+      )
+    )
+
+  if not updated:
+    session.add(TimetableVersion(id=1, generation=1, updatedAt=datetime.now()))
+    session.flush()
+
+
+
+def load_timetable_store(session) -> int:
+  rows = (
+    _schedule_query(session)
+      .add_columns(Pair.groupId)
+      .order_by(Pair.groupId, CourseSession.weekDayId, SessionSchedule.startTime)
+      .all()
     )
 
-    if pairs:
-      week_schedule[weekday] = pairs
+  count = timetable_store.load((row[-1], ScheduleRow(*row[:-1])) for row in rows)
+  invalidate_all()
 
-  return week_schedule
\ No newline at end of file
+  return count
@@ -0,0 +1,84 @@
+"""
+memory_store.py
+
+This module, located in the 'db' folder, defines the in-memory timetable store used when the bot runs in 
+"in-memory mode" (IN_MEMORY_TIMETABLE in 'config.config').
+
+The timetable of the whole faculty is small and almost static, so it can be loaded once at startup and 
+served without touching the database. The store keeps, for every group, its weekly schedule as compact 
+tuples of ScheduleRow grouped by weekday ID, from Monday to Sunday, in the same shape used by the timetable cache. The MySQL 
+database is then only needed for the user table.
+
+Reloading replaces the whole index in a single assignment, so readers running in other threads always 
+see either the old or the new timetable, never a partial one. The store is filled and reloaded through 
+'load_timetable_store' from 'db.interogations'.
+"""
+
+from utils.date_helpers import weekday_position
+
+
+
+class TimetableStore:
+  __slots__ = ("_weeks", "loaded")
+
+  def __init__(self):
+    self._weeks = {}
+    self.loaded = False
+
+
+  def load(self, rows):
+    """
+    Replaces the stored timetable with the given rows.
+
+    Args:
+      rows (iterable): (group_id, ScheduleRow) tuples, ordered by start time within each day.
+
+    Returns:
+      int: The number of rows loaded.
+    """
+
+    weeks = {}
+    count = 0
+
+    for group_id, pair in rows:
+      weeks.setdefault(group_id, {}).setdefault(pair.weekDayId, []).append(pair)
+      count += 1
+
+    self._weeks = {
+      group_id: tuple(
+        (week_day_id, tuple(pairs)) for week_day_id, pairs in sorted(week.items(), key=lambda day: weekday_position(day[0]))
+        )
+      for group_id, week in weeks.items()
+    }
+    self.loaded = True
+
+    return count
+
+
+  def get_day(self, group_id: int, week_day_id: int, week_parity_id: int) -> tuple:
+    for day_id, pairs in self._weeks.get(group_id, ()):
+      if day_id == week_day_id:
+        return tuple(pair for pair in pairs if pair.weekParityId is None or pair.weekParityId == week_parity_id)
+
+    return ()
+
+
+  def get_week(self, group_id: int) -> tuple:
+    return self._weeks.get(group_id, ())
+
+
+  def get_day_all_groups(self, week_day_id: int, week_parity_id: int) -> dict:
+    day_schedules = {}
+
+    for group_id in self._weeks:
+      pairs = self.get_day(group_id, week_day_id, week_parity_id)
+
+      if pairs:
+        day_schedules[group_id] = pairs
+
+    return day_schedules
+
+
+
+# Store shared by the whole process, empty until 'load_timetable_store' is called
+timetable_store = TimetableStore()
@@ -0,0 +1,28 @@
+"""
+schedule_row.py
+
+This module, located in the 'db' folder, defines the ScheduleRow type, a lightweight and immutable
+projection of a course session together with everything needed to display it (course, teacher, room,
+activity type, time interval, weekday ID and week parity ID). Weekday and parity names are resolved from
+their IDs with the constants of 'utils.date_helpers' only when a schedule is displayed.
+
+Schedule queries in 'db.interogations' select these columns in a single statement instead of loading
+CourseSession objects, so formatting a schedule never triggers additional lazy loads. Because the rows
+are plain named tuples, they are detached from any database session and can be freely shared or cached.
+"""
+
+from datetime import time
+from typing import NamedTuple, Optional
+
+
+
+class ScheduleRow(NamedTuple):
+  id: int
+  course: str
+  teacher: str
+  room: str
+  activityType: str
+  startTime: time
+  endTime: time
+  weekDayId: int
+  weekParityId: Optional[int]
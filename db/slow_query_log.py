@@ -0,0 +1,145 @@
+"""
+slow_query_log.py
+
+This module, located in the 'db' folder, keeps the diagnostic log of slow SQL statements, used to notice 
+that a query has become slow (for example because an index on 'pair.groupId' or 'user.chatId' is missing 
+or no longer used) before users do.
+
+When SLOW_QUERY_LOG is enabled, every statement is timed by the cursor hooks of 'db.db_connect'. Statements 
+that take at least SLOW_QUERY_THRESHOLD_MS milliseconds are recorded with:
+
+- the SQL text and its bound parameters; parameters of statements on the 'user' table are redacted, so no 
+  chat ID is ever kept,
+- the function of 'db.interogations' that issued the statement (or the closest caller outside SQLAlchemy),
+- the query plan, obtained on a separate connection with 'db.explain'; executemany batches are not explained.
+
+Entries are kept in a ring buffer of the last SLOW_QUERY_LOG_SIZE slow statements, which can be dumped on 
+demand, e.g. with the administrative '/slowlog' command.
+
+Functions and classes included in this module:
+
+- SlowQuery: One entry of the log.
+- log_slow_query(connection, statement, parameters, executemany, duration): Records a slow statement.
+- get_slow_queries(): Returns the entries of the log, oldest first.
+- clear_slow_queries(): Empties the log.
+- format_slow_queries(entries): Formats entries as plain text.
+"""
+
+import re
+import sys
+import threading
+from collections import deque
+from datetime import datetime
+from typing import NamedTuple, Optional
+from config.config import SLOW_QUERY_LOG_SIZE
+from .explain import explain, format_plan
+
+# Statements reading or writing the user table, whose parameters hold chat IDs
+USER_TABLE = re.compile(r'[`"]?\buser\b[`"]?', re.IGNORECASE)
+
+# Modules skipped when looking for the function that issued a statement
+INTERNAL_MODULES = ("sqlalchemy", "db.db_connect", "db.slow_query_log", "contextlib")
+
+
+
+class SlowQuery(NamedTuple):
+  timestamp: datetime
+  duration_ms: float
+  function: str
+  statement: str
+  parameters: str
+  plan: Optional[str]
+
+
+
+_entries = deque(maxlen=SLOW_QUERY_LOG_SIZE)
+_entries_lock = threading.Lock()
+
+
+
+def _calling_function() -> str:
+  frame = sys._getframe(2)
+  fallback = None
+
+  while frame is not None:
+    module = frame.f_globals.get("__name__", "")
+
+    # Comprehensions and lambdas are attributed to the function they are defined in
+    if frame.f_code.co_name.startswith("<"):
+      frame = frame.f_back
+      continue
+
+    if module == "db.interogations":
+      return frame.f_code.co_name
+
+    if fallback is None and not module.startswith(INTERNAL_MODULES):
+      fallback = f"{module}.{frame.f_code.co_name}"
+
+    frame = frame.f_back
+
+  return fallback or "?"
+
+
+
+def _redact(statement: str, parameters, executemany: bool) -> str:
+  if USER_TABLE.search(statement):
+    count = len(parameters) if parameters is not None and not executemany else "?"
+    return f"<{count} parameters redacted>"
+
+  if executemany:
+    return f"<{len(parameters)} parameter sets>"
+
+  return repr(parameters)
+
+
+
+def _plan(connection, statement: str, parameters, executemany: bool):
+  if executemany:
+    return None
+
+  # The plan is read on its own connection, marked so its statements are neither timed nor logged
+  try:
+    with connection.engine.connect() as explain_connection:
+      return format_plan(explain(explain_connection.execution_options(diagnostic=True), statement, parameters))
+  except Exception as e:
+    return f"EXPLAIN failed: {e}"
+
+
+
+def log_slow_query(connection, statement: str, parameters, executemany: bool, duration: float) -> None:
+  entry = SlowQuery(
+    timestamp=datetime.now(),
+    duration_ms=round(duration * 1000, 2),
+    function=_calling_function(),
+    statement=statement,
+    parameters=_redact(statement, parameters, executemany),
+    plan=_plan(connection, statement, parameters, executemany)
+  )
+
+  with _entries_lock:
+    _entries.append(entry)
+
+
+
+def get_slow_queries() -> list:
+  with _entries_lock:
+    return list(_entries)
+
+
+
+def clear_slow_queries() -> int:
+  with _entries_lock:
+    removed = len(_entries)
+    _entries.clear()
+    return removed
+
+
+
+def format_slow_queries(entries) -> str:
+  return "\n\n".join(
+    f"[{entry.timestamp:%Y-%m-%d %H:%M:%S}] {entry.duration_ms} ms in {entry.function}\n"
+    f"{entry.statement}\n"
+    f"parameters: {entry.parameters}\n"
+    f"{entry.plan or 'no plan'}"
+    for entry in entries
+  )
@@ -8,29 +8,209 @@ Key Features:
   - Initializes the Telegram bot application with the API token.
   - Integrates the command and callback handlers defined in the utils/handlers module. These handlers 
     dictate how the bot responds to various commands and interactions from users.
-  - Starts the bot application, which enters a polling loop to listen for and respond to user actions.
+  - Loads the whole timetable into memory at startup when in-memory mode (IN_MEMORY_TIMETABLE) is enabled.
+  - Schedules the daily push of tomorrow's schedule to subscribed users (DAILY_PUSH_ENABLED), in the first 
+    webhook worker only when several are started.
+  - Schedules the reminders sent before each pair to users who enabled them (REMINDERS_ENABLED), in the first 
+    webhook worker only when several are started.
+  - Polls the timetable generation counter and refreshes the schedule caches when the timetable changes.
+  - In webhook workers, polls the users who registered again and drops their cached group, so a registration 
+    handled by one worker is seen by the others within USER_CHANGES_POLL_SECONDS.
+  - Reads the weekday and parity IDs used by the schedule queries from their lookup tables at startup.
+  - Loads the registration reference data (specialities, languages, groups) at startup.
+  - Fills the user cache with the most recent users at startup (USER_CACHE_WARMUP).
+  - Keeps the registrations in progress and the user and schedule caches across restarts with the 
+    persistence backend configured by PERSISTENCE_BACKEND, so a restarted bot starts with warm caches.
+  - Reloads the timetable and drops the schedule caches when the process receives SIGHUP.
+  - Serves per-update latency, database time and query count metrics in the Prometheus text format 
+    (METRICS_ENABLED); each webhook worker uses its own port.
+  - Starts the bot application, which either enters a polling loop (BOT_MODE=polling) or serves the updates 
+    posted by Telegram to a webhook (BOT_MODE=webhook). In webhook mode, WEBHOOK_WORKERS worker processes 
+    can be started behind a reverse proxy; each one listens on its own port and stops gracefully on 
+    SIGINT/SIGTERM. A SIGHUP sent to the parent process is forwarded to the workers.
 
 Usage:
   This script is executed to start the bot. It is the central coordinator for various components of the 
   bot, linking configurations, handlers, and the Telegram API.
 """
 
+import asyncio
+import multiprocessing
+import os
+import signal
 from telegram.ext import Application
-from config.config import TELEGRAM_TOKEN
+from config.config import (
+	TELEGRAM_TOKEN, IN_MEMORY_TIMETABLE, USER_CACHE_WARMUP, DAILY_PUSH_ENABLED, REMINDERS_ENABLED, BOT_MODE,
+	WEBHOOK_LISTEN, WEBHOOK_PORT, WEBHOOK_PATH, WEBHOOK_URL, WEBHOOK_SECRET_TOKEN, WEBHOOK_WORKERS,
+	METRICS_ENABLED, METRICS_HOST, METRICS_PORT
+)
 from utils.handlers import add_handlers
+from db.executor import run_db
+from db.interogations import load_timetable_store, warm_user_cache, load_week_lookups
+from controllers.admin import reload_timetable
+from controllers.push import schedule_daily_push
+from controllers.reminders import schedule_reminders
+from cache.timetable_version import schedule_timetable_version_poll
+from cache.user_changes import schedule_user_changes_poll
+from cache.reference_cache import load_reference_data
+from utils.metrics import start_metrics_server
+from utils.persistence import build_persistence, restore_caches, save_cache_snapshot, schedule_cache_snapshots
 
 
-if __name__ == '__main__':
+async def post_init(application):
+	# Schedules are looked up by the weekday and parity IDs of the lookup tables; the bot does not start
+	# when a weekday or parity is missing from them
+	await run_db(load_week_lookups)
+
+	# Load the timetable of every group into memory before the first update is served
+	if IN_MEMORY_TIMETABLE:
+		count = await run_db(load_timetable_store)
+		print(f"Loaded {count} pairs into the in-memory timetable")
+
+	# Load specialities, languages and groups used by the registration flow
+	await run_db(load_reference_data)
+
+	# Restore the caches saved by the previous run, schedules only if the timetable did not change since
+	restored = {"users": 0, "schedules": 0}
+
+	if application.persistence is not None:
+		restored = await run_db(restore_caches, application.bot_data)
+		print(f"Restored {restored['users']} users and {restored['schedules']} schedules from the saved state")
+
+	# Fill the user cache so the first messages after a restart do not query the user table
+	if USER_CACHE_WARMUP and not restored["users"]:
+		count = await run_db(warm_user_cache)
+		print(f"Loaded {count} users into the user cache")
+
+	# Reload the timetable on SIGHUP, where the platform supports it
+	if hasattr(signal, 'SIGHUP'):
+		asyncio.get_running_loop().add_signal_handler(
+			signal.SIGHUP, lambda: application.create_task(run_db(reload_timetable))
+		)
+
+
+async def post_stop(application):
+	# Save the current caches together with the rest of the bot state
+	if application.persistence is not None:
+		await save_cache_snapshot(application)
+
+
+def runs_scheduled_jobs(worker) -> bool:
+	# Jobs sending messages run in the first webhook worker only (or in the single process)
+	return worker is None or worker == WEBHOOK_PORT
+
+
+def build_application(worker=None):
+	# Create and configure the Telegram bot application using the telegram api token
+	builder = Application.builder().token(TELEGRAM_TOKEN).post_init(post_init).post_stop(post_stop)
+
+	# Keep the bot state across restarts; every worker process has its own state
+	persistence = build_persistence(worker)
+
+	if persistence is not None:
+		builder = builder.persistence(persistence)
+
+	application = builder.build()
+
+	# Add handlers to the application
+	add_handlers(application)
+
+	# Drop cached schedules whenever another process or an import changes the timetable
+	schedule_timetable_version_poll(application)
+
+	# Drop the cached group of users who registered again through another webhook worker
+	if worker is not None:
+		schedule_user_changes_poll(application)
+
+	# Push tomorrow's schedule to subscribed users every evening, from a single worker so that every
+	# subscriber receives it once and the rate limit is shared by all the messages
+	if DAILY_PUSH_ENABLED and runs_scheduled_jobs(worker):
+		schedule_daily_push(application)
+
+	# Remind users before each pair, with one job per distinct start time, from a single worker
+	if REMINDERS_ENABLED and runs_scheduled_jobs(worker):
+		schedule_reminders(application)
+
+	# Snapshot the caches before each periodic write of the bot state
+	if persistence is not None:
+		schedule_cache_snapshots(application)
+
+	# Serve the handler metrics; webhook workers (identified by their port) use consecutive metrics ports
+	if METRICS_ENABLED:
+		metrics_port = METRICS_PORT if worker is None else METRICS_PORT + worker - WEBHOOK_PORT
+		start_metrics_server(METRICS_HOST, metrics_port)
+
+	return application
+
+
+def run_webhook_worker(port):
+	# Serve the updates posted by Telegram; the application stops gracefully on SIGINT/SIGTERM
+	build_application(port if WEBHOOK_WORKERS > 1 else None).run_webhook(
+		listen=WEBHOOK_LISTEN,
+		port=port,
+		url_path=WEBHOOK_PATH,
+		webhook_url=WEBHOOK_URL,
+		secret_token=WEBHOOK_SECRET_TOKEN
+	)
+
+
+def stop_workers(signum, frame):
+	raise SystemExit(0)
+
+
+def forward_signal(workers):
+	def forward(signum, frame):
+		for worker in workers:
+			if worker.is_alive():
+				os.kill(worker.pid, signum)
+
+	return forward
+
+
+def run_webhook_workers():
+	if WEBHOOK_WORKERS <= 1:
+		run_webhook_worker(WEBHOOK_PORT)
+		return
+
+	# Every worker is a separate process with its own application, database pool and caches
+	context = multiprocessing.get_context('spawn')
+	workers = [
+		context.Process(target=run_webhook_worker, args=(WEBHOOK_PORT + index,), name=f"bot-worker-{index}")
+		for index in range(WEBHOOK_WORKERS)
+	]
+
+	signal.signal(signal.SIGTERM, stop_workers)
+
+	# The workers reload the timetable on SIGHUP, which would otherwise terminate the parent process
+	if hasattr(signal, 'SIGHUP'):
+		signal.signal(signal.SIGHUP, forward_signal(workers))
+
+	for worker in workers:
+		worker.start()
 
 	try:
-		# Create and configure the Telegram bot application using the telegram api token
-		application = Application.builder().token(TELEGRAM_TOKEN).build()
+		for worker in workers:
+			worker.join()
+	except KeyboardInterrupt:
+		pass
+	finally:
+		# Forward the shutdown to the workers and wait for them to finish their pending updates
+		for worker in workers:
+			if worker.is_alive():
+				worker.terminate()
+
+		for worker in workers:
+			worker.join(timeout=30)
 
-		# Add handlers to the application
-		add_handlers(application)
 
-		 # Start the bot application to listen for incoming updates
-		application.run_polling()
+if __name__ == '__main__':
+
+	try:
+		if BOT_MODE == 'webhook':
+			run_webhook_workers()
+		else:
+			# Start the bot application to listen for incoming updates
+			build_application().run_polling()
 	
 	except Exception as e:
-		print("An error occured: ", e)
\ No newline at end of file
+		print("An error occured: ", e)
@@ -0,0 +1,12 @@
+-- 001_user_chat_id_unique.sql
+--
+-- Declares a unique index on user.chatId, required by the upsert in update_or_create_user.
+-- Duplicate users created by concurrent registrations are removed first, keeping the most
+-- recent row of every chat.
+
+DELETE older FROM `user` AS older
+  JOIN `user` AS newer ON older.chatId = newer.chatId AND older.id < newer.id;
+
+ALTER TABLE `user`
+  MODIFY `chatId` VARCHAR(64) NOT NULL,
+  ADD UNIQUE INDEX `ux_user_chatId` (`chatId`);
@@ -0,0 +1,11 @@
+-- 002_schedule_indexes.sql
+--
+-- Declares the composite indexes used by the schedule queries in db/interogations.py:
+-- a group's course sessions are found through pair(groupId, courseSessionId), and the weekday and
+-- parity filters are answered by courseSession(weekDayId, weekParityId, sessionTimeId).
+
+ALTER TABLE `pair`
+  ADD INDEX `ix_pair_groupId_courseSessionId` (`groupId`, `courseSessionId`);
+
+ALTER TABLE `courseSession`
+  ADD INDEX `ix_courseSession_weekDayId_weekParityId_sessionTimeId` (`weekDayId`, `weekParityId`, `sessionTimeId`);
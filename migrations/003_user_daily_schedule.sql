@@ -0,0 +1,6 @@
+-- 003_user_daily_schedule.sql
+--
+-- Adds the opt-in flag for the daily push of tomorrow's schedule.
+
+ALTER TABLE `user`
+  ADD COLUMN `dailySchedule` BOOLEAN NOT NULL DEFAULT FALSE;
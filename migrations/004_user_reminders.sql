@@ -0,0 +1,6 @@
+-- 004_user_reminders.sql
+--
+-- Adds the opt-in flag for the reminders sent a few minutes before each pair.
+
+ALTER TABLE `user`
+  ADD COLUMN `reminders` BOOLEAN NOT NULL DEFAULT FALSE;
@@ -0,0 +1,12 @@
+-- 005_timetable_version.sql
+--
+-- Adds the single-row generation counter bumped by every timetable change and polled by the bot
+-- processes to keep their schedule caches coherent.
+
+CREATE TABLE `timetableVersion` (
+  `id` INT NOT NULL PRIMARY KEY,
+  `generation` INT NOT NULL DEFAULT 0,
+  `updatedAt` DATETIME NOT NULL
+);
+
+INSERT INTO `timetableVersion` (`id`, `generation`, `updatedAt`) VALUES (1, 0, NOW());
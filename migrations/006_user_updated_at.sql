@@ -0,0 +1,9 @@
+-- 006_user_updated_at.sql
+--
+-- Adds the time of the last registration of each user, polled by the webhook workers to drop the cached
+-- group of users who registered again through another worker.
+
+ALTER TABLE `user`
+  ADD COLUMN `updatedAt` DATETIME NULL;
+
+CREATE INDEX `ix_user_updatedAt` ON `user` (`updatedAt`);
@@ -18,11 +18,14 @@ Attributes:
 Relationships:
   - course, teacher, activityType, weekDay, sessionSchedule, room, weekParity: Establish relationships with respective models.
 
+Indexes:
+  - ix_courseSession_weekDayId_weekParityId_sessionTimeId: Covers the weekday and parity filters of schedule queries.
+
 This model is vital for organizing the schedule and logistical aspects of course sessions, linking various aspects 
 of academic scheduling in a cohesive structure.
 """
 
-from sqlalchemy import Column, Integer, ForeignKey
+from sqlalchemy import Column, Integer, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from db.base import Base
 from .course import Course
@@ -35,6 +38,9 @@ from .weekParity import WeekParity
 
 class CourseSession(Base):
   __tablename__ = 'courseSession'
+  __table_args__ = (
+    Index('ix_courseSession_weekDayId_weekParityId_sessionTimeId', 'weekDayId', 'weekParityId', 'sessionTimeId'),
+  )
 
   id = Column(Integer, primary_key=True, autoincrement=True)
   courseId = Column(Integer, ForeignKey('course.id'), nullable=False)
@@ -14,11 +14,14 @@ Relationships:
   - group: Relationship to the Group model, providing details about the student group.
   - courseSession: Relationship to the CourseSession model, providing details about the course session.
 
+Indexes:
+  - ix_pair_groupId_courseSessionId: Covers the lookup of a group's course sessions in schedule queries.
+
 This model is essential for managing the timetable and class schedules, ensuring that each student group 
 is associated with the correct course sessions.
 """
 
-from sqlalchemy import Column, Integer, ForeignKey
+from sqlalchemy import Column, Integer, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from db.base import Base
 from .group import Group
@@ -26,6 +29,9 @@ from .courseSession import CourseSession
 
 class Pair(Base):
   __tablename__ = 'pair'
+  __table_args__ = (
+    Index('ix_pair_groupId_courseSessionId', 'groupId', 'courseSessionId'),
+  )
 
   id = Column(Integer, primary_key=True, autoincrement=True)
   groupId = Column(Integer, ForeignKey('studyGroup.id'), nullable=False)
@@ -0,0 +1,28 @@
+"""
+timetableVersion.py
+
+This module defines the TimetableVersion model, a single-row table holding a generation counter for the 
+timetable. Every change to the timetable tables (for example a timetable import) increments the counter, 
+which lets each bot process detect, with one small query, that its cached schedules are out of date.
+
+Attributes:
+  - id (Integer): Primary key; the table holds a single row with id 1.
+  - generation (Integer): The number of times the timetable has been changed.
+  - updatedAt (DateTime): The moment of the last change.
+
+The TimetableVersion model keeps the schedule caches of several bot processes coherent without querying 
+the timetable itself on every request.
+"""
+
+from sqlalchemy import Column, Integer, DateTime
+from db.base import Base
+
+class TimetableVersion(Base):
+  __tablename__ = 'timetableVersion'
+
+  id = Column(Integer, primary_key=True)
+  generation = Column(Integer, nullable=False, default=0)
+  updatedAt = Column(DateTime, nullable=False)
+
+  def __repr__(self):
+    return f"<TimetableVersion(generation={self.generation}, updatedAt={self.updatedAt})>"
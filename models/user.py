@@ -7,8 +7,13 @@ to a group (as defined in the Group model), representing their affiliation or cl
 
 Attributes:
   - id (Integer): Primary key, uniquely identifying each user.
-  - chatId (String): The Telegram chat ID of the user, used for bot communication.
+  - chatId (String): The Telegram chat ID of the user, used for bot communication. Unique, backed by the 
+    'ux_user_chatId' index.
   - groupId (Integer): Foreign key linking to the Group model, indicating the user's group affiliation.
+  - dailySchedule (Boolean): Whether the user receives tomorrow's schedule every evening.
+  - reminders (Boolean): Whether the user is reminded a few minutes before each pair.
+  - updatedAt (DateTime): When the user last registered, backed by the 'ix_user_updatedAt' index. Used by the 
+    bot processes to find the users whose cached group is stale.
 
 Relationships:
   - group: Relationship to the Group model, providing details about the user's group.
@@ -17,17 +22,24 @@ The User model is crucial for personalizing interactions and responses of the Te
 enabling it to provide relevant information and services based on the user's group and academic context.
 """
 
-from sqlalchemy import Column, Integer, String, ForeignKey
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from db.base import Base
 from .group import Group
 
 class User(Base):
   __tablename__ = 'user'
+  __table_args__ = (
+    Index('ux_user_chatId', 'chatId', unique=True),
+    Index('ix_user_updatedAt', 'updatedAt'),
+  )
 
   id = Column(Integer, primary_key=True, autoincrement=True)
-  chatId = Column(String, nullable=False)
+  chatId = Column(String(64), nullable=False)
   groupId = Column(Integer, ForeignKey('studyGroup.id'), nullable=False)
+  dailySchedule = Column(Boolean, nullable=False, default=False)
+  reminders = Column(Boolean, nullable=False, default=False)
+  updatedAt = Column(DateTime)
 
   group = relationship("Group")
 
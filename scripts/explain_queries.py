@@ -0,0 +1,96 @@
+"""
+explain_queries.py
+
+This script, located in the 'scripts' folder, audits the query plans of the read queries in 'db.interogations'.
+
+Every function is called once against the configured database with the caches bypassed. The statements it 
+issues are recorded and an EXPLAIN of each one is printed, so that a missing or unused index becomes visible 
+when comparing the output between runs.
+
+Usage:
+  python -m scripts.explain_queries [--group-id ID] [--chat-id ID]
+
+When not given, the group and the chat ID are taken from the first row of the corresponding tables.
+"""
+
+import argparse
+from sqlalchemy import event
+from db.db_connect import engine, SessionLocal
+from db.explain import explain, format_plan
+from db.interogations import (
+  get_specialities, get_speciality_by_id, get_languages, get_groups, get_user_group_id,
+  get_day_schedule_by_id, get_week_schedule_by_id, load_week_lookups
+)
+from cache.schedule_cache import invalidate_all
+from cache.user_cache import user_cache
+from models.group import Group
+from models.user import User
+from utils.date_helpers import WEEKDAY_IDS, WEEK_PARITY_IDS
+
+
+
+def capture_statements(func, *args) -> list:
+  statements = []
+
+  def record(conn, cursor, statement, parameters, context, executemany):
+    statements.append((statement, parameters))
+
+  event.listen(engine, "before_cursor_execute", record)
+
+  try:
+    func(*args)
+  finally:
+    event.remove(engine, "before_cursor_execute", record)
+
+  return statements
+
+
+
+def main():
+  parser = argparse.ArgumentParser(description="Print the query plan of every read query in db.interogations.")
+  parser.add_argument("--group-id", type=int, help="group used for the schedule queries")
+  parser.add_argument("--chat-id", help="chat ID used for the user lookup")
+  args = parser.parse_args()
+
+  session = SessionLocal()
+
+  try:
+    group = session.get(Group, args.group_id) if args.group_id else session.query(Group).first()
+    chat_id = args.chat_id or session.query(User.chatId).limit(1).scalar() or "0"
+
+    if group is None:
+      parser.error("no group found, pass --group-id")
+
+    # Read the weekday and parity IDs now, so their queries do not appear in the audit
+    load_week_lookups(session)
+
+    calls = [
+      ("get_specialities", get_specialities, (session,)),
+      ("get_speciality_by_id", get_speciality_by_id, (session, group.specialityId)),
+      ("get_languages", get_languages, (session,)),
+      ("get_groups", get_groups, (session, group.specialityId, group.semester, group.languageId)),
+      ("get_user_group_id", get_user_group_id, (session, chat_id)),
+      ("get_day_schedule_by_id", get_day_schedule_by_id, (session, group.id, WEEKDAY_IDS["Luni"], WEEK_PARITY_IDS["impară"])),
+      ("get_week_schedule_by_id", get_week_schedule_by_id, (session, group.id)),
+    ]
+
+    for name, func, func_args in calls:
+      invalidate_all()
+      user_cache.clear()
+      session.expunge_all()
+
+      for statement, parameters in capture_statements(func, *func_args):
+        print(f"=== {name}\n{statement}\n-- parameters: {parameters}\n")
+
+        with engine.connect() as connection:
+          print(format_plan(explain(connection, statement, parameters)))
+
+        print()
+
+  finally:
+    session.close()
+
+
+
+if __name__ == '__main__':
+  main()
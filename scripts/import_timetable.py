@@ -0,0 +1,62 @@
+"""
+import_timetable.py
+
+This script, located in the 'scripts' folder, imports a timetable into the database with 'db.importer'.
+
+The source is a JSON file, a directory holding one CSV file per table, or an XLSX workbook holding one 
+sheet per table. Tables and columns are named as in the models (e.g. 'courseSession' with 'courseId', 
+'teacherId', ...; times are written as HH:MM). The whole import is validated before anything is written, 
+then runs in a single transaction.
+
+The import increments the timetable generation counter, so running bot processes drop their cached 
+schedules within TIMETABLE_VERSION_POLL_SECONDS. Use the '/reload' admin command (or SIGHUP) to make a 
+process reload immediately.
+
+Usage:
+  python -m scripts.import_timetable PATH [--format json|csv|xlsx] [--dry-run] [--batch-size N]
+"""
+
+import argparse
+import sys
+import time
+from config.config import IMPORT_BATCH_SIZE
+from db.db_connect import session_scope
+from db.importer import read_timetable, validate_timetable, import_timetable, TimetableImportError
+
+
+
+def main():
+  parser = argparse.ArgumentParser(description="Import a timetable from JSON, CSV or XLSX files.")
+  parser.add_argument("path", help="JSON file, directory of CSV files or XLSX workbook")
+  parser.add_argument("--format", choices=["json", "csv", "xlsx"], help="source format (detected from the path by default)")
+  parser.add_argument("--dry-run", action="store_true", help="only validate the timetable")
+  parser.add_argument("--batch-size", type=int, default=IMPORT_BATCH_SIZE, help="rows per insert batch")
+  args = parser.parse_args()
+
+  start = time.perf_counter()
+
+  try:
+    data = read_timetable(args.path, args.format)
+
+    with session_scope() as session:
+      if args.dry_run:
+        counts = {table_name: len(rows) for table_name, rows in validate_timetable(session, data).items()}
+      else:
+        counts = import_timetable(session, data, args.batch_size)
+
+  except TimetableImportError as e:
+    print(f"The timetable was not imported:\n{e}", file=sys.stderr)
+    sys.exit(1)
+
+  elapsed = time.perf_counter() - start
+  action = "Validated" if args.dry_run else "Imported"
+
+  for table_name, count in counts.items():
+    print(f"{action} {count} rows into {table_name}")
+
+  print(f"Done in {elapsed:.2f}s")
+
+
+
+if __name__ == '__main__':
+  main()
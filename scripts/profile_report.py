@@ -0,0 +1,65 @@
+"""
+profile_report.py
+
+This script, located in the 'scripts' folder, aggregates the profiles written by the sampling profiler 
+('utils.profiling') into a report of the hottest functions.
+
+Every .pstats file of the selected handlers is merged, and the top functions are printed for each handler, 
+sorted by cumulative time (time spent in the function and everything it called) or by internal time.
+
+Usage:
+  python -m scripts.profile_report [--dir PROFILE_DIR] [--handler NAME ...] [--top N] [--sort cumulative|tottime]
+
+When no handler is given, every handler found in the profile directory is reported.
+"""
+
+import argparse
+import os
+import pstats
+from config.config import PROFILE_DIR
+
+
+
+def load_handler_stats(directory: str):
+  files = sorted(
+    os.path.join(directory, name) for name in os.listdir(directory) if name.endswith(".pstats")
+  )
+
+  if not files:
+    return None, 0
+
+  return pstats.Stats(*files), len(files)
+
+
+
+def main():
+  parser = argparse.ArgumentParser(description="Report the hottest functions of the profiled handlers.")
+  parser.add_argument("--dir", default=PROFILE_DIR)
+  parser.add_argument("--handler", nargs="*", help="handlers to report, all of them when omitted")
+  parser.add_argument("--top", type=int, default=20)
+  parser.add_argument("--sort", choices=("cumulative", "tottime"), default="cumulative")
+  args = parser.parse_args()
+
+  if not os.path.isdir(args.dir):
+    raise SystemExit(f"No profiles found in {args.dir}. Run the bot with PROFILE_SAMPLE_RATE set first.")
+
+  handlers = args.handler or sorted(
+    name for name in os.listdir(args.dir) if os.path.isdir(os.path.join(args.dir, name))
+  )
+
+  for handler in handlers:
+    directory = os.path.join(args.dir, handler)
+    stats, samples = load_handler_stats(directory) if os.path.isdir(directory) else (None, 0)
+
+    print(f"=== {handler}: {samples} sampled updates ===")
+
+    if stats is None:
+      print("No profiles.\n")
+      continue
+
+    stats.strip_dirs().sort_stats(args.sort).print_stats(args.top)
+
+
+
+if __name__ == '__main__':
+  main()
@@ -0,0 +1,57 @@
+"""
+conftest.py
+
+Fixtures shared by the tests, run with 'python -m pytest' from the root of the repository.
+
+- engine: A small seeded SQLite stand-in of the bot's database, built with 'benchmarks.seed_database' and bound 
+  to the session factory of 'db.db_connect', so 'run_db' and 'session_scope' use it. The in-process caches are 
+  emptied before and after every test.
+- session: A session on that database.
+- statements: The SQL statements executed on that database during the test, in order.
+"""
+
+import pytest
+from sqlalchemy import event
+from benchmarks.seed_database import seed_database
+from cache.schedule_cache import invalidate_all
+from cache.user_cache import user_cache
+from db.db_connect import SessionLocal
+
+
+
+def _clear_caches():
+  invalidate_all()
+  user_cache.clear()
+
+
+
+@pytest.fixture
+def engine(tmp_path):
+  engine = seed_database(str(tmp_path / "bot.db"), groups=4, users=20)
+  SessionLocal.configure(bind=engine)
+  _clear_caches()
+
+  yield engine
+
+  _clear_caches()
+  engine.dispose()
+
+
+
+@pytest.fixture
+def session(engine):
+  with SessionLocal() as session:
+    yield session
+
+
+
+@pytest.fixture
+def statements(engine):
+  recorded = []
+
+  def record(conn, cursor, statement, parameters, context, executemany):
+    recorded.append(statement)
+
+  event.listen(engine, "before_cursor_execute", record)
+  yield recorded
+  event.remove(engine, "before_cursor_execute", record)
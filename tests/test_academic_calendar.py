@@ -0,0 +1,114 @@
+"""
+test_academic_calendar.py
+
+Checks the academic calendar of 'utils.date_helpers' (week parity restarting with every academic year, 
+vacations and the summer without classes, dates outside the configured years) and the search of the next 
+day with pairs across vacations and the summer ('find_next_day_with_pairs' from 'controllers.menu_options').
+
+The calendar used by the tests is built here, so they do not depend on the configured academic years.
+"""
+
+from datetime import date, datetime
+import pytest
+import controllers.menu_options as menu_options
+from controllers.menu_options import find_next_day_with_pairs
+from utils.date_helpers import AcademicCalendar, WEEKDAY_IDS, WEEK_PARITY_IDS
+
+YEARS = [
+  (date(2025, 9, 1), date(2026, 5, 31), [(date(2025, 12, 20), date(2026, 2, 1)), (date(2026, 4, 11), date(2026, 4, 14))]),
+  (date(2026, 9, 1), date(2027, 5, 31), [(date(2026, 12, 19), date(2027, 1, 31)), (date(2027, 5, 1), date(2027, 5, 4))])
+]
+
+
+
+@pytest.fixture
+def calendar(monkeypatch):
+  calendar = AcademicCalendar(YEARS)
+  monkeypatch.setattr(menu_options, "academic_calendar", calendar)
+  return calendar
+
+
+
+def test_days_carry_their_weekday_and_parity(calendar):
+  assert calendar.get_day(date(2025, 9, 1)) == (WEEKDAY_IDS["Luni"], WEEK_PARITY_IDS["impară"], True)
+  assert calendar.get_day(date(2025, 9, 10)) == (WEEKDAY_IDS["Miercuri"], WEEK_PARITY_IDS["pară"], True)
+  assert calendar.get_day(date(2025, 9, 15)).weekParityId == WEEK_PARITY_IDS["impară"]
+
+
+
+def test_parity_restarts_with_every_academic_year():
+  # 53 weeks after the start of the first year, counting on would make the week even
+  calendar = AcademicCalendar([
+    (date(2025, 9, 1), date(2026, 5, 31), []),
+    (date(2026, 9, 7), date(2027, 5, 31), [])
+  ])
+
+  assert calendar.get_day(date(2026, 5, 25)).weekParityId == WEEK_PARITY_IDS["impară"]
+  assert calendar.get_day(date(2026, 9, 7)).weekParityId == WEEK_PARITY_IDS["impară"]
+  assert calendar.get_day(date(2026, 9, 14)).weekParityId == WEEK_PARITY_IDS["pară"]
+
+
+
+def test_vacation_weeks_keep_counting(calendar):
+  # The winter vacation lasts six weeks, the first week after it is the 23rd of the year
+  assert calendar.get_day(date(2026, 2, 2)).weekParityId == WEEK_PARITY_IDS["impară"]
+  assert calendar.get_day(date(2026, 2, 9)).weekParityId == WEEK_PARITY_IDS["pară"]
+
+
+
+@pytest.mark.parametrize("day", [date(2025, 12, 20), date(2026, 1, 15), date(2026, 2, 1), date(2026, 4, 11), date(2026, 4, 14)])
+def test_vacations_are_not_teaching_days(calendar, day):
+  assert not calendar.get_day(day).teaching
+
+
+
+@pytest.mark.parametrize("day", [date(2025, 12, 19), date(2026, 2, 2), date(2026, 4, 10), date(2026, 4, 15), date(2026, 5, 31)])
+def test_days_around_vacations_are_teaching_days(calendar, day):
+  assert calendar.get_day(day).teaching
+
+
+
+@pytest.mark.parametrize("day", [date(2026, 6, 1), date(2026, 7, 15), date(2026, 8, 31)])
+def test_summer_is_not_a_teaching_day(calendar, day):
+  assert not calendar.get_day(day).teaching
+
+
+
+def test_dates_outside_the_configured_years(calendar):
+  # Before the first year, weeks are counted from its start; after the last one, from the start of the last year
+  before = calendar.get_day(date(2025, 8, 25))
+  after = calendar.get_day(date(2027, 6, 7))
+
+  assert before == (WEEKDAY_IDS["Luni"], WEEK_PARITY_IDS["pară"], True)
+  assert after == (WEEKDAY_IDS["Luni"], WEEK_PARITY_IDS["impară"], True)
+
+
+
+def test_datetimes_are_looked_up_by_their_date(calendar):
+  assert calendar.get_day(datetime(2026, 1, 15, 12, 0)) == calendar.get_day(date(2026, 1, 15))
+
+
+
+@pytest.mark.parametrize("start_date, expected_date, expected_weekday", [
+  (date(2025, 12, 20), date(2026, 2, 2), "Luni"),
+  (date(2026, 4, 11), date(2026, 4, 15), "Miercuri"),
+  (date(2026, 5, 31), date(2026, 9, 1), "Marti")
+])
+def test_next_day_with_pairs_skips_vacations_and_the_summer(session, calendar, start_date, expected_date, expected_weekday):
+  next_date, weekday, pairs = find_next_day_with_pairs(session, 1, start_date)
+
+  assert (next_date, weekday) == (expected_date, expected_weekday)
+  assert pairs
+
+
+
+def test_next_day_with_pairs_is_searched_within_the_horizon(session, calendar, monkeypatch):
+  monkeypatch.setattr(menu_options, "NEXT_DAY_HORIZON_DAYS", 30)
+
+  assert find_next_day_with_pairs(session, 1, date(2025, 12, 20)) == (None, None, None)
+  assert find_next_day_with_pairs(session, 1, date(2026, 1, 5))[0] == date(2026, 2, 2)
+
+
+
+def test_next_day_with_pairs_of_a_group_without_pairs(session, calendar):
+  assert find_next_day_with_pairs(session, 999, date(2025, 9, 1)) == (None, None, None)
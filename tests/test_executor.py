@@ -0,0 +1,25 @@
+"""
+test_executor.py
+
+Checks that 'run_db' runs database work concurrently in the thread pool of 'db.executor' instead of 
+serializing it on the event loop.
+"""
+
+import asyncio
+import threading
+from db.executor import run_db
+
+
+
+def test_run_db_calls_run_concurrently(engine):
+  barrier = threading.Barrier(2, timeout=5)
+
+  def wait_for_each_other(session, name):
+    barrier.wait()
+    return name
+
+  async def both():
+    return await asyncio.wait_for(asyncio.gather(run_db(wait_for_each_other, "a"), run_db(wait_for_each_other, "b")), 10)
+
+  assert asyncio.run(both()) == ["a", "b"]
+  assert not barrier.broken
@@ -0,0 +1,35 @@
+"""
+test_query_timing.py
+
+Checks that the statement timing hooks of 'db.db_connect' leave no start time behind on a pooled connection, 
+including for statements that fail.
+"""
+
+import pytest
+from sqlalchemy import create_engine, event, exc, text
+from db.db_connect import _before_cursor_execute, _after_cursor_execute, _handle_error
+
+
+
+@pytest.fixture
+def timed_engine():
+  engine = create_engine("sqlite://")
+  event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+  event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+  event.listen(engine, "handle_error", _handle_error)
+
+  yield engine
+
+  engine.dispose()
+
+
+
+def test_failed_statements_release_their_start_time(timed_engine):
+  with timed_engine.connect() as conn:
+    for _ in range(3):
+      with pytest.raises(exc.OperationalError):
+        conn.execute(text("SELECT * FROM missing_table"))
+
+    conn.execute(text("SELECT 1"))
+
+    assert conn.info["query_start_time"] == []
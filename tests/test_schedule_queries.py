@@ -0,0 +1,83 @@
+"""
+test_schedule_queries.py
+
+Checks that every schedule request is answered with a single SELECT, including the formatting of the 
+returned rows, and that a cached schedule is answered without any statement.
+"""
+
+from models.courseSession import CourseSession
+from models.pair import Pair
+from db.interogations import get_day_schedule_by_id, get_tomorrows_schedule, get_week_schedule_by_id, get_week_schedule
+from controllers.menu_options import format_schedule, format_schedule_with_parity
+from utils.date_helpers import WEEKDAY_NAMES, WEEK_PARITY_IDS, WEEK_PARITY_NAMES
+
+
+
+def _day_with_pairs(session):
+  group_id, week_day_id, week_parity_id = (
+    session.query(Pair.groupId, CourseSession.weekDayId, CourseSession.weekParityId)
+      .join(CourseSession, CourseSession.id == Pair.courseSessionId)
+      .first()
+    )
+
+  return group_id, week_day_id, week_parity_id or WEEK_PARITY_IDS["pară"]
+
+
+
+def _selects(statements):
+  return [statement for statement in statements if statement.lstrip().upper().startswith("SELECT")]
+
+
+
+def test_day_schedule_is_a_single_select(session, statements):
+  group_id, week_day_id, week_parity_id = _day_with_pairs(session)
+  statements.clear()
+
+  pairs = get_day_schedule_by_id(session, group_id, week_day_id, week_parity_id)
+  format_schedule(pairs)
+  format_schedule_with_parity(pairs)
+
+  assert pairs
+  assert len(statements) == 1
+  assert len(_selects(statements)) == 1
+
+
+
+def test_tomorrows_schedule_by_name_is_a_single_select(session, statements):
+  group_id, week_day_id, week_parity_id = _day_with_pairs(session)
+  statements.clear()
+
+  pairs = get_tomorrows_schedule(session, group_id, WEEKDAY_NAMES[week_day_id], WEEK_PARITY_NAMES[week_parity_id])
+  format_schedule(pairs)
+
+  assert pairs
+  assert len(statements) == 1
+  assert len(_selects(statements)) == 1
+
+
+
+def test_week_schedule_is_a_single_select(session, statements):
+  group_id, _, _ = _day_with_pairs(session)
+  statements.clear()
+
+  week = get_week_schedule(session, group_id)
+
+  for pairs in week.values():
+    format_schedule_with_parity(pairs)
+
+  assert week
+  assert len(statements) == 1
+  assert len(_selects(statements)) == 1
+
+
+
+def test_cached_schedules_need_no_statement(session, statements):
+  group_id, week_day_id, week_parity_id = _day_with_pairs(session)
+  get_day_schedule_by_id(session, group_id, week_day_id, week_parity_id)
+  get_week_schedule_by_id(session, group_id)
+  statements.clear()
+
+  get_day_schedule_by_id(session, group_id, week_day_id, week_parity_id)
+  get_week_schedule_by_id(session, group_id)
+
+  assert statements == []
@@ -0,0 +1,60 @@
+"""
+test_today_schedule.py
+
+Checks that today's schedule ('check_today_schedule' from 'controllers.menu_options') only shows the pairs 
+that have not ended yet, including when pairs overlap and their end times are not in their start order.
+"""
+
+from datetime import date, datetime, time
+import pytest
+import controllers.menu_options as menu_options
+from controllers.menu_options import check_today_schedule
+from db.schedule_row import ScheduleRow
+from utils.date_helpers import AcademicCalendar, WEEKDAY_IDS
+
+GROUP_ID = 1
+
+# A long pair overlapping a shorter one, which ends first although it starts later
+PAIRS = [
+  ScheduleRow(1, "Practica", "Profesor 1", "1-01", "Laborator", time(8, 0), time(13, 0), WEEKDAY_IDS["Luni"], None),
+  ScheduleRow(2, "Seminarul", "Profesor 2", "1-02", "Seminar", time(9, 45), time(11, 15), WEEKDAY_IDS["Luni"], None)
+]
+
+
+
+@pytest.fixture
+def today(engine, monkeypatch):
+  monkeypatch.setattr(menu_options, "academic_calendar", AcademicCalendar([(date(2026, 2, 2), date(2026, 5, 31), [])]))
+  monkeypatch.setattr(menu_options, "get_day_schedule_by_id", lambda session, group_id, week_day_id, week_parity_id: PAIRS)
+
+  def at(hour, minute):
+    class FixedDatetime(datetime):
+      @classmethod
+      def now(cls, tz=None):
+        return cls(2026, 3, 2, hour, minute)
+
+    monkeypatch.setattr(menu_options, "datetime", FixedDatetime)
+    return check_today_schedule(None, GROUP_ID)
+
+  return at
+
+
+
+def test_only_the_pair_still_running_is_shown(today):
+  message = today(12, 0)
+
+  assert "Practica" in message
+  assert "Seminarul" not in message
+
+
+
+def test_overlapping_pairs_are_both_shown_while_running(today):
+  message = today(10, 0)
+
+  assert "Practica" in message
+  assert "Seminarul" in message
+
+
+
+def test_nothing_is_shown_after_the_last_pair(today):
+  assert today(13, 0) == "Nu sunt perechi disponibile pentru astăzi."
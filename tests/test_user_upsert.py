@@ -0,0 +1,31 @@
+"""
+test_user_upsert.py
+
+Checks that concurrent registrations of the same chat through 'update_or_create_user' leave a single row 
+for it in the user table.
+"""
+
+import asyncio
+from models.group import Group
+from models.user import User
+from db.executor import run_db
+from db.interogations import update_or_create_user
+
+CONCURRENT_CALLS = 20
+
+
+
+def test_concurrent_upserts_leave_one_row(engine, session):
+  chat_id = "777000777"
+  group_ids = [group_id for group_id, in session.query(Group.id).order_by(Group.id).all()]
+
+  async def register_concurrently():
+    await asyncio.gather(*(
+      run_db(update_or_create_user, chat_id, group_ids[call % len(group_ids)]) for call in range(CONCURRENT_CALLS)
+      ))
+
+  asyncio.run(register_concurrently())
+
+  users = session.query(User).filter(User.chatId == chat_id).all()
+  assert len(users) == 1
+  assert users[0].groupId in group_ids
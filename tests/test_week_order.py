@@ -0,0 +1,55 @@
+"""
+test_week_order.py
+
+Checks that the week's schedule is listed from Monday to Sunday when the IDs of the 'weekDay' rows are not 
+in that order, both when it is read from the database and from the in-memory timetable store.
+"""
+
+import pytest
+from sqlalchemy import text
+from db.interogations import load_week_lookups, load_timetable_store, get_week_schedule
+from db.memory_store import timetable_store
+from utils.date_helpers import WEEKDAYS, WEEKDAY_IDS, WEEK_PARITY_IDS, set_week_lookups
+
+
+
+@pytest.fixture
+def reversed_week_days(engine, session):
+  seeded = dict(WEEKDAY_IDS), dict(WEEK_PARITY_IDS)
+
+  # Sunday gets the smallest ID and Monday the largest
+  session.execute(text('UPDATE "weekDay" SET id = id + 100'))
+  session.execute(text('UPDATE "weekDay" SET id = 108 - id'))
+  session.execute(text('UPDATE "courseSession" SET "weekDayId" = 8 - "weekDayId"'))
+  session.commit()
+  load_week_lookups(session)
+
+  yield session
+
+  set_week_lookups(*seeded)
+  timetable_store.loaded = False
+
+
+
+def _weekday_order(names):
+  return [WEEKDAYS.index(name) for name in names]
+
+
+
+def test_week_from_the_database_is_listed_from_monday(reversed_week_days):
+  assert WEEKDAY_IDS["Luni"] > WEEKDAY_IDS["Duminica"]
+
+  week = get_week_schedule(reversed_week_days, 1)
+
+  assert list(week)[0] == "Luni"
+  assert _weekday_order(week) == sorted(_weekday_order(week))
+
+
+
+def test_week_from_the_memory_store_is_listed_from_monday(reversed_week_days):
+  load_timetable_store(reversed_week_days)
+
+  week = get_week_schedule(reversed_week_days, 1)
+
+  assert list(week)[0] == "Luni"
+  assert _weekday_order(week) == sorted(_weekday_order(week))
@@ -0,0 +1,119 @@
+"""
+broadcast.py
+
+This module in the 'utils' folder contains the tools used to send the same kind of message to many users 
+without exceeding Telegram's rate limits (about 30 messages per second for a bot).
+
+Functions and classes included in this module:
+
+- TokenBucket(rate, capacity):
+  An asyncio token bucket. Each message takes one token; tokens are refilled at 'rate' per second, up to 
+  'capacity'. When Telegram answers with "429 Too Many Requests", 'pause' empties the bucket for the 
+  requested time, so every pending message waits, not only the one that was rejected.
+
+- send_with_retry(bot, chat_id, text, bucket, stats, max_retries):
+  Sends a single message through the bucket, retrying on rate limiting (RetryAfter) and on network 
+  errors with exponential backoff. Errors caused by the user or the message, such as a blocked bot, a chat 
+  that does not exist or invalid HTML (Forbidden, BadRequest), are not retried.
+
+- broadcast(bot, messages, rate, batch_size, max_retries):
+  Sends (chat_id, text) messages concurrently, in batches of 'batch_size', and returns counters of 
+  sent, failed and retried messages.
+
+The defaults are configured through PUSH_RATE_LIMIT, PUSH_BATCH_SIZE and PUSH_MAX_RETRIES in 'config.config'.
+"""
+
+import asyncio
+import time
+from telegram.error import RetryAfter, BadRequest, Forbidden, NetworkError, TelegramError
+from config.config import PUSH_RATE_LIMIT, PUSH_BATCH_SIZE, PUSH_MAX_RETRIES
+
+# Delay, in seconds, before the first retry of a message that failed because of a network error
+BACKOFF_BASE = 1.0
+
+
+
+class TokenBucket:
+  def __init__(self, rate: float, capacity: float = None):
+    self.rate = rate
+    self.capacity = capacity or rate
+    self._tokens = self.capacity
+    self._updated = time.monotonic()
+    self._lock = asyncio.Lock()
+
+
+  async def acquire(self):
+    async with self._lock:
+      while True:
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+        if self._tokens >= 1:
+          self._tokens -= 1
+          return
+
+        await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+  def pause(self, seconds: float):
+    self._tokens = min(self._tokens, 0) - seconds * self.rate
+
+
+
+async def send_with_retry(bot, chat_id, text: str, bucket: TokenBucket, stats: dict, max_retries: int = PUSH_MAX_RETRIES) -> bool:
+  for attempt in range(max_retries + 1):
+    await bucket.acquire()
+
+    try:
+      await bot.send_message(chat_id=chat_id, text=text, parse_mode='HTML')
+      stats["sent"] += 1
+      return True
+
+    except RetryAfter as e:
+      retry_after = e.retry_after.total_seconds() if hasattr(e.retry_after, "total_seconds") else e.retry_after
+      bucket.pause(retry_after)
+
+    except (BadRequest, Forbidden):
+      # BadRequest is a NetworkError, but sending the same message again would fail the same way
+      break
+
+    except NetworkError:
+      await asyncio.sleep(BACKOFF_BASE * 2 ** attempt)
+
+    except TelegramError:
+      break
+
+    stats["retries"] += 1
+
+  stats["failed"] += 1
+  return False
+
+
+
+async def broadcast(bot, messages, rate: float = PUSH_RATE_LIMIT, batch_size: int = PUSH_BATCH_SIZE, max_retries: int = PUSH_MAX_RETRIES) -> dict:
+  """
+  Sends every (chat_id, text) message in 'messages' while respecting the given rate limit.
+
+  Args:
+    bot (Bot): The bot used to send the messages.
+    messages (iterable): (chat_id, text) tuples; the text is sent as HTML.
+    rate (float): The maximum number of messages sent per second.
+    batch_size (int): The number of messages sent concurrently.
+    max_retries (int): The number of times a failed message is retried.
+
+  Returns:
+    dict: The number of messages 'sent', 'failed' and 'retries' performed.
+  """
+
+  bucket = TokenBucket(rate)
+  stats = {"sent": 0, "failed": 0, "retries": 0}
+  messages = list(messages)
+
+  for start in range(0, len(messages), batch_size):
+    await asyncio.gather(*(
+      send_with_retry(bot, chat_id, text, bucket, stats, max_retries)
+      for chat_id, text in messages[start:start + batch_size]
+    ))
+
+  return stats
@@ -5,22 +5,181 @@ This module in the `utils` folder contains utility functions related to date and
 specifically tailored for the needs of your application. These functions facilitate the handling 
 of common date-related tasks, such as determining the day of the week and calculating week parity.
 
-Functions included in this module:
+Functions and classes included in this module:
 
 - get_weekday(date): Takes a `datetime.date` object and returns the corresponding weekday in Romanian. 
   This function is useful for applications or interfaces that require display of dates in a user-friendly format.
 
 - get_week_parity(current_date): Determines whether the current week, based on the given date, is odd or even. 
   This function is particularly useful for scheduling tasks or events that depend on the parity of the week. 
-  It calculates the number of weeks passed since a predefined start date and returns either "impară" (odd) 
-  or "pară" (even) accordingly.
+  It returns either "impară" (odd) or "pară" (even), as given by the academic calendar.
+
+- is_teaching_day(current_date): Tells whether classes are held on the given date, i.e. whether it falls 
+  within an academic year and outside its vacations.
+
+- AcademicCalendar(years) / CalendarDay: The academic calendar, a table precomputed for every day of every 
+  configured academic year, mapping a date to its weekday ID, week parity ID and whether it is a teaching day. 
+  Lookups are a single dictionary access.
+
+- load_academic_calendar(path): Builds the academic calendar from its JSON configuration file.
+
+- weekday_position(week_day_id): The position, from Monday (0) to Sunday (6), of the weekday with the given ID. 
+  Weeks are listed in this order, whatever the IDs of the 'weekDay' rows.
+
+- set_week_lookups(week_day_ids, week_parity_ids): Replaces the weekday and parity IDs with the ones stored 
+  in the lookup tables and recomputes the academic calendar with them. Called at startup by 
+  'load_week_lookups' from 'db.interogations'.
+
+The academic years are configured in the file at ACADEMIC_CALENDAR_PATH ('config/academic_calendar.json' by 
+default). Each year gives its first and last teaching day and its vacations; its first week is odd ("impară") 
+and the weeks alternate from there, vacation weeks included. Dates between two academic years are not teaching 
+days. Dates before the first or after the last configured year keep counting weeks from the closest year and 
+are treated as teaching days, so an outdated calendar file never hides the timetable.
+
+The module also exposes the WEEKDAYS and WEEK_PARITIES constants, listing the Romanian weekday names and 
+the week parities in calendar order, and the mappings between those names and the integer IDs of the 
+'weekDay' and 'weekParity' tables (WEEKDAY_IDS, WEEKDAY_NAMES, WEEK_PARITY_IDS and WEEK_PARITY_NAMES). 
+Schedules are looked up and cached by these IDs; names are only used to display them. The mappings start 
+with the IDs of the seeded tables and are replaced, in place, by the IDs read from the database at startup.
 
 The utility functions in this module are designed to support various features of the application, 
 especially those involving scheduling and time management. Their implementation reflects specific 
 requirements such as the start date of the academic year and the localization of weekdays into Romanian.
 """
 
-from datetime import date
+import json
+from datetime import date, datetime, timedelta
+from typing import NamedTuple
+from config.config import ACADEMIC_CALENDAR_PATH
+
+# Romanian weekday names, from Monday to Sunday, as stored in the 'weekDay' table
+WEEKDAYS = ("Luni", "Marti", "Miercuri", "Joi", "Vineri", "Sambata", "Duminica")
+
+# Week parities in the order they alternate, starting with the first week of the academic year
+WEEK_PARITIES = ("impară", "pară")
+
+# IDs of the 'weekDay' and 'weekParity' rows, as seeded, until they are read from the database
+WEEKDAY_IDS = {weekday: id for id, weekday in enumerate(WEEKDAYS, start=1)}
+WEEKDAY_NAMES = {id: weekday for weekday, id in WEEKDAY_IDS.items()}
+WEEK_PARITY_IDS = {"pară": 1, "impară": 2}
+WEEK_PARITY_NAMES = {id: week_parity for week_parity, id in WEEK_PARITY_IDS.items()}
+
+
+
+class CalendarDay(NamedTuple):
+  weekDayId: int
+  weekParityId: int
+  teaching: bool
+
+
+
+class AcademicCalendar:
+  __slots__ = ("_years", "_days", "_year_starts")
+
+  def __init__(self, years):
+    """
+    Precomputes the calendar of the given academic years.
+
+    Args:
+      years (list): (start, end, vacations) tuples, where 'start' and 'end' are the first and last teaching 
+      days of the year and 'vacations' is a list of (start, end) date ranges, all bounds included.
+    """
+
+    self._years = years
+    self._year_starts = sorted(start for start, _, _ in years)
+    self.rebuild()
+
+
+  def rebuild(self):
+    # Recomputes the table, after the weekday and parity IDs changed; readers see the old or the new one
+    days = {}
+
+    for start, end, vacations in self._years:
+      first_week = _week_start(start)
+      day = start
+
+      while day <= end:
+        teaching = not any(vacation_start <= day <= vacation_end for vacation_start, vacation_end in vacations)
+        days[day] = CalendarDay(_weekday_id(day), _parity(first_week, day), teaching)
+        day += timedelta(days=1)
+
+    self._days = days
+
+
+  def get_day(self, current_date) -> CalendarDay:
+    if isinstance(current_date, datetime):
+      current_date = current_date.date()
+
+    calendar_day = self._days.get(current_date)
+
+    if calendar_day is None:
+      calendar_day = self._outside_years(current_date)
+
+    return calendar_day
+
+
+  def _outside_years(self, current_date: date) -> CalendarDay:
+    previous_starts = [start for start in self._year_starts if start <= current_date]
+    first_week = _week_start(previous_starts[-1] if previous_starts else (self._year_starts or [current_date])[0])
+
+    # Between two configured years (summer), there are no classes
+    teaching = not previous_starts or len(previous_starts) == len(self._year_starts)
+
+    return CalendarDay(_weekday_id(current_date), _parity(first_week, current_date), teaching)
+
+
+
+def _week_start(day: date) -> date:
+  return day - timedelta(days=day.weekday())
+
+
+
+def _weekday_id(day: date) -> int:
+  return WEEKDAY_IDS[WEEKDAYS[day.weekday()]]
+
+
+
+def _parity(first_week: date, day: date) -> int:
+  return WEEK_PARITY_IDS[WEEK_PARITIES[((day - first_week).days // 7) % len(WEEK_PARITIES)]]
+
+
+
+def load_academic_calendar(path: str) -> AcademicCalendar:
+  with open(path, encoding='utf-8') as file:
+    config = json.load(file)
+
+  return AcademicCalendar([
+    (
+      date.fromisoformat(year["start"]),
+      date.fromisoformat(year["end"]),
+      [(date.fromisoformat(vacation["start"]), date.fromisoformat(vacation["end"])) for vacation in year.get("vacations", [])]
+    )
+    for year in config["years"]
+  ])
+
+
+
+academic_calendar = load_academic_calendar(ACADEMIC_CALENDAR_PATH)
+
+
+
+def weekday_position(week_day_id: int) -> int:
+  return WEEKDAYS.index(WEEKDAY_NAMES[week_day_id])
+
+
+
+def set_week_lookups(week_day_ids: dict, week_parity_ids: dict) -> None:
+  WEEKDAY_IDS.clear()
+  WEEKDAY_IDS.update(week_day_ids)
+  WEEKDAY_NAMES.clear()
+  WEEKDAY_NAMES.update({id: weekday for weekday, id in week_day_ids.items()})
+
+  WEEK_PARITY_IDS.clear()
+  WEEK_PARITY_IDS.update(week_parity_ids)
+  WEEK_PARITY_NAMES.clear()
+  WEEK_PARITY_NAMES.update({id: week_parity for week_parity, id in week_parity_ids.items()})
+
+  academic_calendar.rebuild()
 
 
 
@@ -34,26 +193,13 @@ def get_weekday(date):
   Returns:
     str: The name of the weekday in Romanian.
 
-  This function takes a `datetime.date` object and converts it to the name of the weekday. It then 
-  translates this name from English to Romanian using a predefined dictionary. This is particularly 
-  useful for applications that require the display of dates in a user-friendly and localized format.
-
-  If the weekday name is not found in the dictionary, the original English name is returned.
+  This function takes a `datetime.date` object and returns the name of its weekday, taken from WEEKDAYS 
+  by the weekday number of the date. Unlike formatting the date with `strftime("%A")`, this does not depend 
+  on the locale of the process. This is particularly useful for applications that require the display of 
+  dates in a user-friendly and localized format.
   """
 
-  weekday = date.strftime("%A")
-
-  english_to_romanian = {
-    "Monday": "Luni",
-    "Tuesday": "Marti",
-    "Wednesday": "Miercuri",
-    "Thursday": "Joi",
-    "Friday": "Vineri",
-    "Saturday": "Sambata",
-    "Sunday": "Duminica"
-  }
-
-  return english_to_romanian.get(weekday, weekday)
+  return WEEKDAYS[date.weekday()]
 
 
 
@@ -67,18 +213,24 @@ def get_week_parity(current_date):
   Returns:
     str: "impară" if the week is odd, or "pară" if the week is even.
 
-  This function calculates the number of weeks that have passed since a predefined start date (e.g., 
-  the start of an academic year or a specific event) and determines if the current week is odd or even. 
-  It is particularly useful for scheduling and organizing events that occur on a bi-weekly basis.
+  The parity is read from the academic calendar, where it is precomputed for every day by counting the 
+  weeks since the first week of the academic year the date belongs to. It is particularly useful for 
+  scheduling and organizing events that occur on a bi-weekly basis.
+  """
+
+  return WEEK_PARITY_NAMES[academic_calendar.get_day(current_date).weekParityId]
+
+
 
-  The week parity is determined by calculating the difference in weeks between the current date and 
-  the start date (September 4, 2023). The function then checks if this difference is divisible by 2 
-  to ascertain whether the week is odd or even.
+def is_teaching_day(current_date) -> bool:
   """
+  Tells whether classes are held on a given date, according to the academic calendar.
 
-  start_date = date(2023, 9, 4) 
-  current_date = current_date.date()
-  delta = current_date - start_date
-  weeks_passed = delta.days // 7
+  Args:
+    current_date (datetime.datetime or datetime.date): The date to check.
+
+  Returns:
+    bool: False during vacations and between academic years, True otherwise.
+  """
 
-  return "impară" if weeks_passed % 2 == 0 else "pară"
\ No newline at end of file
+  return academic_calendar.get_day(current_date).teaching
@@ -5,15 +5,28 @@ This module is responsible for setting up the command and callback query handler
 
 Functions and components:
   - add_handlers()
+  - add_registration_conversation() / add_stateless_registration_handlers(): The two ways of registering the '/start' 
+    registration steps, selected by REGISTRATION_IN_CALLBACK_DATA.
 
 Usage:
   This module is imported and utilized in the main application file to configure the Telegram bot application 
   with necessary handlers for user interaction.
 """
 
-from telegram.ext import CommandHandler, CallbackQueryHandler, MessageHandler, filters
-from controllers.start import select_speciality, select_semester, select_language, select_group, finish_selection
-from controllers.menu import handle_menu_action
+from telegram import Update
+from telegram.ext import CommandHandler, CallbackQueryHandler, ConversationHandler, MessageHandler, TypeHandler, filters
+from controllers.start import (
+  SPECIALITY, SEMESTER, LANGUAGE, GROUP,
+  select_speciality, keep_group, select_semester, select_language, select_group, finish_selection,
+  registration_timeout, expired_selection
+)
+from controllers.menu import handle_menu_action, menu_action
+from controllers.admin import handle_reload, handle_stats, handle_slowlog
+from controllers.push import handle_subscribe, handle_unsubscribe
+from controllers.reminders import handle_enable_reminders, handle_disable_reminders
+from utils.metrics import instrumented
+from utils.profiling import profiled
+from config.config import REGISTRATION_TIMEOUT, REGISTRATION_IN_CALLBACK_DATA
 
 
 
@@ -23,30 +36,88 @@ def add_handlers(application):
   Configure and add command and callback query handlers to the Telegram bot application.
 
   This function sets up various handlers for different user interactions. It includes:
-    - A command handler for the 'start' command, initiating the bot interaction.
-    - Callback query handlers for user selections, such as selecting a semester, language, or group.
-    - A handler for processing the final selection and completing the user setup.
+    - A conversation handler for the registration, started by the 'start' command. Its states hold the 
+      callback query handlers for user selections, such as selecting a semester, language, or group, and 
+      the handler for processing the final selection and completing the user setup. The partial selection 
+      is kept in 'context.user_data' and abandoned registrations end after REGISTRATION_TIMEOUT seconds. 
+      When the application has a persistence backend, registrations in progress survive restarts. 
+      With REGISTRATION_IN_CALLBACK_DATA (several webhook workers), the steps are plain callback query handlers 
+      instead, and their buttons carry the whole selection, so any worker can answer any step.
+    - A handler answering registration buttons pressed when no registration is in progress (conversation only).
     - A handler for bots menu.
+    - Command handlers for the administrative '/reload', '/stats' and '/slowlog' commands.
+    - Command handlers for subscribing to and unsubscribing from the daily schedule push.
+    - Command handlers for enabling and disabling the reminders sent before each pair.
 
   When user starts the bot for the first time, functions execute in the next order:
     select_speciality -> select_semester -> select_language -> select_group -> finish_selection -> handle_menu_options
 
-  Each handler is linked to specific functions in the controllers module, which define the bot's responses to user actions.
+  A returning user can instead keep their previous group:
+    select_speciality -> keep_group -> handle_menu_options
+
+  Each handler is linked to specific functions in the controllers module, which define the bot's responses to user actions. 
+  Every callback is wrapped with 'instrumented' from 'utils.metrics', which records its latency, database time and 
+  number of SQL statements; menu actions are further labelled with the selected option. The menu and registration 
+  callbacks are also wrapped with 'profiled' from 'utils.profiling', which samples them with cProfile when 
+  PROFILE_SAMPLE_RATE is set.
 
   Args:
     - application: The Application object from the python-telegram-bot library, representing the Telegram bot.
   """
 
-	# command handler for the start command
-  application.add_handler(CommandHandler("start", select_speciality))
-	
-  # callback handlers for selecting semester, language, and group
-  application.add_handler(CallbackQueryHandler(select_semester, pattern='^\d+$'))
-  application.add_handler(CallbackQueryHandler(select_language, pattern='^\d+-\d+$'))
-  application.add_handler(CallbackQueryHandler(select_group, pattern='^\d+-\d+-\d+$'))
-	
-  # callback handler for completing the user's selection process
-  application.add_handler(CallbackQueryHandler(finish_selection, pattern='^group_id:\d+$'))
+  if REGISTRATION_IN_CALLBACK_DATA:
+    add_stateless_registration_handlers(application)
+  else:
+    add_registration_conversation(application)
 	
+  # command handlers for administrative commands
+  application.add_handler(CommandHandler("reload", instrumented(handle_reload)))
+  application.add_handler(CommandHandler("stats", instrumented(handle_stats)))
+  application.add_handler(CommandHandler("slowlog", instrumented(handle_slowlog)))
+
+  # command handlers for the daily schedule push
+  application.add_handler(CommandHandler("abonare", instrumented(handle_subscribe)))
+  application.add_handler(CommandHandler("dezabonare", instrumented(handle_unsubscribe)))
+
+  # command handlers for the reminders sent before each pair
+  application.add_handler(CommandHandler("notificari", instrumented(handle_enable_reminders)))
+  application.add_handler(CommandHandler("fara_notificari", instrumented(handle_disable_reminders)))
+
   # handler for bot menu
-  application.add_handler(MessageHandler(filters.Text() & ~filters.Command(), handle_menu_action))
\ No newline at end of file
+  application.add_handler(MessageHandler(filters.Text() & ~filters.Command(), instrumented(profiled(handle_menu_action), action=menu_action)))
+
+
+
+def add_registration_conversation(application):
+  # conversation handler for the registration, started by the start command
+  application.add_handler(ConversationHandler(
+    entry_points=[CommandHandler("start", instrumented(profiled(select_speciality)))],
+    states={
+      SPECIALITY: [
+        CallbackQueryHandler(instrumented(profiled(keep_group)), pattern='^keep_group:\d+$'),
+        CallbackQueryHandler(instrumented(profiled(select_semester)), pattern='^spec:\d+$')
+      ],
+      SEMESTER: [CallbackQueryHandler(instrumented(profiled(select_language)), pattern='^sem:\d+$')],
+      LANGUAGE: [CallbackQueryHandler(instrumented(profiled(select_group)), pattern='^lang:\d+$')],
+      GROUP: [CallbackQueryHandler(instrumented(profiled(finish_selection)), pattern='^group_id:\d+$')],
+      ConversationHandler.TIMEOUT: [TypeHandler(Update, instrumented(registration_timeout))]
+    },
+    fallbacks=[CommandHandler("start", instrumented(profiled(select_speciality)))],
+    conversation_timeout=REGISTRATION_TIMEOUT,
+    name="registration",
+    persistent=application.persistence is not None
+  ))
+
+  # callback handler for registration buttons pressed outside of a registration
+  application.add_handler(CallbackQueryHandler(instrumented(expired_selection), pattern='^((spec|sem|lang):\d+(-\d+)*|keep_group:\d+|group_id:\d+)$'))
+
+
+
+def add_stateless_registration_handlers(application):
+  # registration steps whose buttons carry the whole selection, answered by any process
+  application.add_handler(CommandHandler("start", instrumented(profiled(select_speciality))))
+  application.add_handler(CallbackQueryHandler(instrumented(profiled(keep_group)), pattern='^keep_group:\d+$'))
+  application.add_handler(CallbackQueryHandler(instrumented(profiled(select_semester)), pattern='^spec:\d+$'))
+  application.add_handler(CallbackQueryHandler(instrumented(profiled(select_language)), pattern='^sem:\d+-\d+$'))
+  application.add_handler(CallbackQueryHandler(instrumented(profiled(select_group)), pattern='^lang:\d+-\d+-\d+$'))
+  application.add_handler(CallbackQueryHandler(instrumented(profiled(finish_selection)), pattern='^group_id:\d+$'))
@@ -0,0 +1,172 @@
+"""
+metrics.py
+
+This module in the 'utils' folder contains the instrumentation of the bot's hot path: for every Telegram 
+update it records the wall time of the handler, the time spent in SQL statements and the number of SQL 
+statements, and exposes them in the Prometheus text format.
+
+Each instrumented handler starts a per-update record stored in a context variable. The SQLAlchemy 
+'before_cursor_execute' and 'after_cursor_execute' hooks registered in 'db.db_connect' add the duration of 
+every statement to the record of the update being served; 'run_db' copies the context into the database 
+thread pool, so statements executed there are attributed to the right update. Statements executed outside 
+an update (jobs, startup) are not recorded.
+
+Functions and classes included in this module:
+
+- Histogram(name, help, buckets, labels):
+  A thread-safe Prometheus histogram with cumulative buckets, one series per combination of label values.
+
+- record_query(duration):
+  Adds one SQL statement and its duration to the record of the current update, if there is one.
+
+- instrumented(callback, action):
+  Wraps a handler callback so each update it handles is measured. 'action', when given, is a function 
+  returning a label for the update, e.g. the menu option that was selected.
+
+- render_metrics():
+  Returns every metric in the Prometheus text exposition format.
+
+- start_metrics_server(host, port):
+  Serves 'render_metrics()' on http://host:port/metrics from a daemon thread.
+
+The endpoint is enabled with METRICS_ENABLED and bound to METRICS_HOST and METRICS_PORT in 'config.config'.
+"""
+
+import functools
+import threading
+import time
+from contextvars import ContextVar
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Upper bounds of the histogram buckets, in seconds for durations and in statements for query counts
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50)
+
+# Record of the update being served: {"db_seconds": float, "queries": int}, None outside an update
+_current_update = ContextVar("current_update", default=None)
+
+
+
+class Histogram:
+  def __init__(self, name: str, help: str, buckets, labels=("handler", "action")):
+    self.name = name
+    self.help = help
+    self.buckets = tuple(buckets)
+    self.labels = tuple(labels)
+    self._series = {}
+    self._lock = threading.Lock()
+
+
+  def observe(self, value: float, *label_values):
+    with self._lock:
+      series = self._series.get(label_values)
+
+      if series is None:
+        series = self._series[label_values] = {"buckets": [0] * len(self.buckets), "sum": 0.0, "count": 0}
+
+      for index, bound in enumerate(self.buckets):
+        if value <= bound:
+          series["buckets"][index] += 1
+
+      series["sum"] += value
+      series["count"] += 1
+
+
+  def render(self) -> str:
+    lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+
+    with self._lock:
+      for label_values, series in sorted(self._series.items()):
+        labels = ",".join(f'{label}="{value}"' for label, value in zip(self.labels, label_values))
+
+        for bound, count in zip(self.buckets, series["buckets"]):
+          lines.append(f'{self.name}_bucket{{{labels},le="{bound}"}} {count}')
+
+        lines.append(f'{self.name}_bucket{{{labels},le="+Inf"}} {series["count"]}')
+        lines.append(f"{self.name}_sum{{{labels}}} {series['sum']}")
+        lines.append(f"{self.name}_count{{{labels}}} {series['count']}")
+
+    return "\n".join(lines)
+
+
+
+update_duration = Histogram("bot_update_duration_seconds", "Wall time spent handling an update.", DURATION_BUCKETS)
+update_db_duration = Histogram("bot_update_db_seconds", "Time spent in SQL statements while handling an update.", DURATION_BUCKETS)
+update_queries = Histogram("bot_update_queries", "Number of SQL statements executed while handling an update.", QUERY_BUCKETS)
+
+# Updates whose handler raised, by (handler, action)
+_errors = {}
+_errors_lock = threading.Lock()
+
+
+
+def record_query(duration: float) -> None:
+  record = _current_update.get()
+
+  if record is not None:
+    record["db_seconds"] += duration
+    record["queries"] += 1
+
+
+
+def instrumented(callback, action=None):
+  handler = callback.__name__
+
+  @functools.wraps(callback)
+  async def wrapper(update, context):
+    label = action(update) if action else ""
+    record = {"db_seconds": 0.0, "queries": 0}
+    token = _current_update.set(record)
+    start = time.perf_counter()
+
+    try:
+      return await callback(update, context)
+    except Exception:
+      with _errors_lock:
+        _errors[(handler, label)] = _errors.get((handler, label), 0) + 1
+      raise
+    finally:
+      update_duration.observe(time.perf_counter() - start, handler, label)
+      update_db_duration.observe(record["db_seconds"], handler, label)
+      update_queries.observe(record["queries"], handler, label)
+      _current_update.reset(token)
+
+  return wrapper
+
+
+
+def render_metrics() -> str:
+  lines = ["# HELP bot_update_errors_total Updates whose handler raised an exception.", "# TYPE bot_update_errors_total counter"]
+
+  with _errors_lock:
+    for (handler, label), count in sorted(_errors.items()):
+      lines.append(f'bot_update_errors_total{{handler="{handler}",action="{label}"}} {count}')
+
+  sections = [histogram.render() for histogram in (update_duration, update_db_duration, update_queries)]
+  return "\n".join(sections + ["\n".join(lines)]) + "\n"
+
+
+
+class _MetricsRequestHandler(BaseHTTPRequestHandler):
+  def do_GET(self):
+    if self.path != "/metrics":
+      self.send_error(404)
+      return
+
+    body = render_metrics().encode("utf-8")
+    self.send_response(200)
+    self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+    self.send_header("Content-Length", str(len(body)))
+    self.end_headers()
+    self.wfile.write(body)
+
+
+  def log_message(self, format, *args):
+    pass
+
+
+
+def start_metrics_server(host: str, port: int) -> ThreadingHTTPServer:
+  server = ThreadingHTTPServer((host, port), _MetricsRequestHandler)
+  threading.Thread(target=server.serve_forever, name="metrics", daemon=True).start()
+  return server
@@ -0,0 +1,142 @@
+"""
+persistence.py
+
+This module in the 'utils' folder contains the persistence of the bot state across restarts, so that a 
+restarted process answers its first requests from warm caches instead of querying the database for every user.
+
+The state is kept by a python-telegram-bot persistence backend, selected with PERSISTENCE_BACKEND in 
+'config.config'. With the 'pickle' backend, PicklePersistence stores the registrations in progress (the 
+ConversationHandler states and 'user_data') and 'bot_data' in a single file, written every 
+PERSISTENCE_UPDATE_INTERVAL seconds and when the bot stops, instead of after every update.
+
+The caches are stored in 'bot_data' as a snapshot taken just before the state is written:
+
+- the chat ID -> group ID mappings of the user cache ('cache.user_cache'), and the time they were taken, from 
+  which the webhook workers look for users who registered again ('cache.user_changes'),
+- the cached schedules, rendered messages and class calendars ('cache.schedule_cache'),
+- the timetable generation those schedules belong to ('cache.timetable_version').
+
+Cached schedules are only restored when the timetable generation stored in the database is still the one 
+of the snapshot, so a restart never serves a timetable that was changed while the bot was stopped. They are 
+stored pickled on their own, so a snapshot whose rows no longer match ScheduleRow after an upgrade is 
+discarded instead of preventing the whole state from loading.
+
+Functions included in this module:
+
+- build_persistence(worker):
+  Returns the configured persistence backend, or None when persistence is disabled. Each webhook worker 
+  process ('worker') uses its own file.
+
+- snapshot_caches(bot_data):
+  Stores the current content of the caches in 'bot_data'.
+
+- restore_caches(session, bot_data):
+  Fills the caches from the snapshot in 'bot_data' and returns the number of restored users and schedules.
+
+- save_cache_snapshot(application):
+  Takes the snapshot and writes the state through the persistence backend, used when the bot stops.
+
+- schedule_cache_snapshots(application):
+  Registers a repeating job taking the snapshot before each periodic write of the state.
+"""
+
+import pickle
+from datetime import datetime
+from telegram.ext import PicklePersistence, PersistenceInput
+from config.config import PERSISTENCE_BACKEND, PERSISTENCE_PATH, PERSISTENCE_UPDATE_INTERVAL
+from cache.user_cache import user_cache
+from cache.schedule_cache import timetable_cache, message_cache, calendar_cache
+from cache.timetable_version import check_timetable_version, seen_timetable_generation
+from cache.user_changes import mark_user_changes_seen
+
+# Key of the cache snapshot in 'bot_data'
+SNAPSHOT_KEY = "cache_snapshot"
+
+# Caches holding schedules, stored only together with their timetable generation
+SCHEDULE_CACHES = {"timetable": timetable_cache, "messages": message_cache, "calendars": calendar_cache}
+
+
+
+def build_persistence(worker=None):
+  if PERSISTENCE_BACKEND == 'none':
+    return None
+
+  if PERSISTENCE_BACKEND != 'pickle':
+    raise ValueError(f"Unknown persistence backend: {PERSISTENCE_BACKEND}")
+
+  filepath = PERSISTENCE_PATH if worker is None else f"{PERSISTENCE_PATH}.{worker}"
+
+  return PicklePersistence(
+    filepath,
+    store_data=PersistenceInput(bot_data=True, chat_data=False, user_data=True, callback_data=False),
+    update_interval=PERSISTENCE_UPDATE_INTERVAL
+  )
+
+
+
+def snapshot_caches(bot_data: dict) -> None:
+  bot_data[SNAPSHOT_KEY] = {
+    "generation": seen_timetable_generation(),
+    "users": user_cache.items(),
+    "takenAt": datetime.now(),
+    "schedules": pickle.dumps({name: cache.items() for name, cache in SCHEDULE_CACHES.items()})
+  }
+
+
+
+def _load_schedules(snapshot: dict) -> dict:
+  try:
+    return pickle.loads(snapshot["schedules"])
+  except (KeyError, TypeError, AttributeError, pickle.UnpicklingError):
+    return {}
+
+
+
+def restore_caches(session, bot_data: dict) -> dict:
+  snapshot = bot_data.get(SNAPSHOT_KEY)
+  restored = {"users": 0, "schedules": 0}
+
+  if not snapshot:
+    return restored
+
+  for chat_id, group_id in snapshot["users"]:
+    user_cache.put(chat_id, group_id)
+
+  restored["users"] = len(snapshot["users"])
+
+  if snapshot.get("takenAt") is not None:
+    mark_user_changes_seen(snapshot["takenAt"])
+
+  # The check records the current generation, so later changes are detected by the version poll
+  check_timetable_version(session)
+
+  if snapshot["generation"] is not None and snapshot["generation"] == seen_timetable_generation():
+    schedules = _load_schedules(snapshot)
+
+    for name, cache in SCHEDULE_CACHES.items():
+      for key, value in schedules.get(name, ()):
+        cache.put(key, value)
+
+      restored["schedules"] += len(schedules.get(name, ()))
+
+  return restored
+
+
+
+async def save_cache_snapshot(application) -> None:
+  snapshot_caches(application.bot_data)
+  await application.update_persistence()
+
+
+
+async def _take_snapshot(context) -> None:
+  snapshot_caches(context.bot_data)
+
+
+
+def schedule_cache_snapshots(application):
+  # Runs just before the application writes its state, every PERSISTENCE_UPDATE_INTERVAL seconds
+  application.job_queue.run_repeating(
+    _take_snapshot, interval=PERSISTENCE_UPDATE_INTERVAL, first=max(PERSISTENCE_UPDATE_INTERVAL - 1, 0),
+    name="cache_snapshot"
+  )
@@ -0,0 +1,158 @@
+"""
+profiling.py
+
+This module in the 'utils' folder contains the opt-in sampling profiler of the bot's handlers, used to find 
+where the time goes when latency spikes in production and cannot be reproduced locally.
+
+When PROFILE_SAMPLE_RATE is N > 0, one update out of every N handled by each profiled handler is run under 
+cProfile. The coroutine of the handler is profiled only while it is running on the event loop, so the other 
+updates served concurrently are not attributed to it, and the synchronous function it passes to 'run_db' is 
+profiled in the database thread pool with a second profiler. Both are merged and written, from a background 
+thread, to PROFILE_DIR/<handler>/<timestamp>.pstats. Only the PROFILE_MAX_FILES most recent files of each 
+handler are kept.
+
+Since Python 3.12, cProfile relies on the process-wide 'sys.monitoring', so only one profiler can be enabled 
+at a time. A single update is therefore profiled at once: a sampled update arriving while another one is 
+being profiled runs without profiler. A profiler that still cannot be enabled, because another profiling tool 
+is active, is skipped and the code runs unprofiled.
+
+When PROFILE_SAMPLE_RATE is 0 (the default), 'profiled' returns the handler unchanged, so profiling adds no 
+overhead besides one context variable lookup in 'run_db'.
+
+Functions included in this module:
+
+- profiled(callback): Wraps a handler callback so one update out of every PROFILE_SAMPLE_RATE is profiled.
+- run_profiled(func, *args): Calls a function, under a profiler if the current update is being profiled. 
+  Used by 'run_db' in the database thread pool.
+
+The files can be aggregated into a report of the hottest functions with 'scripts.profile_report'.
+"""
+
+import asyncio
+import cProfile
+import functools
+import itertools
+import os
+import pstats
+import time
+from contextvars import ContextVar
+from config.config import PROFILE_SAMPLE_RATE, PROFILE_DIR, PROFILE_MAX_FILES
+
+# Profilers of the database work of the update being profiled, None when it is not profiled
+_thread_profiles = ContextVar("thread_profiles", default=None)
+
+# Whether an update is being profiled in this process
+_profiling = {"active": False}
+
+
+
+def _enable(profile: cProfile.Profile) -> bool:
+  try:
+    profile.enable()
+    return True
+  except ValueError:
+    # Another profiler is already active ('sys.monitoring' allows a single one since Python 3.12)
+    return False
+
+
+
+class _ProfiledCoroutine:
+  def __init__(self, coroutine, profile: cProfile.Profile):
+    self.coroutine = coroutine
+    self.profile = profile
+
+
+  def __await__(self):
+    # Drives the coroutine step by step, with the profiler enabled only while one of its steps runs
+    value, error = None, None
+
+    while True:
+      enabled = _enable(self.profile)
+
+      try:
+        if error is None:
+          awaited = self.coroutine.send(value)
+        else:
+          awaited = self.coroutine.throw(error)
+      except StopIteration as stop:
+        return stop.value
+      finally:
+        if enabled:
+          self.profile.disable()
+
+      try:
+        value, error = (yield awaited), None
+      except BaseException as exception:
+        value, error = None, exception
+
+
+
+def run_profiled(func, *args):
+  profiles = _thread_profiles.get()
+
+  if profiles is None:
+    return func(*args)
+
+  profile = cProfile.Profile()
+
+  if not _enable(profile):
+    return func(*args)
+
+  profiles.append(profile)
+
+  try:
+    return func(*args)
+  finally:
+    profile.disable()
+
+
+
+def _write_profile(handler: str, profiles) -> None:
+  # Profilers that could not be enabled have nothing to write
+  profiles = [profile for profile in profiles if profile.getstats()]
+
+  if not profiles:
+    return
+
+  directory = os.path.join(PROFILE_DIR, handler)
+  os.makedirs(directory, exist_ok=True)
+
+  stats = pstats.Stats(profiles[0])
+
+  for profile in profiles[1:]:
+    stats.add(profile)
+
+  stats.dump_stats(os.path.join(directory, f"{time.time_ns()}.pstats"))
+
+  files = sorted(name for name in os.listdir(directory) if name.endswith(".pstats"))
+
+  for name in files[:max(len(files) - PROFILE_MAX_FILES, 0)]:
+    os.remove(os.path.join(directory, name))
+
+
+
+def profiled(callback):
+  if PROFILE_SAMPLE_RATE <= 0:
+    return callback
+
+  handler = callback.__name__
+  updates = itertools.count()
+
+  @functools.wraps(callback)
+  async def wrapper(update, context):
+    if next(updates) % PROFILE_SAMPLE_RATE or _profiling["active"]:
+      return await callback(update, context)
+
+    profile = cProfile.Profile()
+    profiles = [profile]
+    token = _thread_profiles.set(profiles)
+    _profiling["active"] = True
+
+    try:
+      return await _ProfiledCoroutine(callback(update, context), profile)
+    finally:
+      _profiling["active"] = False
+      _thread_profiles.reset(token)
+      asyncio.get_running_loop().run_in_executor(None, _write_profile, handler, profiles)
+
+  return wrapper
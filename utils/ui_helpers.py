@@ -8,25 +8,29 @@ user interaction by presenting them with a set of buttons for various commands a
 Functions included in this module:
 
 - build_speciality_keyboard(specialities):
-  Creates an inline keyboard with buttons for each speciality. Each button's callback data contains 
+  Creates an inline keyboard with buttons for each speciality. Each button's callback data is 'spec:' followed by 
   the ID of the corresponding speciality. This keyboard is used for allowing users to select their speciality.
 
-- build_semester_keyboard(speciality):
+- build_semester_keyboard(speciality, prefix):
   Generates an inline keyboard for selecting a semester, based on the number of semesters available for a given speciality.
-  Each button's callback data includes the speciality ID and the selected semester.
+  Each button's callback data is 'sem:' followed by 'prefix' and the selected semester. The prefix is empty when the speciality is 
+  kept in the registration state, or the speciality ID followed by '-' when the selection travels in the callback data.
 
-- build_language_keyboard(speciality_id, semester, languages):
-  Creates an inline keyboard with buttons for each available language. The callback data for each button includes 
-  the speciality ID, semester, and language ID. This keyboard is used for language selection.
+- build_language_keyboard(languages, prefix):
+  Creates an inline keyboard with buttons for each available language. The callback data for each button is 
+  'lang:' followed by 'prefix' (empty, or the 'speciality-semester-' path) and the language ID. This keyboard is used for language selection.
 
-- build_group_keyboard(speciality_id, semester, language_id, groups):
+- build_group_keyboard(groups):
   Constructs an inline keyboard for group selection. Each button's callback data is formatted to include 
   only the group ID, simplifying the data passed during callback.
 
+- previous_group_button(group):
+  Creates the inline button that lets a returning user keep their previous group with a single tap.
+
 - main_menu_keyboard():
   Generates a reply keyboard with buttons for main menu options such as checking today's or tomorrow's schedule, 
   week parity, and the schedule for the entire week. This keyboard uses `ReplyKeyboardMarkup` to create a more 
-  permanent keyboard layout.
+  permanent keyboard layout. The keyboard never changes, so it is built once and reused.
 
 These utility functions are central to the bot's user interface, allowing for a more interactive and 
 user-friendly experience. They abstract the complexity of creating various types of keyboards, making 
@@ -34,13 +38,14 @@ the main bot code more concise and maintainable.
 """
 
 
+from functools import lru_cache
 from telegram import InlineKeyboardButton, InlineKeyboardMarkup, ReplyKeyboardMarkup, KeyboardButton
 
 
 
 def build_speciality_keyboard(specialities):
   keyboard = [
-    [InlineKeyboardButton(speciality.name, callback_data=str(speciality.id))]
+    [InlineKeyboardButton(speciality.name, callback_data=f"spec:{speciality.id}")]
     for speciality in specialities
   ]
   
@@ -48,9 +53,9 @@ def build_speciality_keyboard(specialities):
 
 
 
-def build_semester_keyboard(speciality):
+def build_semester_keyboard(speciality, prefix: str = ""):
   keyboard = [
-    [InlineKeyboardButton(f"Semestrul {semester}", callback_data=f"{speciality.id}-{semester}")]
+    [InlineKeyboardButton(f"Semestrul {semester}", callback_data=f"sem:{prefix}{semester}")]
     for semester in range(1, speciality.semesters + 1)
   ]
   
@@ -58,9 +63,9 @@ def build_semester_keyboard(speciality):
 
 
 
-def build_language_keyboard(speciality_id, semester, languages):
+def build_language_keyboard(languages, prefix: str = ""):
   keyboard = [
-    [InlineKeyboardButton(f"{language.name}", callback_data=f"{speciality_id}-{semester}-{language.id}")]
+    [InlineKeyboardButton(f"{language.name}", callback_data=f"lang:{prefix}{language.id}")]
     for language in languages
   ]
     
@@ -68,7 +73,7 @@ def build_language_keyboard(speciality_id, semester, languages):
 
 
 
-def build_group_keyboard(speciality_id, semester, language_id, groups):
+def build_group_keyboard(groups):
   keyboard = [
     [InlineKeyboardButton(f"{group.name}", callback_data=f"group_id:{group.id}")]
     for group in groups
@@ -78,6 +83,12 @@ def build_group_keyboard(speciality_id, semester, language_id, groups):
 
 
 
+def previous_group_button(group):
+  return InlineKeyboardButton(f"Păstrează grupa {group.name}", callback_data=f"keep_group:{group.id}")
+
+
+
+@lru_cache(maxsize=None)
 def main_menu_keyboard():
   keyboard = [
     [KeyboardButton("Orarul pentru astăzi"), 